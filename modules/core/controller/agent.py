@@ -1,13 +1,15 @@
+import asyncio
 import json
 import os
 
-from typing import Callable, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from types import SimpleNamespace
 
-from modules.core.controller.ollama_client import ask_ollama
+from modules.core.controller.ollama_client import ask_ollama_async, stream_ollama
 from modules.core.controller.normalize import normalize_codex_output
 from modules.core.controller.tool_executor import execute_tool
 from modules.core.controller.tool_definitions import get_tool_by_name
+from modules.core.tools.intents import infer_intents
 from modules.core.tools.tool_capabilities import tool_can_handle
 from modules.core.controller.normalize import normalize_codex_output
 from modules.core.controller.logger import logger
@@ -40,52 +42,156 @@ def _get_server_for_tool(tool_name: str) -> SimpleNamespace:
     return _build_server_config(server_key)
 
 
-def infer_intents(user_input: str) -> Set[str]:
-    text = user_input.lower()
-    intents = set()
-
-    if any(k in text for k in ["time", "date", "now", "current time", "current date"]):
-        intents.add("access_time")
-
-    if any(k in text for k in ["fetch", "download", "http", "api"]):
-        intents.add("access_network")
-
-    if any(k in text for k in ["write code", "generate", "program"]):
-        intents.add("generate_code")
-
-    if any(
-        k in text
-        for k in [
-            "edit",
-            "modify",
-            "change file",
-            "create file",
-            "write file",
-            "save file",
-            "add file",
-        ]
+def _requested_tool_calls(parsed: Any) -> Optional[List[Dict[str, Any]]]:
+    """Return the tool calls in a parsed reply: one object or a JSON array."""
+    if isinstance(parsed, dict):
+        return [parsed]
+    if (
+        isinstance(parsed, list)
+        and parsed
+        and all(isinstance(call, dict) for call in parsed)
     ):
-        intents.add("edit_files")
-
-    if any(
-        k in text
-        for k in [
-            "current working directory",
-            "working directory",
-            "current directory",
-            "cwd",
-            "show path",
-            "current path",
-            "pwd",
-        ]
+        return parsed
+    return None
+
+
+def _prepare_tool_call(call: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Normalize a tool call requested by the LLM into (tool, arguments)."""
+    tool = call.get("tool")
+    arguments = call.get("arguments", {})
+    if (
+        isinstance(arguments, dict)
+        and "tool" in arguments
+        and "arguments" in arguments
+        and not call.get("_normalized")
+    ):
+        nested_tool = arguments.get("tool")
+        nested_args = arguments.get("arguments", {})
+        if nested_tool:
+            tool = nested_tool
+            arguments = nested_args
+
+    if tool == "codex_generate" and isinstance(arguments, dict):
+        prompt = arguments.get("prompt")
+        if prompt and (
+            "repo_path" in arguments
+            or any(
+                k in str(prompt).lower()
+                for k in [
+                    "create a file",
+                    "create file",
+                    "write a file",
+                    "write file",
+                    "save file",
+                    "add a file",
+                ]
+            )
+        ):
+            tool = "codex_edit"
+            arguments = {
+                "repo_path": arguments.get("repo_path", "."),
+                "instruction": prompt,
+            }
+
+    # Normalize mis-scoped tool names like "codex_create_event" -> "create_event"
+    if (
+        not get_tool_by_name(tool)
+        and isinstance(tool, str)
+        and tool.startswith("codex_")
     ):
-        intents.add("access_filesystem")
+        candidate = tool[len("codex_") :]
+        if get_tool_by_name(candidate):
+            logger.info(f"Normalizing tool name '{tool}' -> '{candidate}'")
+            tool = candidate
+
+    # Preprocess datetime arguments for Google Calendar tools
+    if tool and tool.startswith("google_") and isinstance(arguments, dict):
+        timezone_offset = os.getenv("CALENDAR_TIMEZONE_OFFSET", "+08:00")
+        # Batch tools carry the times inside each item
+        targets = [arguments] + [
+            item
+            for key in ("events", "updates")
+            if isinstance(arguments.get(key), list)
+            for item in arguments[key]
+            if isinstance(item, dict)
+        ]
+        for target in targets:
+            for key in ["start_time", "end_time"]:
+                if key in target and isinstance(target[key], str):
+                    # Strip 'Z' (UTC indicator) and add configured timezone offset
+                    if target[key].endswith("Z"):
+                        target[key] = target[key][:-1] + timezone_offset
+                        logger.info(
+                            f"Preprocessed {key}: replaced 'Z' with {timezone_offset}"
+                        )
+
+    if tool == "codex_edit" and isinstance(arguments, dict):
+        if "repo_path" not in arguments or not arguments.get("repo_path"):
+            arguments["repo_path"] = os.getcwd()
+        if "path" in arguments:
+            path_value = arguments.pop("path")
+            if path_value:
+                instruction = arguments.get("instruction", "")
+                if (
+                    "file" not in instruction.lower()
+                    or str(path_value) not in instruction
+                ):
+                    arguments["instruction"] = (
+                        f"{instruction}\n\nTarget path: {path_value}"
+                    ).strip()
+
+    tools_with_repo_path = {
+        "codex_edit",
+        "codex_refactor",
+        "codex_plan",
+        "codex_analyze",
+        "codex_summarize",
+        "codex_doc_outline",
+        "codex_test_plan",
+    }
+    if isinstance(arguments, dict) and tool in tools_with_repo_path:
+        repo_path = arguments.get("repo_path")
+        if not repo_path:
+            arguments["repo_path"] = os.getcwd()
+        elif isinstance(repo_path, str) and repo_path:
+            if not os.path.isabs(repo_path):
+                arguments["repo_path"] = os.path.abspath(
+                    os.path.join(os.getcwd(), repo_path)
+                )
 
-    return intents
+    return tool, arguments
 
 
 _memory = get_default_memory()
 
+EventSink = Callable[[Dict[str, Any]], None]
+
+
+async def _stream_llm(messages: List[Dict[str, str]], event_sink: EventSink) -> str:
+    """Stream an LLM reply, forwarding tokens unless it looks like a tool call."""
+    parts: List[str] = []
+    forward: Optional[bool] = None
+
+    async for delta in stream_ollama(messages):
+        parts.append(delta)
+        if forward is None:
+            head = "".join(parts).lstrip()
+            if not head:
+                continue
+            # Tool calls are JSON objects or arrays; hold them back from the user.
+            forward = not head.startswith(("{", "["))
+            if forward:
+                event_sink({"type": "token", "text": "".join(parts)})
+            continue
+        if forward:
+            event_sink({"type": "token", "text": delta})
+
+    response = "".join(parts)
+    if not response.strip():
+        # Fall back to the non-streaming call, which retries empty replies.
+        return await ask_ollama_async(messages)
+    return response
+
 
 async def run_agent(
     user_input: str,
@@ -93,6 +199,7 @@ async def run_agent(
     tool_executor: Optional[Callable] = None,
     *,
     output_sink: Optional[Callable[[str], None]] = None,
+    event_sink: Optional[EventSink] = None,
     return_output: bool = False,
 ):
     memory = memory or _memory
@@ -101,6 +208,7 @@ async def run_agent(
     explicit_codex_request = "codex" in text and (
         "use" in text or "using" in text or "tool" in text
     )
+    intents = infer_intents(user_input)
 
     final_message: Optional[str] = None
     outputs: list[str] = []
@@ -116,9 +224,59 @@ async def run_agent(
     def done() -> Optional[str]:
         return final_message if return_output else None
 
+    async def ask_llm(messages: List[Dict[str, str]]) -> str:
+        if event_sink is None:
+            return await ask_ollama_async(messages)
+        return await _stream_llm(messages, event_sink)
+
+    async def call_tool(tool: str, arguments: Any):
+        if event_sink is not None:
+            event_sink(
+                {"type": "tool", "event": "start", "tool": tool, "arguments": arguments}
+            )
+        server = _get_server_for_tool(tool)
+        try:
+            if event_sink is None:
+                return await tool_executor(server, tool, arguments)
+
+            async def on_progress(progress, total, message):
+                event_sink(
+                    {
+                        "type": "tool",
+                        "event": "progress",
+                        "tool": tool,
+                        "message": message,
+                    }
+                )
+
+            return await tool_executor(
+                server, tool, arguments, progress_callback=on_progress
+            )
+        finally:
+            if event_sink is not None:
+                event_sink({"type": "tool", "event": "end", "tool": tool})
+
+    async def run_tool(tool: str, arguments: Any) -> Any:
+        """Call a tool and return its result text, or the error as text."""
+        try:
+            result = await asyncio.wait_for(
+                call_tool(tool, arguments), timeout=tool_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Tool '{tool}' timed out after {tool_timeout}s")
+            return f"Error: tool '{tool}' timed out after {tool_timeout:g}s"
+        except Exception as exc:
+            logger.warning(f"Tool '{tool}' failed: {exc}")
+            return f"Error: tool '{tool}' failed: {exc}"
+
+        # Don't normalize non-Codex tools - use their output directly
+        if tool.startswith("codex_"):
+            return normalize_codex_output(result.content)["message"]
+        return result.content
+
     # 1️⃣ Ask Ollama
     history = memory.get_messages()
-    ollama_response = ask_ollama(
+    ollama_response = await ask_llm(
         [
             *history,
             {"role": "user", "content": user_input},
@@ -135,7 +293,6 @@ async def run_agent(
             arguments = {"prompt": user_input}
             logger.info(f"TOOL_REQUEST (fallback): tool={tool} arguments={arguments}")
 
-            intents = infer_intents(user_input)
             if not explicit_codex_request and not tool_can_handle(tool, intents):
                 logger.warning(f"Tool '{tool}' cannot satisfy intents {intents}")
                 emit(
@@ -144,7 +301,7 @@ async def run_agent(
                 )
                 return done()
 
-            result = await tool_executor(_get_server_for_tool(tool), tool, arguments)
+            result = await call_tool(tool, arguments)
             normalized = normalize_codex_output(result.content)
             final_message = normalized["message"]
             emit("\n✅ Final answer:\n" + final_message)
@@ -158,14 +315,18 @@ async def run_agent(
 
     # 2️⃣ Tool loop: allow multiple tool calls
     max_tool_steps = int(os.getenv("ALENA_MAX_TOOL_STEPS", "3"))
+    # Above the codex server's own 900 s deadline, so its error reaches the user
+    tool_timeout = float(os.getenv("ALENA_TOOL_TIMEOUT", "960")) or None
     tool_steps = 0
     current_response = ollama_response
 
     while True:
         try:
-            parsed = json.loads(current_response)
+            requested = _requested_tool_calls(json.loads(current_response))
         except json.JSONDecodeError:
-            intents = infer_intents(user_input)
+            requested = None
+
+        if requested is None:
             if "access_filesystem" in intents:
                 tool = "codex_analyze"
                 arguments = {"repo_path": ".", "question": user_input}
@@ -176,9 +337,7 @@ async def run_agent(
                         "Reason: required capability is missing."
                     )
                     return done()
-                result = await tool_executor(
-                    _get_server_for_tool(tool), tool, arguments
-                )
+                result = await call_tool(tool, arguments)
                 normalized = normalize_codex_output(result.content)
                 final_message = normalized["message"]
                 emit("\n✅ Final answer:\n" + final_message)
@@ -189,7 +348,6 @@ async def run_agent(
             emit("✅ Final answer:\n" + final_message)
             return done()
 
-        intents = infer_intents(user_input)
         if "access_filesystem" in intents and not explicit_codex_request:
             cwd = os.getcwd()
             tool = "codex_analyze"
@@ -198,128 +356,33 @@ async def run_agent(
                 "question": (f"Current working directory is: {cwd}. " f"{user_input}"),
             }
             memory.add_tool_call(tool, arguments)
-            result = await tool_executor(_get_server_for_tool(tool), tool, arguments)
+            result = await call_tool(tool, arguments)
             normalized = normalize_codex_output(result.content)
             memory.add_tool_result(tool, normalized["message"])
             final_message = normalized["message"]
             emit("\n✅ Final answer:\n" + final_message)
             return done()
 
-        # Tool request detected
-        tool = parsed.get("tool")
-        arguments = parsed.get("arguments", {})
-        if (
-            isinstance(arguments, dict)
-            and "tool" in arguments
-            and "arguments" in arguments
-            and not parsed.get("_normalized")
-        ):
-            nested_tool = arguments.get("tool")
-            nested_args = arguments.get("arguments", {})
-            if nested_tool:
-                tool = nested_tool
-                arguments = nested_args
-
-        if tool == "codex_generate" and isinstance(arguments, dict):
-            prompt = arguments.get("prompt")
-            if prompt and (
-                "repo_path" in arguments
-                or any(
-                    k in str(prompt).lower()
-                    for k in [
-                        "create a file",
-                        "create file",
-                        "write a file",
-                        "write file",
-                        "save file",
-                        "add a file",
-                    ]
+        # Tool request(s) detected; a JSON array asks for several at once
+        calls = [_prepare_tool_call(call) for call in requested]
+        for tool, arguments in calls:
+            logger.info(f"TOOL_REQUEST: tool={tool} arguments={arguments}")
+            if not explicit_codex_request and not tool_can_handle(tool, intents):
+                logger.warning(f"Tool '{tool}' cannot satisfy intents {intents}")
+                emit(
+                    "❌ I cannot complete this request with the available tools.\n"
+                    "Reason: required capability is missing."
                 )
-            ):
-                tool = "codex_edit"
-                arguments = {
-                    "repo_path": arguments.get("repo_path", "."),
-                    "instruction": prompt,
-                }
-
-        # Normalize mis-scoped tool names like "codex_create_event" -> "create_event"
-        if (
-            not get_tool_by_name(tool)
-            and isinstance(tool, str)
-            and tool.startswith("codex_")
-        ):
-            candidate = tool[len("codex_") :]
-            if get_tool_by_name(candidate):
-                logger.info(f"Normalizing tool name '{tool}' -> '{candidate}'")
-                tool = candidate
-
-        logger.info(f"TOOL_REQUEST: tool={tool} arguments={arguments}")
-
-        # Preprocess datetime arguments for Google Calendar tools
-        if tool and tool.startswith("google_") and isinstance(arguments, dict):
-            timezone_offset = os.getenv("CALENDAR_TIMEZONE_OFFSET", "+08:00")
-            for key in ["start_time", "end_time"]:
-                if key in arguments and isinstance(arguments[key], str):
-                    # Strip 'Z' (UTC indicator) and add configured timezone offset
-                    if arguments[key].endswith("Z"):
-                        arguments[key] = arguments[key][:-1] + timezone_offset
-                        logger.info(
-                            f"Preprocessed {key}: replaced 'Z' with {timezone_offset}"
-                        )
-
-        if not explicit_codex_request and not tool_can_handle(tool, intents):
-            logger.warning(f"Tool '{tool}' cannot satisfy intents {intents}")
-            emit(
-                "❌ I cannot complete this request with the available tools.\n"
-                "Reason: required capability is missing."
-            )
-            return done()
-
-        if tool == "codex_edit" and isinstance(arguments, dict):
-            if "repo_path" not in arguments or not arguments.get("repo_path"):
-                arguments["repo_path"] = os.getcwd()
-            if "path" in arguments:
-                path_value = arguments.pop("path")
-                if path_value:
-                    instruction = arguments.get("instruction", "")
-                    if (
-                        "file" not in instruction.lower()
-                        or str(path_value) not in instruction
-                    ):
-                        arguments["instruction"] = (
-                            f"{instruction}\n\nTarget path: {path_value}"
-                        ).strip()
-
-        tools_with_repo_path = {
-            "codex_edit",
-            "codex_refactor",
-            "codex_plan",
-            "codex_analyze",
-            "codex_summarize",
-            "codex_doc_outline",
-            "codex_test_plan",
-        }
-        if isinstance(arguments, dict) and tool in tools_with_repo_path:
-            repo_path = arguments.get("repo_path")
-            if not repo_path:
-                arguments["repo_path"] = os.getcwd()
-            elif isinstance(repo_path, str) and repo_path:
-                if not os.path.isabs(repo_path):
-                    arguments["repo_path"] = os.path.abspath(
-                        os.path.join(os.getcwd(), repo_path)
-                    )
-
-        memory.add_tool_call(tool, arguments)
-        result = await tool_executor(_get_server_for_tool(tool), tool, arguments)
-
-        # Don't normalize non-Codex tools - use their output directly
-        if tool.startswith("codex_"):
-            normalized = normalize_codex_output(result.content)
-            tool_result = normalized["message"]
-        else:
-            tool_result = result.content
+                return done()
 
-        memory.add_tool_result(tool, tool_result)
+        for tool, arguments in calls:
+            memory.add_tool_call(tool, arguments)
+        # Calls requested together cannot depend on each other's results.
+        results = await asyncio.gather(
+            *(run_tool(tool, arguments) for tool, arguments in calls)
+        )
+        for (tool, _), tool_result in zip(calls, results):
+            memory.add_tool_result(tool, tool_result)
 
         tool_steps += 1
         if tool_steps >= max_tool_steps:
@@ -327,11 +390,12 @@ async def run_agent(
             return done()
 
         followup = (
-            "Use the tool result above to continue. "
-            "If another tool call is required, respond with a tool call JSON. "
+            "Use the tool results above to continue. "
+            "If another tool call is required, respond with a tool call JSON "
+            "(a JSON array for several independent calls). "
             "Otherwise, provide the final answer."
         )
-        current_response = ask_ollama(
+        current_response = await ask_llm(
             [
                 *memory.get_messages(),
                 {"role": "user", "content": followup},
@@ -2,8 +2,25 @@ from __future__ import annotations
 
 import os
 import time
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English text and code; cheap
+    # enough to run on every insert without loading a tokenizer.
+    return max(1, (len(text) + 3) // 4)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the head and tail of ``text`` within roughly ``max_tokens``."""
+    max_chars = max_tokens * 4
+    if max_tokens <= 0 or len(text) <= max_chars:
+        return text
+    head = (max_chars * 2) // 3
+    tail = max_chars - head
+    omitted = len(text) - head - tail
+    return f"{text[:head]}\n…[{omitted} chars truncated]…\n{text[-tail:]}"
 
 
 @dataclass
@@ -11,23 +28,46 @@ class MemoryMessage:
     role: str
     content: str
     created_at: float
+    tokens: int = 0
+    pinned: bool = False
 
 
 class ConversationMemory:
-    def __init__(self, max_messages: int = 20):
+    def __init__(
+        self,
+        max_messages: int = 20,
+        max_tokens: int = 4000,
+        max_tool_result_tokens: int = 1000,
+        summarize_evicted: bool = False,
+        max_summary_tokens: int = 300,
+    ):
         self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.max_tool_result_tokens = max_tool_result_tokens
+        self.summarize_evicted = summarize_evicted
+        self.max_summary_tokens = max_summary_tokens
+        self.summary = ""
         self._messages: List[MemoryMessage] = []
+        self._tokens = 0
+        # Trimmed messages waiting to be folded into ``summary``.
+        self._evicted: List[MemoryMessage] = []
 
-    def add(self, role: str, content: str) -> None:
+    def add(self, role: str, content: str, *, pinned: bool = False) -> None:
         if not content:
             return
-        self._messages.append(
-            MemoryMessage(role=role, content=content, created_at=time.time())
+        message = MemoryMessage(
+            role=role,
+            content=content,
+            created_at=time.time(),
+            tokens=estimate_tokens(content),
+            pinned=pinned,
         )
+        self._messages.append(message)
+        self._tokens += message.tokens
         self._trim()
 
-    def add_user(self, content: str) -> None:
-        self.add("user", content)
+    def add_user(self, content: str, *, pinned: bool = False) -> None:
+        self.add("user", content, pinned=pinned)
 
     def add_assistant(self, content: str) -> None:
         self.add("assistant", content)
@@ -37,26 +77,135 @@ class ConversationMemory:
         self.add("assistant", payload)
 
     def add_tool_result(self, tool: str, result: str) -> None:
+        result = truncate_to_tokens(str(result), self.max_tool_result_tokens)
         payload = f"Tool result: {tool} | {result}"
         self.add("assistant", payload)
 
     def get_messages(self) -> List[Dict[str, str]]:
-        return [{"role": m.role, "content": m.content} for m in self._messages]
+        messages = [{"role": m.role, "content": m.content} for m in self._messages]
+        if self.summary:
+            messages.insert(0, {"role": "system", "content": self._summary_content()})
+        return messages
 
     def clear(self) -> None:
         self._messages.clear()
+        self._evicted.clear()
+        self._tokens = 0
+        self.summary = ""
+
+    def has_evicted(self) -> bool:
+        return bool(self._evicted)
+
+    def take_evicted(self) -> List[MemoryMessage]:
+        evicted, self._evicted = self._evicted, []
+        return evicted
+
+    def restore_evicted(self, messages: List[MemoryMessage]) -> None:
+        """Put back messages whose summarization failed so it can be retried."""
+        self._evicted = [*messages, *self._evicted]
+
+    def apply_summary(
+        self, summary: str, summarized: Optional[List[MemoryMessage]] = None
+    ) -> None:
+        """Set the summary; ``summarized`` messages leave the eviction backlog."""
+        self.summary = truncate_to_tokens(summary.strip(), self.max_summary_tokens)
+        for message in summarized or []:
+            if message in self._evicted:
+                self._evicted.remove(message)
+        # The summary is part of the prompt, so it may push older turns out
+        self._trim()
+
+    def token_count(self) -> int:
+        return self._tokens + self._summary_tokens()
+
+    def size_bytes(self) -> int:
+        messages = [*self._messages, *self._evicted]
+        return len(self.summary.encode("utf-8")) + sum(
+            len(m.content.encode("utf-8")) for m in messages
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_messages": self.max_messages,
+            "max_tokens": self.max_tokens,
+            "max_tool_result_tokens": self.max_tool_result_tokens,
+            "summarize_evicted": self.summarize_evicted,
+            "max_summary_tokens": self.max_summary_tokens,
+            "summary": self.summary,
+            "messages": [asdict(m) for m in self._messages],
+            "evicted": [asdict(m) for m in self._evicted],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationMemory":
+        memory = cls(
+            max_messages=int(data.get("max_messages", 20)),
+            max_tokens=int(data.get("max_tokens", 4000)),
+            max_tool_result_tokens=int(data.get("max_tool_result_tokens", 1000)),
+            summarize_evicted=bool(data.get("summarize_evicted", False)),
+            max_summary_tokens=int(data.get("max_summary_tokens", 300)),
+        )
+        memory.summary = str(data.get("summary") or "")
+        memory._evicted = [MemoryMessage(**m) for m in data.get("evicted", [])]
+        for raw in data.get("messages", []):
+            message = MemoryMessage(**raw)
+            if not message.tokens:
+                message.tokens = estimate_tokens(message.content)
+            memory._messages.append(message)
+            memory._tokens += message.tokens
+        return memory
+
+    def _over_budget(self) -> bool:
+        unpinned = sum(1 for m in self._messages if not m.pinned)
+        if unpinned > max(self.max_messages, 0):
+            return True
+        return self.max_tokens > 0 and self.token_count() > self.max_tokens
+
+    def _summary_content(self) -> str:
+        return f"Summary of the earlier conversation: {self.summary}"
+
+    def _summary_tokens(self) -> int:
+        return estimate_tokens(self._summary_content()) if self.summary else 0
 
     def _trim(self) -> None:
+        # Drop the oldest unpinned messages first; pinned messages and the
+        # message just added always survive.
+        index = 0
+        while self._over_budget() and index < len(self._messages) - 1:
+            message = self._messages[index]
+            if message.pinned:
+                index += 1
+                continue
+            del self._messages[index]
+            self._tokens -= message.tokens
+            if self.summarize_evicted:
+                self._evicted.append(message)
+        self._cap_evicted()
         if self.max_messages <= 0:
-            self._messages.clear()
-            return
-        if len(self._messages) <= self.max_messages:
-            return
-        overflow = len(self._messages) - self.max_messages
-        if overflow > 0:
-            self._messages = self._messages[overflow:]
+            self._messages = [m for m in self._messages if m.pinned]
+            self._tokens = sum(m.tokens for m in self._messages)
+
+    def _cap_evicted(self) -> None:
+        # If no summarizer drains the backlog (e.g. the CLI), keep it bounded
+        # to roughly one context window's worth of the newest evictions.
+        cap = self.max_tokens if self.max_tokens > 0 else 4000
+        pending = sum(m.tokens for m in self._evicted)
+        while self._evicted and pending > cap:
+            pending -= self._evicted.pop(0).tokens
 
 
 def get_default_memory() -> ConversationMemory:
     max_messages = int(os.getenv("ALENA_MEMORY_MAX_MESSAGES", "20"))
-    return ConversationMemory(max_messages=max_messages)
+    max_tokens = int(os.getenv("ALENA_MEMORY_MAX_TOKENS", "4000"))
+    max_tool_result_tokens = int(
+        os.getenv("ALENA_MEMORY_MAX_TOOL_RESULT_TOKENS", "1000")
+    )
+    summarize_evicted = os.getenv("ALENA_MEMORY_SUMMARIZE", "1") == "1"
+    max_summary_tokens = int(os.getenv("ALENA_MEMORY_MAX_SUMMARY_TOKENS", "300"))
+    return ConversationMemory(
+        max_messages=max_messages,
+        max_tokens=max_tokens,
+        max_tool_result_tokens=max_tool_result_tokens,
+        summarize_evicted=summarize_evicted,
+        max_summary_tokens=max_summary_tokens,
+    )
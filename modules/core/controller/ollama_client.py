@@ -2,17 +2,17 @@ import os
 from datetime import datetime
 
 from modules.core.controller.logger import logger
-from modules.ollama import OllamaChatClient, OllamaConfig
+from modules.ollama import OllamaAsyncClient, OllamaChatClient, OllamaConfig
 from modules.core.controller.tool_definitions import (
     generate_system_prompt_tools_section,
 )
 
-# Get current date and time
-_current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
+# The system prompt must stay byte-identical between requests so Ollama can
+# reuse the KV cache for it; per-request data goes after the history instead
+# (see build_prompt_messages).
 SYSTEM_PROMPT = f"""You are ALENA, an AI planner.
 
-Current Date and Time: {_current_datetime}
+The current date and time are given in a system message just before the latest user message.
 
 Rules:
 - You do NOT execute code.
@@ -37,6 +37,8 @@ When calling a tool, respond ONLY in valid JSON:
   "arguments": {{ ... }}
 }}
 
+To call several independent tools at once, respond with a JSON array of such objects.
+
 Do NOT return empty responses.
 """
 
@@ -47,17 +49,90 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL") or os.getenv(
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "gpt-oss:20b")
 OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "120"))
 OLLAMA_DEBUG = os.getenv("OLLAMA_DEBUG", "0") == "1"
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "10"))
+OLLAMA_MAX_KEEPALIVE = int(os.getenv("OLLAMA_MAX_KEEPALIVE_CONNECTIONS", "5"))
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "1") == "1"
+
+OLLAMA_CONFIG = OllamaConfig(
+    base_url=OLLAMA_BASE_URL,
+    model=OLLAMA_MODEL,
+    timeout_s=OLLAMA_TIMEOUT,
+    debug=OLLAMA_DEBUG,
+    max_connections=OLLAMA_MAX_CONNECTIONS,
+    max_keepalive_connections=OLLAMA_MAX_KEEPALIVE,
+    keep_alive=OLLAMA_KEEP_ALIVE or None,
+)
+
+_client = OllamaChatClient(OLLAMA_CONFIG)
+_async_client = OllamaAsyncClient(OLLAMA_CONFIG)
+
+
+def _runtime_context() -> str:
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return f"Current Date and Time: {now}"
+
+
+def build_prompt_messages(messages):
+    """Order a request as stable prefix -> history -> volatile context.
+
+    SYSTEM_PROMPT (with the tools section) is prepended by the client and the
+    history only ever grows at the end, so consecutive requests share their
+    longest possible prefix. The clock goes right before the newest user
+    message, where it only invalidates the part of the cache that changes.
+    """
+    context = {"role": "system", "content": _runtime_context()}
+    if messages and messages[-1].get("role") == "user":
+        return [*messages[:-1], context, messages[-1]]
+    return [*messages, context]
 
 
 def ask_ollama(messages):
-    config = OllamaConfig(
-        base_url=OLLAMA_BASE_URL,
-        model=OLLAMA_MODEL,
-        timeout_s=OLLAMA_TIMEOUT,
-        debug=OLLAMA_DEBUG,
+    response = _client.chat(
+        build_prompt_messages(messages), system_prompt=SYSTEM_PROMPT
+    )
+    if OLLAMA_DEBUG:
+        logger.info("OLLAMA_RAW_RESPONSE: %s", response)
+    return response
+
+
+async def ask_ollama_async(messages):
+    response = await _async_client.chat(
+        build_prompt_messages(messages), system_prompt=SYSTEM_PROMPT
     )
-    client = OllamaChatClient(config)
-    response = client.chat(messages, system_prompt=SYSTEM_PROMPT)
     if OLLAMA_DEBUG:
         logger.info("OLLAMA_RAW_RESPONSE: %s", response)
     return response
+
+
+async def stream_ollama(messages):
+    async for delta in _async_client.stream_chat(
+        build_prompt_messages(messages), system_prompt=SYSTEM_PROMPT
+    ):
+        yield delta
+
+
+async def warm_up_ollama() -> None:
+    """Load the model and cache the system prompt before the first request."""
+    if not OLLAMA_WARMUP:
+        return
+    try:
+        await _async_client.warm_up(SYSTEM_PROMPT)
+        logger.info(f"Ollama model '{OLLAMA_MODEL}' warmed up")
+    except Exception as exc:
+        logger.warning(f"Ollama warm-up failed: {exc}")
+
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and ALENA.
+Merge the new messages into the existing summary.
+Keep facts, decisions, names, file paths, event ids and open tasks; drop small talk.
+Reply with the updated summary only, in at most 150 words.
+"""
+
+
+async def summarize_ollama(summary: str, messages) -> str:
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    prompt = f"Existing summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"
+    return await _async_client.chat(
+        [{"role": "user", "content": prompt}], system_prompt=SUMMARY_PROMPT
+    )
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from modules.core.controller.logger import logger
+from modules.core.controller.memory import ConversationMemory, get_default_memory
+
+
+@dataclass
+class SessionStoreStats:
+    hits: int = 0
+    misses: int = 0
+    evicted_lru: int = 0
+    evicted_ttl: int = 0
+    evicted_bytes: int = 0
+    sessions: int = 0
+    bytes: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class SessionStore(ABC):
+    """Maps session ids to ConversationMemory with bounded size and age.
+
+    ``get`` returns a live memory object (a new one for unknown sessions);
+    callers hand it back with ``save`` after the turn so backends can persist
+    it and re-apply the size caps. ``peek`` only returns stored sessions and
+    leaves the hit/miss counters and last access time alone.
+    Stores do not serialize turns: callers must not run two turns of the
+    same session at once, or the later ``save`` wins.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = 1000,
+        ttl_s: float = 86400.0,
+        max_bytes: int = 50_000_000,
+        memory_factory: Callable[[], ConversationMemory] = get_default_memory,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.memory_factory = memory_factory
+        self._stats = SessionStoreStats()
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, session_id: str) -> ConversationMemory: ...
+
+    @abstractmethod
+    def peek(self, session_id: str) -> Optional[ConversationMemory]: ...
+
+    @abstractmethod
+    def save(self, session_id: str, memory: ConversationMemory) -> None: ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> SessionStoreStats: ...
+
+    def _expired(self, last_access: float, now: float) -> bool:
+        return self.ttl_s > 0 and now - last_access > self.ttl_s
+
+
+class InMemorySessionStore(SessionStore):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # session_id -> (memory, last_access, size_bytes), oldest first
+        self._entries: "OrderedDict[str, Tuple[ConversationMemory, float, int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+
+    def get(self, session_id: str) -> ConversationMemory:
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                self._stats.hits += 1
+                memory, _, size = entry
+                self._entries[session_id] = (memory, now, size)
+                self._entries.move_to_end(session_id)
+                return memory
+
+            self._stats.misses += 1
+        return self.memory_factory()
+
+    def peek(self, session_id: str) -> Optional[ConversationMemory]:
+        with self._lock:
+            self._expire(time.time())
+            entry = self._entries.get(session_id)
+        return entry[0] if entry is not None else None
+
+    def save(self, session_id: str, memory: ConversationMemory) -> None:
+        now = time.time()
+        size = memory.size_bytes()
+        with self._lock:
+            previous = self._entries.pop(session_id, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[session_id] = (memory, now, size)
+            self._bytes += size
+            self._evict_over_limits()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def stats(self) -> SessionStoreStats:
+        with self._lock:
+            self._expire(time.time())
+            self._stats.sessions = len(self._entries)
+            self._stats.bytes = self._bytes
+            return SessionStoreStats(**self._stats.to_dict())
+
+    def _expire(self, now: float) -> None:
+        # Entries are ordered by last access, so expired ones sit at the front.
+        while self._entries:
+            session_id, (_, last_access, size) = next(iter(self._entries.items()))
+            if not self._expired(last_access, now):
+                break
+            del self._entries[session_id]
+            self._bytes -= size
+            self._stats.evicted_ttl += 1
+
+    def _evict_over_limits(self) -> None:
+        while self.max_sessions > 0 and len(self._entries) > self.max_sessions:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._stats.evicted_lru += 1
+        while self.max_bytes > 0 and self._bytes > self.max_bytes and self._entries:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._stats.evicted_bytes += 1
+
+
+class SQLiteSessionStore(SessionStore):
+    """Session store persisted to a local SQLite file.
+
+    Only sessions touched by in-flight requests are held in process memory;
+    everything else lives on disk and survives controller restarts.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " size_bytes INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_last_access"
+                " ON sessions (last_access)"
+            )
+
+    def get(self, session_id: str) -> ConversationMemory:
+        now = time.time()
+        with self._lock, self._conn:
+            self._expire(now)
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return self.memory_factory()
+
+            self._stats.hits += 1
+            self._conn.execute(
+                "UPDATE sessions SET last_access = ? WHERE session_id = ?",
+                (now, session_id),
+            )
+        return self._load(session_id, row[0]) or self.memory_factory()
+
+    def peek(self, session_id: str) -> Optional[ConversationMemory]:
+        with self._lock, self._conn:
+            self._expire(time.time())
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return self._load(session_id, row[0]) if row is not None else None
+
+    def save(self, session_id: str, memory: ConversationMemory) -> None:
+        data = json.dumps(memory.to_dict())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions"
+                " (session_id, data, size_bytes, last_access) VALUES (?, ?, ?, ?)",
+                (session_id, data, len(data.encode("utf-8")), time.time()),
+            )
+            self._evict_over_limits()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+
+    def stats(self) -> SessionStoreStats:
+        with self._lock, self._conn:
+            self._expire(time.time())
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM sessions"
+            ).fetchone()
+            self._stats.sessions = count
+            self._stats.bytes = total
+            return SessionStoreStats(**self._stats.to_dict())
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _load(self, session_id: str, data: str) -> Optional[ConversationMemory]:
+        try:
+            return ConversationMemory.from_dict(json.loads(data))
+        except (ValueError, TypeError) as exc:
+            logger.warning(f"Discarding unreadable session {session_id}: {exc}")
+            return None
+
+    def _expire(self, now: float) -> None:
+        if self.ttl_s <= 0:
+            return
+        cursor = self._conn.execute(
+            "DELETE FROM sessions WHERE last_access < ?", (now - self.ttl_s,)
+        )
+        self._stats.evicted_ttl += max(cursor.rowcount, 0)
+
+    def _evict_over_limits(self) -> None:
+        if self.max_sessions > 0:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE session_id IN ("
+                " SELECT session_id FROM sessions"
+                " ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_sessions,),
+            )
+            self._stats.evicted_lru += max(cursor.rowcount, 0)
+        if self.max_bytes > 0:
+            rows = self._conn.execute(
+                "SELECT session_id, size_bytes FROM sessions"
+                " ORDER BY last_access DESC"
+            ).fetchall()
+            total = 0
+            victims = []
+            for session_id, size in rows:
+                total += size
+                if total > self.max_bytes:
+                    victims.append((session_id,))
+            if victims:
+                self._conn.executemany(
+                    "DELETE FROM sessions WHERE session_id = ?", victims
+                )
+                self._stats.evicted_bytes += len(victims)
+
+
+def build_session_store() -> SessionStore:
+    backend = os.getenv("ALENA_SESSION_BACKEND", "memory").lower()
+    options = {
+        "max_sessions": int(os.getenv("ALENA_SESSION_MAX_SESSIONS", "1000")),
+        "ttl_s": float(os.getenv("ALENA_SESSION_TTL", "86400")),
+        "max_bytes": int(os.getenv("ALENA_SESSION_MAX_BYTES", "50000000")),
+    }
+    if backend == "sqlite":
+        path = os.getenv("ALENA_SESSION_DB_PATH", "./data/sessions.sqlite3")
+        return SQLiteSessionStore(path, **options)
+    if backend != "memory":
+        logger.warning(f"Unknown ALENA_SESSION_BACKEND '{backend}', using memory")
+    return InMemorySessionStore(**options)
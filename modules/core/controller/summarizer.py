@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from modules.core.controller.logger import logger
+from modules.core.controller.memory import ConversationMemory, MemoryMessage
+from modules.core.controller.ollama_client import summarize_ollama
+
+SummarizeFn = Callable[[str, List[Dict[str, str]]], Awaitable[str]]
+# Receives the new summary and the messages folded into it, and applies it
+UpdateFn = Callable[[str, List[MemoryMessage]], Optional[Awaitable[None]]]
+
+
+class ConversationSummarizer:
+    """Folds messages trimmed from a ConversationMemory into its summary.
+
+    Work runs in background tasks after the response has been sent, so the
+    extra LLM call never adds latency to a turn. At most one summarization
+    runs per ``key`` (by default, per memory object); anything evicted
+    meanwhile is picked up next time. With ``on_update`` the summary is
+    handed to the callback instead of being applied to ``memory``, so the
+    owner can apply it to its current copy under its own locking.
+    """
+
+    def __init__(self, summarize_fn: Optional[SummarizeFn] = None):
+        self.summarize_fn = summarize_fn or summarize_ollama
+        self._tasks: Set[asyncio.Task] = set()
+        self._active: Set[Hashable] = set()
+
+    def schedule(
+        self,
+        memory: ConversationMemory,
+        on_update: Optional[UpdateFn] = None,
+        key: Optional[Hashable] = None,
+    ) -> Optional[asyncio.Task]:
+        key = id(memory) if key is None else key
+        if not memory.has_evicted() or key in self._active:
+            return None
+        self._active.add(key)
+        task = asyncio.create_task(self._summarize(memory, on_update, key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _summarize(
+        self,
+        memory: ConversationMemory,
+        on_update: Optional[UpdateFn],
+        key: Hashable,
+    ) -> None:
+        evicted = memory.take_evicted()
+        try:
+            summary = await self.summarize_fn(
+                memory.summary,
+                [{"role": m.role, "content": m.content} for m in evicted],
+            )
+            if not summary.strip():
+                raise ValueError("empty summary")
+            if on_update is None:
+                memory.apply_summary(summary)
+            else:
+                result = on_update(summary, evicted)
+                if inspect.isawaitable(result):
+                    await result
+        except asyncio.CancelledError:
+            memory.restore_evicted(evicted)
+            raise
+        except Exception as exc:
+            logger.warning(f"Conversation summarization failed: {exc}")
+            memory.restore_evicted(evicted)
+        finally:
+            self._active.discard(key)
+
+    async def close(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
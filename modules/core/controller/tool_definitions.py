@@ -142,6 +142,14 @@ TOOL_DEFINITIONS = [
             ToolArgument("repo_path", "string", description="Path to repository"),
             ToolArgument("instruction", "string", description="Edit instruction"),
         ],
+        optional_args=[
+            ToolArgument(
+                "background",
+                "boolean",
+                required=False,
+                description="Return a job id immediately instead of waiting",
+            )
+        ],
         capabilities=[ToolCapability.EDIT_FILES, ToolCapability.READ_FILES],
     ),
     ToolDefinition(
@@ -158,10 +166,42 @@ TOOL_DEFINITIONS = [
                 "string",
                 required=False,
                 description="Refactoring constraints",
-            )
+            ),
+            ToolArgument(
+                "background",
+                "boolean",
+                required=False,
+                description="Return a job id immediately instead of waiting",
+            ),
         ],
         capabilities=[ToolCapability.EDIT_FILES, ToolCapability.READ_FILES],
     ),
+    ToolDefinition(
+        name="codex_job_status",
+        description="Check the status of a background codex_edit or codex_refactor job",
+        mcp_server="codex",
+        required_args=[
+            ToolArgument("job_id", "string", description="Job id returned on start"),
+        ],
+        capabilities=[ToolCapability.READ_FILES],
+    ),
+    ToolDefinition(
+        name="codex_job_result",
+        description="Get the result of a background codex job, optionally waiting",
+        mcp_server="codex",
+        required_args=[
+            ToolArgument("job_id", "string", description="Job id returned on start"),
+        ],
+        optional_args=[
+            ToolArgument(
+                "wait_s",
+                "number",
+                required=False,
+                description="Seconds to wait for the job to finish",
+            )
+        ],
+        capabilities=[ToolCapability.READ_FILES],
+    ),
     # Google Calendar MCP Server Tools
     ToolDefinition(
         name="google_list_events",
@@ -278,6 +318,119 @@ TOOL_DEFINITIONS = [
         ],
         capabilities=[ToolCapability.ACCESS_NETWORK, ToolCapability.ACCESS_TIME],
     ),
+    ToolDefinition(
+        name="google_batch_create_events",
+        description="Create many events in a Google Calendar in one request",
+        mcp_server="google-calendar",
+        required_args=[
+            ToolArgument(
+                "events",
+                "List[object]",
+                description="Events, each with title, start_time, end_time (ISO format) "
+                "and optional description, attendees",
+            )
+        ],
+        optional_args=[
+            ToolArgument(
+                "calendar_id",
+                "string",
+                required=False,
+                description="Calendar ID (default: primary)",
+            )
+        ],
+        capabilities=[ToolCapability.ACCESS_NETWORK, ToolCapability.ACCESS_TIME],
+    ),
+    ToolDefinition(
+        name="google_batch_update_events",
+        description="Update or reschedule many events in a Google Calendar in one request",
+        mcp_server="google-calendar",
+        required_args=[
+            ToolArgument(
+                "updates",
+                "List[object]",
+                description="Changes, each with event_id and any of title, "
+                "description, start_time, end_time (ISO format)",
+            )
+        ],
+        optional_args=[
+            ToolArgument(
+                "calendar_id",
+                "string",
+                required=False,
+                description="Calendar ID (default: primary)",
+            )
+        ],
+        capabilities=[ToolCapability.ACCESS_NETWORK, ToolCapability.ACCESS_TIME],
+    ),
+    ToolDefinition(
+        name="google_batch_delete_events",
+        description="Delete many events from a Google Calendar in one request",
+        mcp_server="google-calendar",
+        required_args=[
+            ToolArgument("event_ids", "List[string]", description="Event IDs to delete")
+        ],
+        optional_args=[
+            ToolArgument(
+                "calendar_id",
+                "string",
+                required=False,
+                description="Calendar ID (default: primary)",
+            )
+        ],
+        capabilities=[ToolCapability.ACCESS_NETWORK, ToolCapability.ACCESS_TIME],
+    ),
+    ToolDefinition(
+        name="google_find_free_slots",
+        description="Find free meeting slots across one or more Google Calendars",
+        mcp_server="google-calendar",
+        required_args=[
+            ToolArgument(
+                "duration_minutes", "int", description="Meeting length in minutes"
+            )
+        ],
+        optional_args=[
+            ToolArgument(
+                "start_date",
+                "string",
+                required=False,
+                description="First day to search (YYYY-MM-DD, default: now)",
+            ),
+            ToolArgument(
+                "end_date",
+                "string",
+                required=False,
+                description="Last day to search (YYYY-MM-DD, default: 7 days later)",
+            ),
+            ToolArgument(
+                "calendar_ids",
+                "List[string]",
+                required=False,
+                description="Calendars that must all be free (default: primary)",
+            ),
+            ToolArgument(
+                "working_hours_start",
+                "string",
+                required=False,
+                description="Earliest start each day (HH:MM, default: 09:00)",
+            ),
+            ToolArgument(
+                "working_hours_end",
+                "string",
+                required=False,
+                description="Latest end each day (HH:MM, default: 18:00)",
+            ),
+            ToolArgument(
+                "include_weekends",
+                "bool",
+                required=False,
+                description="Also search weekends",
+            ),
+            ToolArgument(
+                "max_slots", "int", required=False, description="Maximum slots"
+            ),
+        ],
+        capabilities=[ToolCapability.ACCESS_NETWORK, ToolCapability.ACCESS_TIME],
+    ),
 ]
 
 
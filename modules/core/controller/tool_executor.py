@@ -1,9 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
 from mcp.client.stdio import stdio_client
 from mcp.client.session import ClientSession
 
-async def execute_tool(server, tool: str, arguments: dict):
+from modules.core.controller.logger import logger
+
+MCP_POOL_ENABLED = os.getenv("ALENA_MCP_POOL_ENABLED", "1") == "1"
+MCP_MAX_CONCURRENCY = int(os.getenv("ALENA_MCP_MAX_CONCURRENCY", "4"))
+MCP_IDLE_TIMEOUT = float(os.getenv("ALENA_MCP_IDLE_TIMEOUT", "300"))
+MCP_INIT_TIMEOUT = float(os.getenv("ALENA_MCP_INIT_TIMEOUT", "30"))
+MCP_HEALTHCHECK_INTERVAL = float(os.getenv("ALENA_MCP_HEALTHCHECK_INTERVAL", "30"))
+MCP_CALL_TIMEOUT = float(os.getenv("ALENA_MCP_CALL_TIMEOUT", "0")) or None
+# Servers with background work answer this tool with their number of active
+# jobs; the pool does not evict a server while it reports any.
+MCP_BUSY_TOOL = "server_busy"
+
+
+def _server_key(server) -> Tuple[Any, ...]:
+    env = getattr(server, "env", None) or {}
+    return (
+        getattr(server, "command", None),
+        tuple(getattr(server, "args", None) or ()),
+        getattr(server, "cwd", None),
+        tuple(sorted(env.items())),
+    )
+
+
+class _ServerWorker:
+    """Owns one long-lived MCP server process and its initialized session.
+
+    The stdio transport is entered and exited inside a dedicated task because
+    its anyio task group must not cross task boundaries; callers only share
+    the resulting ClientSession.
+    """
+
+    def __init__(self, server, max_concurrency: int):
+        self.server = server
+        self.session: Optional[ClientSession] = None
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        # None until the first probe tells whether the server has MCP_BUSY_TOOL
+        self._busy_probe: Optional[bool] = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self, timeout_s: float) -> None:
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            await self.stop()
+            raise RuntimeError(
+                f"MCP server {self.server.cwd} did not initialize "
+                f"within {timeout_s:.0f}s"
+            )
+        if self._error is not None:
+            raise RuntimeError(f"MCP server failed to start: {self._error}")
+
+    async def _run(self) -> None:
+        try:
+            async with stdio_client(self.server) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as exc:
+            self._error = exc
+            logger.warning(f"MCP server {self.server.cwd} exited: {exc}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self, timeout_s: float) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout_s)
+        except Exception as exc:
+            logger.warning(f"MCP health check failed for {self.server.cwd}: {exc}")
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+    async def busy(self, timeout_s: float) -> bool:
+        """Whether the server reports queued or running background jobs."""
+        if not self.alive or self._busy_probe is False:
+            return False
+        try:
+            result = await asyncio.wait_for(
+                self.session.call_tool(MCP_BUSY_TOOL, {}), timeout=timeout_s
+            )
+        except Exception as exc:
+            logger.warning(f"MCP busy probe failed for {self.server.cwd}: {exc}")
+            return False
+        if getattr(result, "isError", False):
+            # Servers without the tool are never asked again
+            self._busy_probe = False
+            return False
+        self._busy_probe = True
+        try:
+            return int(result.content[0].text) > 0
+        except (AttributeError, IndexError, TypeError, ValueError):
+            return False
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=5)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+
+
+class MCPSessionPool:
+    """Pool of initialized MCP sessions, one server process per config."""
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = MCP_MAX_CONCURRENCY,
+        idle_timeout_s: float = MCP_IDLE_TIMEOUT,
+        init_timeout_s: float = MCP_INIT_TIMEOUT,
+        healthcheck_interval_s: float = MCP_HEALTHCHECK_INTERVAL,
+        call_timeout_s: Optional[float] = MCP_CALL_TIMEOUT,
+    ):
+        self.max_concurrency = max_concurrency
+        self.idle_timeout_s = idle_timeout_s
+        self.init_timeout_s = init_timeout_s
+        self.healthcheck_interval_s = healthcheck_interval_s
+        self.call_timeout_s = call_timeout_s
+        self._workers: Dict[Tuple[Any, ...], _ServerWorker] = {}
+        self._locks: Dict[Tuple[Any, ...], asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self) -> None:
+        # The CLI runs each turn under a fresh asyncio.run(); workers from a
+        # closed loop are already dead and must not be reused.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._workers.clear()
+            self._locks.clear()
+            self._loop = loop
+
+    async def _get_worker(self, server) -> _ServerWorker:
+        key = _server_key(server)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            worker = self._workers.get(key)
+            if worker is not None and worker.in_flight == 0:
+                stale = time.monotonic() - worker.last_checked
+                if stale >= self.healthcheck_interval_s:
+                    if not await worker.ping(self.init_timeout_s):
+                        await worker.stop()
+            if worker is None or not worker.alive:
+                if worker is not None:
+                    logger.info(f"Respawning MCP server {server.cwd}")
+                worker = _ServerWorker(server, self.max_concurrency)
+                await worker.start(self.init_timeout_s)
+                self._workers[key] = worker
+                logger.info(f"MCP server ready: {server.cwd}")
+            return worker
+
+    async def call_tool(
+        self, server, tool: str, arguments: dict, progress_callback=None
+    ):
+        self._bind_loop()
+        await self.evict_idle()
+        worker = await self._get_worker(server)
+        read_timeout = (
+            timedelta(seconds=self.call_timeout_s) if self.call_timeout_s else None
+        )
+        async with worker.semaphore:
+            session = worker.session
+            if session is None:
+                await self._discard(server, worker)
+                raise RuntimeError(f"MCP server {server.cwd} is not running")
+            worker.in_flight += 1
+            try:
+                result = await session.call_tool(
+                    tool,
+                    arguments,
+                    read_timeout_seconds=read_timeout,
+                    progress_callback=progress_callback,
+                )
+            except Exception:
+                # If the server stopped answering, drop it so the next call
+                # respawns; the failed call itself is not retried because
+                # tools may not be idempotent.
+                if not await worker.ping(self.init_timeout_s):
+                    await self._discard(server, worker)
+                raise
+            finally:
+                worker.in_flight -= 1
+                worker.last_used = time.monotonic()
+        worker.last_checked = worker.last_used
+        return result
+
+    async def _discard(self, server, worker: _ServerWorker) -> None:
+        key = _server_key(server)
+        if self._workers.get(key) is worker:
+            del self._workers[key]
+        await worker.stop()
+
+    async def evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, worker in list(self._workers.items()):
+            if worker.in_flight:
+                continue
+            if now - worker.last_used < self.idle_timeout_s:
+                continue
+            if await worker.busy(self.init_timeout_s):
+                # Background jobs live in the server; look again later
+                worker.last_used = now
+                continue
+            # A call may have started or replaced the worker during the probe
+            if worker.in_flight or self._workers.get(key) is not worker:
+                continue
+            logger.info(f"Evicting idle MCP server {worker.server.cwd}")
+            del self._workers[key]
+            await worker.stop()
+
+    async def close(self) -> None:
+        workers = list(self._workers.values())
+        self._workers.clear()
+        self._locks.clear()
+        for worker in workers:
+            await worker.stop()
+
+
+_default_pool: Optional[MCPSessionPool] = None
+
+
+def get_default_pool() -> MCPSessionPool:
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = MCPSessionPool()
+    return _default_pool
+
+
+async def close_default_pool() -> None:
+    if _default_pool is not None:
+        await _default_pool.close()
+
+
+async def execute_tool(server, tool: str, arguments: dict, progress_callback=None):
+    """Call an MCP tool; ``progress_callback`` receives its progress notifications."""
+    if MCP_POOL_ENABLED:
+        return await get_default_pool().call_tool(
+            server, tool, arguments, progress_callback=progress_callback
+        )
+
     async with stdio_client(server) as (read, write):
         async with ClientSession(read, write) as session:
             await session.initialize()
-            result = await session.call_tool(tool, arguments)
+            result = await session.call_tool(
+                tool, arguments, progress_callback=progress_callback
+            )
             return result
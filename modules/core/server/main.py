@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+from contextlib import asynccontextmanager
 from urllib.parse import urlparse
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from modules.core.controller.agent import run_agent
-from modules.core.controller.memory import ConversationMemory
+from modules.core.controller.logger import logger
+from modules.core.controller.memory import ConversationMemory, MemoryMessage
+from modules.core.controller.ollama_client import OLLAMA_CONFIG, warm_up_ollama
+from modules.core.controller.session_store import build_session_store
+from modules.core.controller.summarizer import ConversationSummarizer
+from modules.core.controller.tool_executor import close_default_pool
+from modules.ollama import close_shared_clients, open_shared_clients
 
 
 class GenerateRequest(BaseModel):
@@ -24,46 +34,167 @@ class HealthResponse(BaseModel):
     ok: bool = True
 
 
-_SESSION_MEMORY: Dict[str, ConversationMemory] = {}
+class SessionStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    evicted_lru: int
+    evicted_ttl: int
+    evicted_bytes: int
+    sessions: int
+    bytes: int
+
+
+_SESSION_STORE = build_session_store()
+# session_id -> [lock, holders]; dropped when no request needs it
+_SESSION_LOCKS: Dict[str, List] = {}
+
+
+@asynccontextmanager
+async def _session_turn(session_id: Optional[str]) -> AsyncIterator[None]:
+    """Run one turn of a session at a time.
+
+    Each turn loads the session, runs the agent and saves it back; two
+    overlapping turns would each save their own copy and drop the other's
+    messages.
+    """
+    if not session_id:
+        yield
+        return
+    entry = _SESSION_LOCKS.setdefault(session_id, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _SESSION_LOCKS[session_id]
 
 
 def _get_memory(session_id: Optional[str]) -> ConversationMemory:
     if not session_id:
         return ConversationMemory()
-    memory = _SESSION_MEMORY.get(session_id)
-    if memory is None:
-        memory = ConversationMemory()
-        _SESSION_MEMORY[session_id] = memory
-    return memory
+    return _SESSION_STORE.get(session_id)
+
+
+_SUMMARIZER = ConversationSummarizer()
+
+
+def _save_memory(session_id: Optional[str], memory: ConversationMemory) -> None:
+    if not session_id:
+        return
+    _SESSION_STORE.save(session_id, memory)
+    # Fold trimmed turns into the session summary after the response is out.
+    _SUMMARIZER.schedule(
+        memory,
+        on_update=lambda summary, summarized: _store_summary(
+            session_id, summary, summarized
+        ),
+        key=session_id,
+    )
+
+
+async def _store_summary(
+    session_id: str, summary: str, summarized: List[MemoryMessage]
+) -> None:
+    # Later turns may have saved the session since the summary was scheduled;
+    # fold it into what is stored now instead of writing back the old copy.
+    async with _session_turn(session_id):
+        memory = _SESSION_STORE.peek(session_id)
+        if memory is None:
+            # Evicted or expired meanwhile; do not bring it back
+            return
+        memory.apply_summary(summary, summarized)
+        _SESSION_STORE.save(session_id, memory)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    await open_shared_clients(OLLAMA_CONFIG)
+    # Load the model in the background so startup does not wait on Ollama.
+    warm_up = asyncio.create_task(warm_up_ollama())
+    yield
+    warm_up.cancel()
+    await _SUMMARIZER.close()
+    await close_default_pool()
+    await close_shared_clients()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="alena-controller")
+    app = FastAPI(title="alena-controller", lifespan=_lifespan)
 
     @app.get("/health", response_model=HealthResponse)
     async def health() -> HealthResponse:
         return HealthResponse(ok=True)
 
+    @app.get("/sessions/stats", response_model=SessionStatsResponse)
+    async def session_stats() -> SessionStatsResponse:
+        return SessionStatsResponse(**_SESSION_STORE.stats().to_dict())
+
     @app.post("/generate", response_model=GenerateResponse)
     async def generate(payload: GenerateRequest) -> GenerateResponse:
-        memory = _get_memory(payload.session_id)
         outputs = []
 
         def _sink(text: str) -> None:
             outputs.append(text)
 
-        response = await run_agent(
-            payload.prompt,
-            memory=memory,
-            output_sink=_sink,
-            return_output=True,
-        )
+        async with _session_turn(payload.session_id):
+            memory = _get_memory(payload.session_id)
+            try:
+                response = await run_agent(
+                    payload.prompt,
+                    memory=memory,
+                    output_sink=_sink,
+                    return_output=True,
+                )
+            finally:
+                _save_memory(payload.session_id, memory)
 
         if response is None:
             response = ""
 
         return GenerateResponse(response=response)
 
+    @app.post("/generate/stream")
+    async def generate_stream(payload: GenerateRequest) -> StreamingResponse:
+        """NDJSON stream of token, tool and final events for one agent turn."""
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def _run() -> None:
+            try:
+                async with _session_turn(payload.session_id):
+                    memory = _get_memory(payload.session_id)
+                    try:
+                        response = await run_agent(
+                            payload.prompt,
+                            memory=memory,
+                            output_sink=lambda _: None,
+                            event_sink=events.put_nowait,
+                            return_output=True,
+                        )
+                    finally:
+                        _save_memory(payload.session_id, memory)
+                events.put_nowait({"type": "final", "response": response or ""})
+            except Exception as exc:
+                logger.exception("Streaming generate failed")
+                events.put_nowait({"type": "error", "message": str(exc)})
+            finally:
+                events.put_nowait(None)
+
+        async def _stream():
+            task = asyncio.create_task(_run())
+            try:
+                while True:
+                    event = await events.get()
+                    if event is None:
+                        break
+                    yield json.dumps(event) + "\n"
+            finally:
+                if not task.done():
+                    task.cancel()
+
+        return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
     return app
 
 
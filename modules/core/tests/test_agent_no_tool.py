@@ -5,12 +5,42 @@ import json
 async def test_agent_exits_on_plain_text(monkeypatch):
     from modules.core.controller.agent import run_agent
 
-    def fake_ollama(_):
+    async def fake_ollama(_):
         return "Just explaining, no tool needed."
 
     monkeypatch.setattr(
-        "modules.core.controller.agent.ask_ollama",
+        "modules.core.controller.agent.ask_ollama_async",
         fake_ollama
     )
 
     await run_agent("Explain hello world")
+
+
+@pytest.mark.asyncio
+async def test_agent_turns_do_not_block_each_other(monkeypatch):
+    import asyncio
+    from modules.core.controller.agent import run_agent
+    from modules.core.controller.memory import ConversationMemory
+
+    both_waiting = asyncio.Event()
+    waiting = 0
+
+    async def fake_ollama(_):
+        nonlocal waiting
+        waiting += 1
+        if waiting == 2:
+            both_waiting.set()
+        await asyncio.wait_for(both_waiting.wait(), timeout=1)
+        return "Done."
+
+    monkeypatch.setattr(
+        "modules.core.controller.agent.ask_ollama_async",
+        fake_ollama
+    )
+
+    results = await asyncio.gather(
+        run_agent("first", memory=ConversationMemory(), output_sink=lambda _: None, return_output=True),
+        run_agent("second", memory=ConversationMemory(), output_sink=lambda _: None, return_output=True),
+    )
+
+    assert results == ["Done.", "Done."]
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import pytest
+
+from modules.core.controller.memory import ConversationMemory
+from modules.ollama.client import _extract_chat_content_or_tool_call
+
+
+def _fake_llm(monkeypatch, *replies):
+    calls = iter(replies)
+
+    async def fake_ollama(_messages):
+        return next(calls)
+
+    monkeypatch.setattr("modules.core.controller.agent.ask_ollama_async", fake_ollama)
+
+
+class FakeResult:
+    def __init__(self, content):
+        self.content = content
+
+
+@pytest.mark.asyncio
+async def test_agent_runs_tool_calls_from_one_reply_concurrently(monkeypatch):
+    from modules.core.controller.agent import run_agent
+
+    tool_calls = [
+        {"tool": "google_list_events", "arguments": {}},
+        {"tool": "codex_analyze", "arguments": {"repo_path": ".", "question": "q"}},
+    ]
+    _fake_llm(monkeypatch, json.dumps(tool_calls), "All done.")
+    monkeypatch.setattr(
+        "modules.core.controller.agent.normalize_codex_output",
+        lambda content: {"message": content, "reasoning": None},
+    )
+
+    both_running = asyncio.Event()
+    running = 0
+
+    async def slow_tool_executor(server, tool, arguments):
+        # Each call only returns once the other has started too
+        nonlocal running
+        running += 1
+        if running == 2:
+            both_running.set()
+        await asyncio.wait_for(both_running.wait(), timeout=1)
+        return FakeResult(f"{tool} result")
+
+    memory = ConversationMemory(max_tokens=0)
+    final = await run_agent(
+        "list my calendar and analyze the repo",
+        memory=memory,
+        tool_executor=slow_tool_executor,
+        output_sink=lambda _: None,
+        return_output=True,
+    )
+
+    assert final == "All done."
+    contents = [m["content"] for m in memory.get_messages()]
+    assert "Tool result: google_list_events | google_list_events result" in contents
+    assert "Tool result: codex_analyze | codex_analyze result" in contents
+
+
+@pytest.mark.asyncio
+async def test_agent_reports_tool_timeout_as_result(monkeypatch):
+    from modules.core.controller.agent import run_agent
+
+    monkeypatch.setenv("ALENA_TOOL_TIMEOUT", "0.05")
+    _fake_llm(
+        monkeypatch,
+        json.dumps({"tool": "google_list_events", "arguments": {}}),
+        "Calendar is slow.",
+    )
+
+    async def hanging_tool_executor(server, tool, arguments):
+        await asyncio.sleep(10)
+
+    memory = ConversationMemory(max_tokens=0)
+    final = await run_agent(
+        "list my calendar",
+        memory=memory,
+        tool_executor=hanging_tool_executor,
+        output_sink=lambda _: None,
+        return_output=True,
+    )
+
+    assert final == "Calendar is slow."
+    assert any("timed out" in m["content"] for m in memory.get_messages())
+
+
+def test_native_tool_calls_are_all_kept():
+    data = {
+        "message": {
+            "content": "",
+            "tool_calls": [
+                {"function": {"name": "google_list_events", "arguments": {}}},
+                {"function": {"name": "codex_analyze", "arguments": {"q": 1}}},
+            ],
+        }
+    }
+
+    assert json.loads(_extract_chat_content_or_tool_call(data)) == [
+        {"tool": "google_list_events", "arguments": {}},
+        {"tool": "codex_analyze", "arguments": {"q": 1}},
+    ]
+
+
+def test_prepare_tool_call_fixes_utc_times_inside_batch_items(monkeypatch):
+    from modules.core.controller.agent import _prepare_tool_call
+
+    monkeypatch.setenv("CALENDAR_TIMEZONE_OFFSET", "+02:00")
+    tool, arguments = _prepare_tool_call(
+        {
+            "tool": "google_batch_update_events",
+            "arguments": {
+                "updates": [
+                    {"event_id": "a", "start_time": "2025-01-20T10:00:00Z"},
+                    {"event_id": "b", "end_time": "2025-01-20T12:00:00+02:00"},
+                ]
+            },
+        }
+    )
+
+    assert tool == "google_batch_update_events"
+    assert arguments["updates"][0]["start_time"] == "2025-01-20T10:00:00+02:00"
+    assert arguments["updates"][1]["end_time"] == "2025-01-20T12:00:00+02:00"
@@ -13,9 +13,12 @@ async def test_agent_parses_json_tool_call(monkeypatch):
         }
     })
 
+    async def fake_ollama(_):
+        return fake_response
+
     monkeypatch.setattr(
-        "modules.core.controller.agent.ask_ollama",
-        lambda _: fake_response
+        "modules.core.controller.agent.ask_ollama_async",
+        fake_ollama
     )
 
     monkeypatch.setattr(
@@ -0,0 +1,29 @@
+from modules.core.tools.intents import INTENT_RULES, infer_intents
+from modules.core.tools.tool_capabilities import tool_can_handle
+
+
+def test_infer_intents_matches_keywords_and_phrases():
+    assert infer_intents("What time is it?") == {"access_time"}
+    assert infer_intents("Please EDIT the readme") == {"edit_files"}
+    assert infer_intents("show the current  working\ndirectory") == {
+        "access_filesystem"
+    }
+    assert infer_intents("download https://example.com and write code") == {
+        "access_network",
+        "generate_code",
+    }
+
+
+def test_infer_intents_respects_word_boundaries():
+    assert infer_intents("I know a rapid credit check") == set()
+    assert infer_intents("programming is fun") == {"generate_code"}
+
+
+def test_every_rule_links_to_a_capability():
+    assert all(rule.capabilities for rule in INTENT_RULES)
+
+
+def test_tool_can_handle_uses_rule_capabilities():
+    assert tool_can_handle("codex_analyze", {"access_filesystem"})
+    assert not tool_can_handle("codex_analyze", {"access_time"})
+    assert tool_can_handle("codex_analyze", {"unknown_intent"})
@@ -0,0 +1,59 @@
+from modules.core.controller.memory import ConversationMemory, estimate_tokens
+
+
+def test_memory_trims_by_message_count():
+    memory = ConversationMemory(max_messages=2, max_tokens=0)
+
+    for text in ["one", "two", "three"]:
+        memory.add_user(text)
+
+    assert [m["content"] for m in memory.get_messages()] == ["two", "three"]
+
+
+def test_memory_trims_oldest_messages_to_token_budget():
+    memory = ConversationMemory(max_messages=100, max_tokens=50)
+
+    for i in range(5):
+        memory.add_user(f"{i}" * 80)
+
+    assert memory.token_count() <= 50
+    assert memory.get_messages()[-1]["content"] == "4" * 80
+    assert memory.token_count() == sum(
+        estimate_tokens(m["content"]) for m in memory.get_messages()
+    )
+
+
+def test_memory_truncates_oversized_tool_results():
+    memory = ConversationMemory(max_tool_result_tokens=100)
+
+    memory.add_tool_result("codex_analyze", "a" * 300 + "b" * 5000 + "c" * 300)
+
+    content = memory.get_messages()[0]["content"]
+    assert content.startswith("Tool result: codex_analyze | aaa")
+    assert content.endswith("ccc")
+    assert "chars truncated" in content
+    assert memory.token_count() < 150
+
+
+def test_memory_keeps_pinned_messages():
+    memory = ConversationMemory(max_messages=2, max_tokens=0)
+
+    memory.add_user("remember: my repo is ~/alena", pinned=True)
+    for text in ["one", "two", "three"]:
+        memory.add_user(text)
+
+    contents = [m["content"] for m in memory.get_messages()]
+    assert contents == ["remember: my repo is ~/alena", "two", "three"]
+
+
+def test_memory_budget_counts_the_summary():
+    memory = ConversationMemory(max_messages=100, max_tokens=60)
+    for i in range(5):
+        memory.add_user(f"message number {i} " * 2)
+
+    memory.apply_summary("the user sent a few numbered messages " * 3)
+
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in memory.get_messages())
+    assert memory.token_count() == prompt_tokens
+    assert prompt_tokens <= 60
+    assert memory.get_messages()[0]["role"] == "system"
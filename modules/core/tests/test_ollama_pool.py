@@ -0,0 +1,121 @@
+import asyncio
+import threading
+from weakref import WeakKeyDictionary
+
+import pytest
+
+from modules.ollama import OllamaConfig
+from modules.ollama import client as ollama_client
+from modules.ollama.client import (
+    close_shared_clients,
+    get_shared_async_client,
+    get_shared_client,
+    open_shared_clients,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_pools(monkeypatch):
+    monkeypatch.setattr(ollama_client, "_sync_clients", {})
+    monkeypatch.setattr(ollama_client, "_async_clients", WeakKeyDictionary())
+
+
+def _config(**overrides):
+    return OllamaConfig(base_url="http://ollama:11434", model="m", **overrides)
+
+
+def test_sync_client_is_shared_per_pool_key():
+    first = get_shared_client(_config())
+    # Trailing slash and model do not change the pool
+    same = get_shared_client(
+        OllamaConfig(base_url="http://ollama:11434/", model="other")
+    )
+    other = get_shared_client(_config(max_connections=3))
+
+    assert first is same
+    assert other is not first
+    first.close()
+    other.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_shared_per_pool_key():
+    first = get_shared_async_client(_config())
+
+    assert get_shared_async_client(_config()) is first
+    assert get_shared_async_client(_config(max_keepalive_connections=1)) is not first
+    await close_shared_clients()
+
+
+@pytest.mark.asyncio
+async def test_open_and_close_follow_the_lifespan():
+    await open_shared_clients(_config())
+    sync_client = get_shared_client(_config())
+    async_client = get_shared_async_client(_config())
+
+    await close_shared_clients()
+
+    assert sync_client.is_closed
+    assert async_client.is_closed
+    assert get_shared_client(_config()) is not sync_client
+    assert get_shared_async_client(_config()) is not async_client
+    await close_shared_clients()
+
+
+async def _shared():
+    return get_shared_async_client(_config())
+
+
+@pytest.fixture
+def other_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(1)
+    loop.close()
+
+
+def _run_on(loop, coro):
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(1)
+
+
+def test_each_running_loop_keeps_its_own_client(other_loop):
+    theirs = _run_on(other_loop, _shared())
+
+    async def alternate():
+        ours = get_shared_async_client(_config())
+        assert _run_on(other_loop, _shared()) is theirs
+        assert get_shared_async_client(_config()) is ours
+        return ours
+
+    ours = asyncio.run(alternate())
+
+    assert ours is not theirs
+    assert not theirs.is_closed
+    assert _run_on(other_loop, _shared()) is theirs
+    _run_on(other_loop, theirs.aclose())
+
+
+def test_close_shared_clients_closes_other_loops_clients_there(other_loop):
+    theirs = _run_on(other_loop, _shared())
+
+    asyncio.run(close_shared_clients())
+    # The close was scheduled on the owning loop; let it run
+    _run_on(other_loop, asyncio.sleep(0.05))
+
+    assert theirs.is_closed
+
+
+def test_client_from_a_finished_loop_is_dropped():
+    stale = asyncio.run(_shared())
+
+    async def replace():
+        client = get_shared_async_client(_config())
+        return client, list(ollama_client._async_clients)
+
+    fresh, loops = asyncio.run(replace())
+
+    assert fresh is not stale
+    assert len(loops) == 1
@@ -0,0 +1,37 @@
+from modules.core.controller import ollama_client
+from modules.ollama import OllamaConfig
+from modules.ollama.client import _build_chat_payload
+
+
+def test_prompt_keeps_stable_prefix_and_volatile_tail(monkeypatch):
+    history = [
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "hello"},
+    ]
+    monkeypatch.setattr(ollama_client, "_runtime_context", lambda: "clock-1")
+    first = ollama_client.build_prompt_messages(
+        [*history, {"role": "user", "content": "what time is it"}]
+    )
+    monkeypatch.setattr(ollama_client, "_runtime_context", lambda: "clock-2")
+    second = ollama_client.build_prompt_messages(
+        [*history, {"role": "user", "content": "and now"}]
+    )
+
+    assert first[:2] == second[:2] == history
+    assert first[-2] == {"role": "system", "content": "clock-1"}
+    assert first[-1] == {"role": "user", "content": "what time is it"}
+    assert "Current Date and Time:" not in ollama_client.SYSTEM_PROMPT
+
+
+def test_chat_payload_sends_keep_alive():
+    config = OllamaConfig(base_url="http://ollama", model="m", keep_alive="-1")
+    payload = _build_chat_payload(config, [], "system")
+
+    assert payload["keep_alive"] == -1
+    assert payload["messages"] == [{"role": "system", "content": "system"}]
+
+    config = OllamaConfig(base_url="http://ollama", model="m", keep_alive="30m")
+    assert _build_chat_payload(config, [], None)["keep_alive"] == "30m"
+    assert "keep_alive" not in _build_chat_payload(
+        OllamaConfig(base_url="http://ollama", model="m"), [], None
+    )
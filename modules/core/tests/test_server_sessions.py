@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+import pytest
+
+from modules.core.controller.session_store import SQLiteSessionStore
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, monkeypatch):
+    from modules.core.server import main
+
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    monkeypatch.setattr(main, "_SESSION_STORE", store)
+    yield store
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_turns_of_one_session_are_not_lost(sqlite_store, monkeypatch):
+    from modules.core.server import main
+
+    async def fake_run_agent(prompt, memory, **kwargs):
+        memory.add_user(prompt)
+        # Give the other request a chance to load the session meanwhile
+        await asyncio.sleep(0.05)
+        memory.add_assistant(f"re: {prompt}")
+        return f"re: {prompt}"
+
+    monkeypatch.setattr(main, "run_agent", fake_run_agent)
+
+    transport = httpx.ASGITransport(app=main.create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await asyncio.gather(
+            client.post("/generate", json={"prompt": "one", "session_id": "s"}),
+            client.post("/generate", json={"prompt": "two", "session_id": "s"}),
+        )
+
+    contents = [m["content"] for m in sqlite_store.get("s").get_messages()]
+    assert sorted(contents) == ["one", "re: one", "re: two", "two"]
+    assert main._SESSION_LOCKS == {}
+
+
+@pytest.mark.asyncio
+async def test_late_summary_does_not_overwrite_a_newer_turn(sqlite_store, monkeypatch):
+    from modules.core.controller.memory import ConversationMemory
+    from modules.core.controller.summarizer import ConversationSummarizer
+    from modules.core.server import main
+
+    release = asyncio.Event()
+
+    async def slow_summarize(summary, messages):
+        await release.wait()
+        return "Earlier: greetings."
+
+    monkeypatch.setattr(main, "_SUMMARIZER", ConversationSummarizer(slow_summarize))
+
+    # Turn N evicts a message, which schedules a summary
+    memory = ConversationMemory(max_messages=2, summarize_evicted=True)
+    for text in ("hello", "hi", "how are you"):
+        memory.add_user(text)
+    main._save_memory("s", memory)
+
+    # Turn N+1 loads and saves its own copy while the summary is running
+    newer = sqlite_store.get("s")
+    newer.add_user("still there?")
+    main._save_memory("s", newer)
+
+    release.set()
+    await asyncio.gather(*main._SUMMARIZER._tasks)
+
+    stored = sqlite_store.get("s")
+    contents = [m["content"] for m in stored.get_messages()]
+    assert contents[0] == "Summary of the earlier conversation: Earlier: greetings."
+    assert contents[-1] == "still there?"
+    # "hello" was summarized; "hi", evicted by turn N+1, still awaits its turn
+    assert [m.content for m in stored.take_evicted()] == ["hi"]
+
+
+@pytest.mark.asyncio
+async def test_summary_of_an_evicted_session_is_dropped(sqlite_store, monkeypatch):
+    from modules.core.controller.memory import ConversationMemory
+    from modules.core.controller.summarizer import ConversationSummarizer
+    from modules.core.server import main
+
+    release = asyncio.Event()
+
+    async def slow_summarize(summary, messages):
+        await release.wait()
+        return "Earlier: greetings."
+
+    monkeypatch.setattr(main, "_SUMMARIZER", ConversationSummarizer(slow_summarize))
+
+    memory = ConversationMemory(max_messages=2, summarize_evicted=True)
+    for text in ("hello", "hi", "how are you"):
+        memory.add_user(text)
+    main._save_memory("s", memory)
+
+    sqlite_store.delete("s")
+    release.set()
+    await asyncio.gather(*main._SUMMARIZER._tasks)
+
+    assert sqlite_store.peek("s") is None
+    assert sqlite_store.stats().sessions == 0
@@ -0,0 +1,70 @@
+import json
+
+from fastapi.testclient import TestClient
+
+
+def _fake_stream(*replies):
+    calls = iter(replies)
+
+    async def fake_stream_ollama(_messages):
+        for delta in next(calls):
+            yield delta
+
+    return fake_stream_ollama
+
+
+def _read_events(response):
+    return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def test_generate_stream_emits_tokens_then_final(monkeypatch):
+    from modules.core.server.main import create_app
+
+    monkeypatch.setattr(
+        "modules.core.controller.agent.stream_ollama",
+        _fake_stream(["Hel", "lo", " there"]),
+    )
+
+    with TestClient(create_app()) as client:
+        with client.stream("POST", "/generate/stream", json={"prompt": "hi"}) as resp:
+            events = _read_events(resp)
+
+    tokens = [e["text"] for e in events if e["type"] == "token"]
+    assert tokens == ["Hel", "lo", " there"]
+    assert events[-1] == {"type": "final", "response": "Hello there"}
+
+
+def test_generate_stream_hides_tool_call_json(monkeypatch):
+    from modules.core.server.main import create_app
+
+    tool_call = json.dumps({"tool": "codex_generate", "arguments": {"prompt": "x"}})
+    monkeypatch.setattr(
+        "modules.core.controller.agent.stream_ollama",
+        _fake_stream([tool_call[:5], tool_call[5:]], ["Generated."]),
+    )
+
+    async def fake_tool_executor(server, tool, arguments, progress_callback=None):
+        await progress_callback(1, None, "Message: working on it")
+
+        class FakeResult:
+            content = []
+
+        return FakeResult()
+
+    monkeypatch.setattr(
+        "modules.core.controller.agent.execute_tool", fake_tool_executor
+    )
+
+    with TestClient(create_app()) as client:
+        with client.stream(
+            "POST", "/generate/stream", json={"prompt": "write code"}
+        ) as resp:
+            events = _read_events(resp)
+
+    kinds = [(e["type"], e.get("event")) for e in events]
+    assert ("tool", "start") in kinds
+    assert ("tool", "end") in kinds
+    progress = [e for e in events if e.get("event") == "progress"]
+    assert progress[0]["message"] == "Message: working on it"
+    assert all(tool_call[:5] not in e.get("text", "") for e in events)
+    assert events[-1] == {"type": "final", "response": "Generated."}
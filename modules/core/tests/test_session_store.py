@@ -0,0 +1,110 @@
+import pytest
+
+from modules.core.controller.memory import ConversationMemory
+from modules.core.controller.session_store import (
+    InMemorySessionStore,
+    SQLiteSessionStore,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def _make(**kwargs):
+        if request.param == "sqlite":
+            return SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"), **kwargs)
+        return InMemorySessionStore(**kwargs)
+
+    return _make
+
+
+def _remember(store, session_id, text):
+    memory = store.get(session_id)
+    memory.add_user(text)
+    store.save(session_id, memory)
+
+
+def test_store_round_trips_memory(make_store):
+    store = make_store()
+
+    _remember(store, "chat-1", "hello")
+
+    assert store.get("chat-1").get_messages() == [{"role": "user", "content": "hello"}]
+    stats = store.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.sessions == 1
+
+
+def test_store_evicts_least_recently_used(make_store):
+    store = make_store(max_sessions=2)
+
+    _remember(store, "a", "one")
+    _remember(store, "b", "two")
+    store.get("a")
+    _remember(store, "c", "three")
+
+    assert store.get("a").get_messages()
+    assert store.get("b").get_messages() == []
+    assert store.stats().evicted_lru == 1
+
+
+def test_store_expires_sessions_after_ttl(make_store, monkeypatch):
+    import modules.core.controller.session_store as session_store
+
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: now[0])
+    store = make_store(ttl_s=60)
+
+    _remember(store, "a", "one")
+    now[0] += 61
+
+    assert store.get("a").get_messages() == []
+    assert store.stats().evicted_ttl == 1
+
+
+def test_store_caps_total_bytes(make_store):
+    store = make_store(max_bytes=2000)
+
+    _remember(store, "a", "x" * 900)
+    _remember(store, "b", "y" * 900)
+    _remember(store, "c", "z" * 900)
+
+    stats = store.stats()
+    assert stats.evicted_bytes >= 1
+    assert stats.bytes <= 2000
+    assert store.get("c").get_messages()
+
+
+def test_store_peek_does_not_create_sessions(make_store, monkeypatch):
+    import modules.core.controller.session_store as session_store
+
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: now[0])
+    store = make_store(ttl_s=60)
+    _remember(store, "a", "one")
+
+    assert store.peek("a").get_messages() == [{"role": "user", "content": "one"}]
+    assert store.peek("missing") is None
+    now[0] += 61
+    assert store.peek("a") is None
+
+    stats = store.stats()
+    assert (stats.hits, stats.misses, stats.sessions) == (0, 1, 0)
+
+
+def test_memory_serialization_round_trip():
+    memory = ConversationMemory(max_messages=5)
+    memory.add_user("hi")
+    memory.add_tool_result("codex_analyze", "done")
+
+    restored = ConversationMemory.from_dict(memory.to_dict())
+
+    assert restored.max_messages == 5
+    assert restored.get_messages() == memory.get_messages()
+
+
+def test_session_store_base_class_is_abstract():
+    from modules.core.controller.session_store import SessionStore
+
+    with pytest.raises(TypeError):
+        SessionStore()
@@ -0,0 +1,86 @@
+import pytest
+
+from modules.core.controller.memory import ConversationMemory
+from modules.core.controller.summarizer import ConversationSummarizer
+
+
+def _memory_with_evictions():
+    memory = ConversationMemory(max_messages=2, summarize_evicted=True)
+    memory.add_user("my name is Alena")
+    memory.add_assistant("nice to meet you")
+    memory.add_user("what is the weather")
+    memory.add_assistant("sunny")
+    return memory
+
+
+@pytest.mark.asyncio
+async def test_summarizer_folds_evicted_messages_into_summary():
+    seen = []
+
+    async def fake_summarize(summary, messages):
+        seen.append((summary, messages))
+        return "User is called Alena."
+
+    memory = _memory_with_evictions()
+    summarizer = ConversationSummarizer(fake_summarize)
+
+    await summarizer.schedule(memory)
+
+    assert seen[0][0] == ""
+    assert [m["content"] for m in seen[0][1]] == [
+        "my name is Alena",
+        "nice to meet you",
+    ]
+    assert not memory.has_evicted()
+    messages = memory.get_messages()
+    assert messages[0]["role"] == "system"
+    assert "User is called Alena." in messages[0]["content"]
+    assert [m["content"] for m in messages[1:]] == ["what is the weather", "sunny"]
+
+
+@pytest.mark.asyncio
+async def test_summarizer_leaves_applying_the_summary_to_on_update():
+    async def fake_summarize(summary, messages):
+        return "User is called Alena."
+
+    memory = _memory_with_evictions()
+    updates = []
+
+    await ConversationSummarizer(fake_summarize).schedule(
+        memory,
+        on_update=lambda summary, summarized: updates.append(
+            (summary, [m.content for m in summarized])
+        ),
+    )
+
+    assert updates == [
+        ("User is called Alena.", ["my name is Alena", "nice to meet you"])
+    ]
+    assert memory.summary == ""
+    assert not memory.has_evicted()
+
+
+@pytest.mark.asyncio
+async def test_summarizer_restores_evicted_messages_on_failure():
+    async def failing_summarize(summary, messages):
+        raise RuntimeError("ollama down")
+
+    memory = _memory_with_evictions()
+    summarizer = ConversationSummarizer(failing_summarize)
+
+    await summarizer.schedule(memory)
+
+    assert memory.has_evicted()
+    assert memory.summary == ""
+    assert memory.get_messages()[0]["role"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_summarizer_skips_memory_without_evictions():
+    async def fake_summarize(summary, messages):
+        raise AssertionError("should not be called")
+
+    memory = ConversationMemory(max_messages=10, summarize_evicted=True)
+    memory.add_user("hi")
+
+    assert ConversationSummarizer(fake_summarize).schedule(memory) is None
@@ -0,0 +1,172 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from modules.core.controller import tool_executor
+from modules.core.controller.tool_executor import MCPSessionPool
+
+
+class FakeSession:
+    instances = []
+
+    def __init__(self, read, write):
+        self.calls = []
+        self.ping_ok = True
+        FakeSession.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def initialize(self):
+        return None
+
+    async def send_ping(self):
+        if not self.ping_ok:
+            raise ConnectionError("server gone")
+
+    async def call_tool(
+        self, tool, arguments, read_timeout_seconds=None, progress_callback=None
+    ):
+        self.calls.append((tool, arguments))
+        await asyncio.sleep(0)
+        return SimpleNamespace(content=[tool])
+
+
+@asynccontextmanager
+async def fake_stdio_client(server):
+    yield (None, None)
+
+
+@pytest.fixture
+def fake_transport(monkeypatch):
+    FakeSession.instances = []
+    monkeypatch.setattr(tool_executor, "stdio_client", fake_stdio_client)
+    monkeypatch.setattr(tool_executor, "ClientSession", FakeSession)
+    return FakeSession
+
+
+def _server(cwd="/mcp/codex-server"):
+    return SimpleNamespace(command="python", args=["-m", "app.main"], cwd=cwd, env=None)
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_session_for_same_server(fake_transport):
+    pool = MCPSessionPool()
+
+    await pool.call_tool(_server(), "codex_generate", {"prompt": "a"})
+    await pool.call_tool(_server(), "codex_generate", {"prompt": "b"})
+    await pool.call_tool(_server("/mcp/google-calendar"), "google_list_events", {})
+
+    assert len(fake_transport.instances) == 2
+    assert len(fake_transport.instances[0].calls) == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_respawns_after_failed_health_check(fake_transport):
+    pool = MCPSessionPool(healthcheck_interval_s=0)
+
+    await pool.call_tool(_server(), "codex_generate", {"prompt": "a"})
+    fake_transport.instances[0].ping_ok = False
+    result = await pool.call_tool(_server(), "codex_generate", {"prompt": "b"})
+
+    assert result.content == ["codex_generate"]
+    assert len(fake_transport.instances) == 2
+    assert fake_transport.instances[1].calls == [("codex_generate", {"prompt": "b"})]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_idle_servers(fake_transport):
+    pool = MCPSessionPool(idle_timeout_s=0)
+
+    await pool.call_tool(_server(), "codex_generate", {"prompt": "a"})
+    await pool.evict_idle()
+
+    assert pool._workers == {}
+    await pool.call_tool(_server(), "codex_generate", {"prompt": "b"})
+    assert len(fake_transport.instances) == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrency_per_server(fake_transport, monkeypatch):
+    active = 0
+    peak = 0
+
+    async def slow_call(
+        self, tool, arguments, read_timeout_seconds=None, progress_callback=None
+    ):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return SimpleNamespace(content=[])
+
+    monkeypatch.setattr(FakeSession, "call_tool", slow_call)
+    pool = MCPSessionPool(max_concurrency=2)
+
+    await asyncio.gather(
+        *(pool.call_tool(_server(), "codex_generate", {}) for _ in range(6))
+    )
+
+    assert peak == 2
+    assert len(fake_transport.instances) == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_servers_with_running_jobs(fake_transport, monkeypatch):
+    active_jobs = {"count": 1}
+
+    async def call_tool(
+        self, tool, arguments, read_timeout_seconds=None, progress_callback=None
+    ):
+        self.calls.append((tool, arguments))
+        if tool == tool_executor.MCP_BUSY_TOOL:
+            text = str(active_jobs["count"])
+            return SimpleNamespace(content=[SimpleNamespace(text=text)], isError=False)
+        return SimpleNamespace(content=[tool])
+
+    monkeypatch.setattr(FakeSession, "call_tool", call_tool)
+    pool = MCPSessionPool(idle_timeout_s=0)
+
+    await pool.call_tool(_server(), "codex_edit", {"background": True})
+    await pool.evict_idle()
+    assert len(pool._workers) == 1
+
+    active_jobs["count"] = 0
+    await pool.evict_idle()
+    assert pool._workers == {}
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_stops_probing_servers_without_busy_tool(
+    fake_transport, monkeypatch
+):
+    async def call_tool(
+        self, tool, arguments, read_timeout_seconds=None, progress_callback=None
+    ):
+        self.calls.append((tool, arguments))
+        return SimpleNamespace(content=[], isError=tool == tool_executor.MCP_BUSY_TOOL)
+
+    monkeypatch.setattr(FakeSession, "call_tool", call_tool)
+    pool = MCPSessionPool(idle_timeout_s=0)
+
+    await pool.call_tool(_server("/mcp/google-calendar"), "google_list_events", {})
+    worker = next(iter(pool._workers.values()))
+    assert not await worker.busy(1)
+    assert not await worker.busy(1)
+
+    probes = [c for c in worker.session.calls if c[0] == tool_executor.MCP_BUSY_TOOL]
+    assert len(probes) == 1
+    await pool.evict_idle()
+    assert pool._workers == {}
+    await pool.close()
@@ -0,0 +1,107 @@
+# modules/core/tools/intents.py
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Pattern, Set, Tuple
+
+from modules.core.controller.tool_definitions import ToolCapability
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """Keywords that signal an intent and the capabilities that satisfy it.
+
+    Keywords match whole words; spaces match any run of whitespace and a
+    trailing ``*`` matches any word ending ("program*" -> "programming").
+    A tool can handle the intent if it has any of ``capabilities``.
+    """
+
+    intent: str
+    capabilities: Tuple[ToolCapability, ...]
+    keywords: Tuple[str, ...]
+
+
+INTENT_RULES: Tuple[IntentRule, ...] = (
+    IntentRule(
+        "access_time",
+        (ToolCapability.ACCESS_TIME,),
+        ("time", "date", "now", "current time", "current date"),
+    ),
+    IntentRule(
+        "access_network",
+        (ToolCapability.ACCESS_NETWORK,),
+        ("fetch*", "download*", "http*", "api", "apis"),
+    ),
+    IntentRule(
+        "generate_code",
+        (ToolCapability.GENERATE_CODE,),
+        ("write code", "generate*", "program*"),
+    ),
+    IntentRule(
+        "edit_files",
+        (ToolCapability.EDIT_FILES,),
+        (
+            "edit*",
+            "modif*",
+            "change file*",
+            "create file*",
+            "write file*",
+            "save file*",
+            "add file*",
+        ),
+    ),
+    IntentRule(
+        "access_filesystem",
+        (ToolCapability.READ_FILES, ToolCapability.EXECUTE_CODE),
+        (
+            "current working directory",
+            "working directory",
+            "current directory",
+            "cwd",
+            "show path",
+            "current path",
+            "pwd",
+        ),
+    ),
+)
+
+INTENT_CAPABILITIES: Dict[str, Tuple[ToolCapability, ...]] = {
+    rule.intent: rule.capabilities for rule in INTENT_RULES
+}
+
+
+def _keyword_pattern(keyword: str) -> str:
+    prefix = keyword.endswith("*")
+    words = keyword.rstrip("*").split()
+    pattern = r"\s+".join(re.escape(word) for word in words)
+    return pattern + (r"\w*" if prefix else "")
+
+
+def _compile(rules: Tuple[IntentRule, ...]) -> Tuple[Pattern[str], Dict[str, str]]:
+    # One alternation over every keyword, longest first so phrases win over
+    # the words they contain. Each keyword gets its own group so a match can
+    # be mapped back to its intent through ``lastgroup``.
+    keywords = [(keyword, rule.intent) for rule in rules for keyword in rule.keywords]
+    keywords.sort(key=lambda item: len(item[0]), reverse=True)
+    group_intents: Dict[str, str] = {}
+    alternatives = []
+    for index, (keyword, intent) in enumerate(keywords):
+        group = f"k{index}"
+        group_intents[group] = intent
+        alternatives.append(f"(?P<{group}>{_keyword_pattern(keyword)})")
+    pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE)
+    return pattern, group_intents
+
+
+_INTENT_PATTERN, _GROUP_INTENTS = _compile(INTENT_RULES)
+_ALL_INTENTS = frozenset(rule.intent for rule in INTENT_RULES)
+
+
+def infer_intents(user_input: str) -> Set[str]:
+    """Return the intents mentioned in ``user_input`` in a single scan."""
+    intents: Set[str] = set()
+    for match in _INTENT_PATTERN.finditer(user_input):
+        intents.add(_GROUP_INTENTS[match.lastgroup])
+        if intents == _ALL_INTENTS:
+            break
+    return intents
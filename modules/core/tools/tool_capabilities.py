@@ -3,6 +3,7 @@
 from dataclasses import dataclass
 from typing import Set
 from modules.core.controller.tool_definitions import get_tool_capabilities_dict
+from modules.core.tools.intents import INTENT_CAPABILITIES
 
 
 @dataclass(frozen=True)
@@ -29,16 +30,11 @@ def tool_can_handle(tool_name: str, intents: set) -> bool:
     if not caps:
         return False
 
-    intent_to_capability = {
-        "access_time": caps.can_access_time,
-        "access_network": caps.can_access_network,
-        "generate_code": caps.can_generate_code,
-        "edit_files": caps.can_edit_files,
-        "access_filesystem": caps.can_read_files or caps.can_execute_code,
-    }
-
     for intent in intents:
-        if not intent_to_capability.get(intent, True):
+        required = INTENT_CAPABILITIES.get(intent)
+        if required is None:
+            continue
+        if not any(getattr(caps, f"can_{cap.value}") for cap in required):
             return False
 
     return True
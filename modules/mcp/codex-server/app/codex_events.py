@@ -0,0 +1,78 @@
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Reasoning is only shown as context, so cap what a run keeps of it.
+MAX_REASONING_CHARS = 16_000
+
+
+@dataclass
+class CodexItem:
+    """A completed agent message or reasoning step from ``codex exec --json``."""
+
+    type: str
+    text: str
+
+
+class CodexEventParser:
+    """Consumes codex JSONL events one line at a time.
+
+    Only completed ``agent_message`` and ``reasoning`` items are kept, which
+    is everything the controller's summary needs, so memory use does not
+    grow with the number of command, file-change or delta events.
+    """
+
+    def __init__(self, max_reasoning_chars: int = MAX_REASONING_CHARS):
+        self.max_reasoning_chars = max_reasoning_chars
+        self.messages: List[str] = []
+        self.reasoning: List[str] = []
+        self.events_seen = 0
+        self._reasoning_chars = 0
+
+    def feed(self, line: str) -> Optional[CodexItem]:
+        """Parse one JSONL line; return the item if it is worth reporting."""
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(event, dict):
+            return None
+        self.events_seen += 1
+
+        if event.get("type") != "item.completed":
+            return None
+
+        item = event.get("item") or {}
+        item_type = item.get("type")
+        text = item.get("text") or ""
+        if item_type == "agent_message":
+            self.messages.append(text)
+        elif item_type == "reasoning":
+            if self._reasoning_chars < self.max_reasoning_chars:
+                kept = text[: self.max_reasoning_chars - self._reasoning_chars]
+                self.reasoning.append(kept)
+                self._reasoning_chars += len(kept)
+        else:
+            return None
+        return CodexItem(type=item_type, text=text)
+
+    def to_jsonl(self) -> str:
+        """Re-emit the retained items in codex's own JSONL event format."""
+        items = [("reasoning", text) for text in self.reasoning] + [
+            ("agent_message", text) for text in self.messages
+        ]
+        lines = [_completed_line(kind, text) for kind, text in items]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+def _completed_line(kind: str, text: str) -> str:
+    return json.dumps({"type": "item.completed", "item": {"type": kind, "text": text}})
+
+
+def agent_message_jsonl(text: str) -> str:
+    """Wrap server-generated text as a codex agent message event.
+
+    Tool replies that do not come from codex (job status, for example) use
+    the same JSONL shape so callers can normalize every codex tool alike.
+    """
+    return _completed_line("agent_message", text) + "\n"
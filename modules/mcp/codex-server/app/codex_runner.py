@@ -1,15 +1,25 @@
-import subprocess
-import json
-from typing import Optional
+import asyncio
+import os
+import signal
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from app.codex_events import CodexEventParser, CodexItem
 
 CODEX_BIN = "codex"  # must be in PATH
 
+# Wall-clock limit for one codex run in seconds (0 disables it).
+CODEX_TIMEOUT = float(os.getenv("CODEX_TIMEOUT", "900"))
+# Longest single JSONL event accepted from codex.
+CODEX_MAX_LINE_BYTES = int(os.getenv("CODEX_MAX_LINE_BYTES", str(4 * 1024 * 1024)))
+_STDERR_TAIL_BYTES = 64 * 1024
+_KILL_GRACE_S = 5.0
 
-def run_codex(
-    prompt: str,
-    cwd: Optional[str] = None,
-    extra_args: Optional[list[str]] = None,
-) -> str:
+
+class CodexTimeoutError(RuntimeError):
+    """Raised when a codex run exceeds its deadline."""
+
+
+def build_codex_command(extra_args: Optional[list[str]] = None) -> list[str]:
     apply_mode = False
     cleaned_args: list[str] = []
     if extra_args:
@@ -33,11 +43,135 @@ def run_codex(
             ]
         )
 
-    process = subprocess.run(
-        cmd, input=prompt, capture_output=True, text=True, cwd=cwd, check=False
+    return cmd
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    """Stop codex and everything it spawned (it runs in its own session)."""
+    if process.returncode is not None:
+        return
+    if not hasattr(os, "killpg"):
+        process.kill()
+        await process.wait()
+        return
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    try:
+        await asyncio.wait_for(process.wait(), _KILL_GRACE_S)
+    except asyncio.TimeoutError:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            return
+        await process.wait()
+
+
+async def _read_tail(stream: asyncio.StreamReader, limit: int) -> bytes:
+    tail = bytearray()
+    while chunk := await stream.read(65536):
+        tail.extend(chunk)
+        if len(tail) > limit:
+            del tail[: len(tail) - limit]
+    return bytes(tail)
+
+
+async def stream_codex(
+    prompt: str,
+    cwd: Optional[str] = None,
+    extra_args: Optional[list[str]] = None,
+    *,
+    timeout_s: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """Run ``codex exec --json`` and yield its JSONL events as they arrive.
+
+    The run is bounded by ``timeout_s`` (default CODEX_TIMEOUT). On timeout,
+    cancellation or an early ``aclose()`` the whole process group is killed.
+    Raises RuntimeError with the stderr tail if codex exits non-zero.
+    """
+    timeout_s = CODEX_TIMEOUT if timeout_s is None else timeout_s
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s if timeout_s > 0 else None
+
+    process = await asyncio.create_subprocess_exec(
+        *build_codex_command(extra_args),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        limit=CODEX_MAX_LINE_BYTES,
+        start_new_session=True,
     )
+    stderr_task = asyncio.create_task(_read_tail(process.stderr, _STDERR_TAIL_BYTES))
+
+    def remaining() -> Optional[float]:
+        if deadline is None:
+            return None
+        left = deadline - loop.time()
+        if left <= 0:
+            raise CodexTimeoutError(f"codex timed out after {timeout_s:g}s")
+        return left
+
+    try:
+        try:
+            process.stdin.write(prompt.encode("utf-8"))
+            await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # codex exited early; its exit status explains why
+
+        while True:
+            try:
+                line = await asyncio.wait_for(process.stdout.readline(), remaining())
+            except asyncio.TimeoutError:
+                raise CodexTimeoutError(f"codex timed out after {timeout_s:g}s")
+            except ValueError:
+                raise RuntimeError(
+                    f"codex event exceeds CODEX_MAX_LINE_BYTES ({CODEX_MAX_LINE_BYTES})"
+                )
+            if not line:
+                break
+            text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            if text:
+                yield text
+
+        try:
+            await asyncio.wait_for(process.wait(), remaining())
+        except asyncio.TimeoutError:
+            raise CodexTimeoutError(f"codex timed out after {timeout_s:g}s")
+        stderr = await stderr_task
+        if process.returncode != 0:
+            raise RuntimeError(stderr.decode("utf-8", errors="replace"))
+    finally:
+        await _terminate(process)
+        stderr_task.cancel()
+        await asyncio.gather(stderr_task, return_exceptions=True)
 
-    if process.returncode != 0:
-        raise RuntimeError(process.stderr)
 
-    return process.stdout
+ItemCallback = Callable[[CodexItem], Awaitable[None]]
+
+
+async def run_codex(
+    prompt: str,
+    cwd: Optional[str] = None,
+    extra_args: Optional[list[str]] = None,
+    *,
+    timeout_s: Optional[float] = None,
+    on_item: Optional[ItemCallback] = None,
+) -> str:
+    """Run codex and return the JSONL events the summary needs.
+
+    Events are parsed as they stream in; completed agent messages and
+    reasoning are passed to ``on_item`` and kept, everything else is dropped.
+    """
+    parser = CodexEventParser()
+    events = stream_codex(prompt, cwd, extra_args, timeout_s=timeout_s)
+    try:
+        async for line in events:
+            item = parser.feed(line)
+            if item is not None and on_item is not None:
+                await on_item(item)
+    finally:
+        await events.aclose()
+    return parser.to_jsonl()
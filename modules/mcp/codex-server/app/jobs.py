@@ -0,0 +1,179 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+from app.codex_events import CodexItem
+from app.codex_runner import ItemCallback, run_codex
+
+# Apply-mode codex runs allowed at once across all repositories.
+CODEX_MAX_JOBS = int(os.getenv("CODEX_MAX_JOBS", "2"))
+# Finished jobs kept for status/result polling; the oldest are dropped first.
+CODEX_MAX_FINISHED_JOBS = int(os.getenv("CODEX_MAX_FINISHED_JOBS", "100"))
+_MAX_PROGRESS_LINES = 20
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+_FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+@dataclass
+class CodexJob:
+    """An apply-mode codex run and its outcome."""
+
+    id: str
+    tool: str
+    repo_path: str
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    progress: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=_MAX_PROGRESS_LINES)
+    )
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    def describe(self) -> str:
+        """One-line human readable status, used as the tool reply."""
+        now = time.time()
+        if self.status == QUEUED:
+            detail = f"waiting for {now - self.created_at:.0f}s"
+        elif self.status == RUNNING:
+            detail = f"running for {now - (self.started_at or now):.0f}s"
+        else:
+            ended = self.finished_at or now
+            detail = f"took {ended - (self.started_at or ended):.0f}s"
+        text = f"Job {self.id} ({self.tool} in {self.repo_path}) is {self.status}, {detail}."
+        if self.error:
+            text += f" Error: {self.error}"
+        if self.progress and not self.finished:
+            text += f" Latest: {self.progress[-1]}"
+        return text
+
+
+class JobManager:
+    """Runs apply-mode codex jobs in the background.
+
+    Jobs on the same repository run one at a time in submission order, and at
+    most ``max_workers`` jobs run overall. A job queued behind another one in
+    its repository does not take a worker slot while it waits.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = CODEX_MAX_JOBS,
+        max_finished: int = CODEX_MAX_FINISHED_JOBS,
+    ):
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, CodexJob]" = OrderedDict()
+        # realpath -> [lock, jobs using it]; dropped when no job needs it
+        self._repo_locks: Dict[str, list] = {}
+        self._workers: Optional[asyncio.Semaphore] = None
+
+    def submit(
+        self,
+        tool: str,
+        repo_path: str,
+        prompt: str,
+        extra_args: Optional[list[str]] = None,
+        listener: Optional[ItemCallback] = None,
+    ) -> CodexJob:
+        """Queue a codex run; ``listener`` also receives its progress items."""
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(max(self.max_workers, 1))
+        job = CodexJob(id=uuid.uuid4().hex[:12], tool=tool, repo_path=repo_path)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, prompt, extra_args, listener))
+        job.task.add_done_callback(lambda task: self._on_done(job, task))
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[CodexJob]:
+        return self._jobs.get(job_id)
+
+    def active_count(self) -> int:
+        """Number of jobs that are queued or running."""
+        return sum(not job.finished for job in self._jobs.values())
+
+    async def wait(
+        self, job_id: str, timeout_s: Optional[float] = None
+    ) -> Optional[CodexJob]:
+        """Wait until the job finishes or ``timeout_s`` passes; return it."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished or job.task is None:
+            return job
+        await asyncio.wait({job.task}, timeout=timeout_s)
+        return job
+
+    def cancel(self, job_id: str) -> Optional[CodexJob]:
+        job = self._jobs.get(job_id)
+        if job is not None and not job.finished and job.task is not None:
+            job.task.cancel()
+        return job
+
+    async def close(self) -> None:
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(
+        self,
+        job: CodexJob,
+        prompt: str,
+        extra_args: Optional[list[str]],
+        listener: Optional[ItemCallback],
+    ) -> None:
+        async def on_item(item: CodexItem) -> None:
+            job.progress.append(item.text)
+            if listener is not None:
+                await listener(item)
+
+        repo_key = os.path.realpath(job.repo_path)
+        entry = self._repo_locks.setdefault(repo_key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        lock = entry[0]
+        try:
+            async with lock, self._workers:
+                job.status = RUNNING
+                job.started_at = time.time()
+                job.result = await run_codex(
+                    prompt, cwd=job.repo_path, extra_args=extra_args, on_item=on_item
+                )
+                job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+        except Exception as exc:
+            job.status = FAILED
+            job.error = str(exc).strip() or exc.__class__.__name__
+        finally:
+            job.finished_at = time.time()
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._repo_locks[repo_key]
+            self._prune()
+
+    def _on_done(self, job: CodexJob, task: asyncio.Task) -> None:
+        # A job cancelled before it started never ran _run's handlers.
+        if task.cancelled() and not job.finished:
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            self._prune()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job_id]
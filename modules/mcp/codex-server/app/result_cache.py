@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+CODEX_CACHE_ENABLED = os.getenv("CODEX_CACHE_ENABLED", "1") == "1"
+CODEX_CACHE_DIR = os.getenv(
+    "CODEX_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "alena", "codex-results"),
+)
+CODEX_CACHE_TTL = float(os.getenv("CODEX_CACHE_TTL", "86400"))
+CODEX_CACHE_MAX_BYTES = int(os.getenv("CODEX_CACHE_MAX_BYTES", "50000000"))
+_GIT_TIMEOUT_S = 10.0
+
+
+async def _git(repo_path: str, *args: str) -> Optional[bytes]:
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "-C",
+            repo_path,
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), _GIT_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None
+    return stdout if process.returncode == 0 else None
+
+
+async def repo_fingerprint(repo_path: str) -> Optional[str]:
+    """Hash of HEAD plus every uncommitted change in ``repo_path``.
+
+    Tracked changes are hashed from ``git diff HEAD``; untracked files by
+    path, size and mtime. Returns None outside a git work tree, in which
+    case results are not cached.
+    """
+    head = await _git(repo_path, "rev-parse", "HEAD")
+    if head is None:
+        return None
+    diff, untracked = await asyncio.gather(
+        _git(repo_path, "diff", "HEAD", "--binary", "--no-ext-diff"),
+        _git(repo_path, "ls-files", "--others", "--exclude-standard", "-z"),
+    )
+    if diff is None or untracked is None:
+        return None
+
+    digest = hashlib.sha256(head.strip())
+    digest.update(b"\0")
+    digest.update(diff)
+    for path in sorted(filter(None, untracked.split(b"\0"))):
+        digest.update(b"\0" + path)
+        try:
+            stat = os.stat(os.path.join(repo_path, os.fsdecode(path)))
+        except OSError:
+            continue
+        digest.update(f":{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def cache_key(tool: str, prompt: str, fingerprint: str) -> str:
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256(
+        "\0".join((tool, normalized, fingerprint)).encode("utf-8")
+    ).hexdigest()
+
+
+class ResultCache:
+    """Content-addressed on-disk store for codex tool results.
+
+    One JSON file per key. Reads refresh the file's mtime, so eviction by
+    oldest mtime is least-recently-used.
+    """
+
+    def __init__(self, directory: str, ttl_s: float, max_bytes: int):
+        self.directory = directory
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if self.ttl_s > 0 and time.time() - entry.get("created", 0) > self.ttl_s:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("result")
+
+    def put(self, key: str, tool: str, result: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"created": time.time(), "tool": tool, "result": result}, handle)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently used over max_bytes."""
+        now = time.time()
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # mtime is the last access, so an entry untouched for longer than
+            # the TTL is certainly expired; get() checks the exact age.
+            if self.ttl_s > 0 and now - stat.st_mtime > self.ttl_s:
+                self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self.max_bytes <= 0 or total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def build_result_cache() -> Optional[ResultCache]:
+    if not CODEX_CACHE_ENABLED:
+        return None
+    return ResultCache(CODEX_CACHE_DIR, CODEX_CACHE_TTL, CODEX_CACHE_MAX_BYTES)
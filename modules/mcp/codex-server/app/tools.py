@@ -1,9 +1,18 @@
-from mcp.server.fastmcp import FastMCP
+import asyncio
+
+from mcp.server.fastmcp import Context, FastMCP
+from app.codex_events import CodexItem, agent_message_jsonl
+from app.jobs import SUCCEEDED, JobManager
 from app.codex_runner import run_codex
+from app.result_cache import build_result_cache, cache_key, repo_fingerprint
 from textwrap import dedent
 from typing import Optional
 
 mcp = FastMCP("codex-mcp")
+_result_cache = build_result_cache()
+_jobs = JobManager()
+# Longest a single codex_job_result call blocks before reporting status.
+MAX_JOB_WAIT_S = 600.0
 
 
 def _format_repo_prompt(
@@ -32,16 +41,76 @@ def _format_repo_prompt(
     ).strip()
 
 
+def _progress_reporter(ctx: Context):
+    """Forward completed codex items to the caller as progress notifications."""
+    completed = 0
+
+    async def report(item: CodexItem) -> None:
+        nonlocal completed
+        completed += 1
+        label = "Reasoning" if item.type == "reasoning" else "Message"
+        await ctx.report_progress(completed, message=f"{label}: {item.text}")
+
+    return report
+
+
+async def _run_codex(prompt: str, ctx: Optional[Context], **kwargs) -> str:
+    if ctx is not None:
+        kwargs["on_item"] = _progress_reporter(ctx)
+    return await run_codex(prompt, **kwargs)
+
+
+async def _run_job(
+    tool: str, prompt: str, ctx: Optional[Context], repo_path: str, background: bool
+) -> str:
+    """Queue an apply-mode run; wait for it unless ``background`` is set."""
+    listener = _progress_reporter(ctx) if ctx is not None and not background else None
+    job = _jobs.submit(tool, repo_path, prompt, ["--apply"], listener=listener)
+    if background:
+        return agent_message_jsonl(
+            f"Started job {job.id} ({tool} in {repo_path}). "
+            "Check it with codex_job_status or codex_job_result."
+        )
+
+    try:
+        await _jobs.wait(job.id)
+    except asyncio.CancelledError:
+        _jobs.cancel(job.id)
+        raise
+    if job.status != SUCCEEDED:
+        raise RuntimeError(job.error or f"codex job {job.id} {job.status}")
+    return job.result or ""
+
+
+async def _run_cached(
+    tool: str, prompt: str, ctx: Optional[Context], repo_path: str
+) -> str:
+    """Run a read-only tool, reusing its result while the repo is unchanged."""
+    cache = _result_cache
+    fingerprint = await repo_fingerprint(repo_path) if cache is not None else None
+    if fingerprint is None:
+        return await _run_codex(prompt, ctx, cwd=repo_path)
+
+    key = cache_key(tool, prompt, fingerprint)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = await _run_codex(prompt, ctx, cwd=repo_path)
+    cache.put(key, tool, result)
+    return result
+
+
 @mcp.tool()
-def codex_generate(prompt: str) -> str:
+async def codex_generate(prompt: str, ctx: Optional[Context] = None) -> str:
     """
     Generate code using Codex CLI.
     """
-    return run_codex(prompt)
+    return await _run_codex(prompt, ctx)
 
 
 @mcp.tool()
-def codex_plan(repo_path: str, goal: str) -> str:
+async def codex_plan(repo_path: str, goal: str, ctx: Optional[Context] = None) -> str:
     """
     Produce a multi-step plan and file-level strategy for a complex task.
     """
@@ -55,11 +124,13 @@ def codex_plan(repo_path: str, goal: str) -> str:
             "and call out risks or unknowns."
         ),
     )
-    return run_codex(prompt, cwd=repo_path)
+    return await _run_cached("codex_plan", prompt, ctx, repo_path)
 
 
 @mcp.tool()
-def codex_analyze(repo_path: str, question: str) -> str:
+async def codex_analyze(
+    repo_path: str, question: str, ctx: Optional[Context] = None
+) -> str:
     """
     Analyze the repository to answer a design or implementation question.
     """
@@ -71,11 +142,13 @@ def codex_analyze(repo_path: str, question: str) -> str:
             "Do not modify files. Keep the answer concise and reference relevant files."
         ),
     )
-    return run_codex(prompt, cwd=repo_path)
+    return await _run_cached("codex_analyze", prompt, ctx, repo_path)
 
 
 @mcp.tool()
-def codex_summarize(repo_path: str, focus: Optional[str] = None) -> str:
+async def codex_summarize(
+    repo_path: str, focus: Optional[str] = None, ctx: Optional[Context] = None
+) -> str:
     """
     Summarize the repository or a specific focus area.
     """
@@ -86,11 +159,16 @@ def codex_summarize(repo_path: str, focus: Optional[str] = None) -> str:
         mode="summarize",
         constraints=("Do not modify files. Keep the summary short and actionable."),
     )
-    return run_codex(prompt, cwd=repo_path)
+    return await _run_cached("codex_summarize", prompt, ctx, repo_path)
 
 
 @mcp.tool()
-def codex_doc_outline(repo_path: str, topic: str, audience: str = "developers") -> str:
+async def codex_doc_outline(
+    repo_path: str,
+    topic: str,
+    audience: str = "developers",
+    ctx: Optional[Context] = None,
+) -> str:
     """
     Draft a documentation outline for a given topic and audience.
     """
@@ -105,11 +183,13 @@ def codex_doc_outline(repo_path: str, topic: str, audience: str = "developers")
             "Do not modify files. Provide an outline with section headings and bullet points."
         ),
     )
-    return run_codex(prompt, cwd=repo_path)
+    return await _run_cached("codex_doc_outline", prompt, ctx, repo_path)
 
 
 @mcp.tool()
-def codex_test_plan(repo_path: str, goal: str) -> str:
+async def codex_test_plan(
+    repo_path: str, goal: str, ctx: Optional[Context] = None
+) -> str:
     """
     Produce a test plan for validating a feature or change.
     """
@@ -121,13 +201,19 @@ def codex_test_plan(repo_path: str, goal: str) -> str:
             "Do not modify files. Include test areas, scenarios, and acceptance criteria."
         ),
     )
-    return run_codex(prompt, cwd=repo_path)
+    return await _run_cached("codex_test_plan", prompt, ctx, repo_path)
 
 
 @mcp.tool()
-def codex_edit(repo_path: str, instruction: str) -> str:
+async def codex_edit(
+    repo_path: str,
+    instruction: str,
+    background: bool = False,
+    ctx: Optional[Context] = None,
+) -> str:
     """
     Edit code in a repository using Codex.
+    With background=true, return a job id at once instead of waiting.
     """
     prompt = _format_repo_prompt(
         repo_path,
@@ -138,17 +224,20 @@ def codex_edit(repo_path: str, instruction: str) -> str:
             "If uncertain, choose the least invasive change."
         ),
     )
-    return run_codex(
-        prompt,
-        cwd=repo_path,
-        extra_args=["--apply"],
-    )
+    return await _run_job("codex_edit", prompt, ctx, repo_path, background)
 
 
 @mcp.tool()
-def codex_refactor(repo_path: str, goal: str, constraints: Optional[str] = None) -> str:
+async def codex_refactor(
+    repo_path: str,
+    goal: str,
+    constraints: Optional[str] = None,
+    background: bool = False,
+    ctx: Optional[Context] = None,
+) -> str:
     """
     Perform a multi-file refactor with optional constraints.
+    With background=true, return a job id at once instead of waiting.
     """
     prompt = _format_repo_prompt(
         repo_path,
@@ -157,4 +246,37 @@ def codex_refactor(repo_path: str, goal: str, constraints: Optional[str] = None)
         constraints=((constraints + "\n") if constraints else "")
         + "Provide a brief summary of changes at the end.",
     )
-    return run_codex(prompt, cwd=repo_path, extra_args=["--apply"])
+    return await _run_job("codex_refactor", prompt, ctx, repo_path, background)
+
+
+@mcp.tool()
+async def codex_job_status(job_id: str) -> str:
+    """
+    Report the status of a background codex_edit or codex_refactor job.
+    """
+    job = _jobs.get(job_id)
+    if job is None:
+        return agent_message_jsonl(f"Unknown job {job_id}.")
+    return agent_message_jsonl(job.describe())
+
+
+@mcp.tool()
+async def codex_job_result(job_id: str, wait_s: float = 0) -> str:
+    """
+    Return the result of a background job, waiting up to wait_s seconds.
+    """
+    job = await _jobs.wait(job_id, max(0.0, min(wait_s, MAX_JOB_WAIT_S)))
+    if job is None:
+        return agent_message_jsonl(f"Unknown job {job_id}.")
+    if job.status == SUCCEEDED:
+        return job.result or ""
+    return agent_message_jsonl(job.describe())
+
+
+@mcp.tool()
+async def server_busy() -> str:
+    """
+    Number of queued or running jobs; the controller's MCP pool does not
+    stop this server while it is above zero.
+    """
+    return str(_jobs.active_count())
@@ -0,0 +1,41 @@
+import json
+
+from app.codex_events import CodexEventParser
+
+
+def _completed(kind, text):
+    return json.dumps({"type": "item.completed", "item": {"type": kind, "text": text}})
+
+
+def test_parser_keeps_only_messages_and_reasoning():
+    parser = CodexEventParser()
+    lines = [
+        json.dumps({"type": "thread.started"}),
+        _completed("command_execution", "ls"),
+        _completed("reasoning", "Checking files"),
+        "not json",
+        _completed("agent_message", "All done"),
+    ]
+
+    items = [parser.feed(line) for line in lines]
+
+    assert [(i.type, i.text) for i in items if i] == [
+        ("reasoning", "Checking files"),
+        ("agent_message", "All done"),
+    ]
+    assert parser.events_seen == 4
+    assert parser.to_jsonl().splitlines() == [
+        _completed("reasoning", "Checking files"),
+        _completed("agent_message", "All done"),
+    ]
+
+
+def test_parser_caps_retained_reasoning():
+    parser = CodexEventParser(max_reasoning_chars=10)
+
+    parser.feed(_completed("reasoning", "x" * 8))
+    item = parser.feed(_completed("reasoning", "y" * 8))
+    parser.feed(_completed("reasoning", "z" * 8))
+
+    assert item.text == "y" * 8
+    assert parser.reasoning == ["x" * 8, "yy"]
@@ -1,53 +1,46 @@
-from types import SimpleNamespace
+import asyncio
+import json
+import os
+import sys
+import time
 
 import pytest
 
 from app import codex_runner
 
+_FAKE_PRELUDE = """import json, sys, time
 
-def test_run_codex_builds_command_without_apply(monkeypatch):
-    captured = {}
+def say(kind, text):
+    item = {"type": kind, "text": text}
+    print(json.dumps({"type": "item.completed", "item": item}), flush=True)
+"""
 
-    def fake_run(cmd, input, capture_output, text, cwd, check):
-        captured["cmd"] = cmd
-        captured["input"] = input
-        captured["capture_output"] = capture_output
-        captured["text"] = text
-        captured["cwd"] = cwd
-        captured["check"] = check
-        return SimpleNamespace(returncode=0, stdout="ok", stderr="")
 
-    monkeypatch.setattr(codex_runner.subprocess, "run", fake_run)
+def _texts(result):
+    return [json.loads(line)["item"]["text"] for line in result.splitlines()]
 
-    result = codex_runner.run_codex("hello", cwd="/repo", extra_args=["--foo", "bar"])
 
-    assert result == "ok"
-    assert captured["cmd"] == [
+def _fake_codex(tmp_path, monkeypatch, body):
+    """Install an executable stand-in for the codex CLI running ``body``."""
+    script = tmp_path / "codex"
+    script.write_text(f"#!{sys.executable}\n{_FAKE_PRELUDE}\n{body}\n")
+    script.chmod(0o755)
+    monkeypatch.setattr(codex_runner, "CODEX_BIN", str(script))
+    return script
+
+
+def test_build_codex_command_without_apply():
+    assert codex_runner.build_codex_command(["--foo", "bar"]) == [
         codex_runner.CODEX_BIN,
         "exec",
         "--json",
         "--foo",
         "bar",
     ]
-    assert captured["input"] == "hello"
-    assert captured["cwd"] == "/repo"
-    assert captured["capture_output"] is True
-    assert captured["text"] is True
-    assert captured["check"] is False
-
-
-def test_run_codex_builds_command_with_apply(monkeypatch):
-    captured = {}
 
-    def fake_run(cmd, input, capture_output, text, cwd, check):
-        captured["cmd"] = cmd
-        return SimpleNamespace(returncode=0, stdout="ok", stderr="")
 
-    monkeypatch.setattr(codex_runner.subprocess, "run", fake_run)
-
-    codex_runner.run_codex("apply", extra_args=["--apply", "--flag"])
-
-    assert captured["cmd"] == [
+def test_build_codex_command_with_apply():
+    assert codex_runner.build_codex_command(["--apply", "--flag"]) == [
         codex_runner.CODEX_BIN,
         "exec",
         "--json",
@@ -58,11 +51,91 @@ def test_run_codex_builds_command_with_apply(monkeypatch):
     ]
 
 
-def test_run_codex_raises_on_error(monkeypatch):
-    def fake_run(cmd, input, capture_output, text, cwd, check):
-        return SimpleNamespace(returncode=1, stdout="", stderr="boom")
+@pytest.mark.asyncio
+async def test_run_codex_passes_prompt_and_cwd(tmp_path, monkeypatch):
+    _fake_codex(
+        tmp_path,
+        monkeypatch,
+        "import os\n"
+        "say('agent_message', sys.stdin.read())\n"
+        "say('agent_message', os.getcwd())\n"
+        "say('agent_message', ' '.join(sys.argv[1:]))",
+    )
+
+    result = await codex_runner.run_codex("hello", cwd=str(tmp_path))
 
-    monkeypatch.setattr(codex_runner.subprocess, "run", fake_run)
+    assert _texts(result) == ["hello", os.path.realpath(tmp_path), "exec --json"]
+
+
+@pytest.mark.asyncio
+async def test_run_codex_raises_on_error(tmp_path, monkeypatch):
+    _fake_codex(tmp_path, monkeypatch, "sys.stderr.write('boom')\nsys.exit(1)")
 
     with pytest.raises(RuntimeError, match="boom"):
-        codex_runner.run_codex("fail")
+        await codex_runner.run_codex("fail")
+
+
+@pytest.mark.asyncio
+async def test_stream_codex_yields_events_before_exit(tmp_path, monkeypatch):
+    _fake_codex(
+        tmp_path,
+        monkeypatch,
+        "print('{\"n\": 1}', flush=True)\ntime.sleep(0.5)\nprint('{\"n\": 2}')",
+    )
+
+    started = time.perf_counter()
+    events = codex_runner.stream_codex("go")
+    first = await events.__anext__()
+    assert first == '{"n": 1}'
+    assert time.perf_counter() - started < 0.5
+    assert [line async for line in events] == ['{"n": 2}']
+
+
+@pytest.mark.asyncio
+async def test_run_codex_times_out_and_kills_process(tmp_path, monkeypatch):
+    pid_file = tmp_path / "pid"
+    _fake_codex(
+        tmp_path,
+        monkeypatch,
+        f"import os\nopen({str(pid_file)!r}, 'w').write(str(os.getpid()))\n"
+        "time.sleep(30)",
+    )
+
+    with pytest.raises(codex_runner.CodexTimeoutError):
+        await codex_runner.run_codex("slow", timeout_s=0.5)
+
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+
+@pytest.mark.asyncio
+async def test_run_codex_reports_and_keeps_only_completed_items(tmp_path, monkeypatch):
+    _fake_codex(
+        tmp_path,
+        monkeypatch,
+        "for i in range(50):\n"
+        "    print(json.dumps({'type': 'item.started', 'n': i}))\n"
+        "    say('command_execution', 'ls')\n"
+        "say('reasoning', 'Looking around')\n"
+        "print('not json')\n"
+        "say('agent_message', 'Done')",
+    )
+    reported = []
+
+    async def on_item(item):
+        reported.append((item.type, item.text))
+
+    result = await codex_runner.run_codex("go", on_item=on_item)
+
+    assert reported == [("reasoning", "Looking around"), ("agent_message", "Done")]
+    assert _texts(result) == ["Looking around", "Done"]
+
+
+@pytest.mark.asyncio
+async def test_run_codex_calls_run_concurrently(tmp_path, monkeypatch):
+    _fake_codex(tmp_path, monkeypatch, "time.sleep(0.5)\nprint('{}')")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(codex_runner.run_codex("p") for _ in range(3)))
+
+    assert time.perf_counter() - started < 1.2
@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+
+from app import jobs, tools
+
+
+def _fake_runner(monkeypatch, delay=0.05):
+    state = {"active": {}, "peak": 0, "overlap": set(), "order": []}
+
+    async def fake_run_codex(prompt, cwd=None, extra_args=None, on_item=None):
+        state["order"].append(prompt)
+        active = state["active"]
+        if active.get(cwd):
+            state["overlap"].add(cwd)
+        active[cwd] = active.get(cwd, 0) + 1
+        state["peak"] = max(state["peak"], sum(active.values()))
+        await asyncio.sleep(delay)
+        active[cwd] -= 1
+        if prompt == "fail":
+            raise RuntimeError("codex failed")
+        return f"done {prompt}"
+
+    monkeypatch.setattr(jobs, "run_codex", fake_run_codex)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_jobs_serialize_per_repo_and_cap_workers(monkeypatch):
+    state = _fake_runner(monkeypatch)
+    manager = jobs.JobManager(max_workers=2)
+
+    submitted = [
+        manager.submit("codex_edit", repo, f"{repo}-{i}")
+        for i in range(2)
+        for repo in ("/a", "/b", "/c")
+    ]
+    await asyncio.gather(*(manager.wait(job.id) for job in submitted))
+
+    assert all(job.status == jobs.SUCCEEDED for job in submitted)
+    assert state["overlap"] == set()
+    assert state["peak"] == 2
+    a_jobs = [p for p in state["order"] if p.startswith("/a")]
+    assert a_jobs == ["/a-0", "/a-1"]
+
+
+@pytest.mark.asyncio
+async def test_job_failure_and_cancellation_are_recorded(monkeypatch):
+    _fake_runner(monkeypatch, delay=0.2)
+    manager = jobs.JobManager(max_workers=1)
+
+    failing = manager.submit("codex_edit", "/a", "fail")
+    waiting = manager.submit("codex_edit", "/a", "later")
+    manager.cancel(waiting.id)
+    await manager.wait(failing.id)
+    await manager.wait(waiting.id)
+
+    assert failing.status == jobs.FAILED
+    assert failing.error == "codex failed"
+    assert waiting.status == jobs.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_pruned(monkeypatch):
+    _fake_runner(monkeypatch, delay=0)
+    manager = jobs.JobManager(max_workers=4, max_finished=2)
+
+    submitted = [manager.submit("codex_edit", f"/r{i}", str(i)) for i in range(4)]
+    await asyncio.gather(*(manager.wait(job.id) for job in submitted))
+
+    assert manager.get(submitted[0].id) is None
+    assert manager.get(submitted[-1].id) is submitted[-1]
+
+
+def _message(reply):
+    return json.loads(reply)["item"]["text"]
+
+
+@pytest.mark.asyncio
+async def test_background_edit_returns_job_id_and_can_be_polled(monkeypatch):
+    _fake_runner(monkeypatch, delay=0.1)
+    monkeypatch.setattr(tools, "_jobs", jobs.JobManager())
+
+    reply = await tools.codex_edit("/repo", "Add logging", background=True)
+    job_id = _message(reply).split()[2]
+    await asyncio.sleep(0.02)
+
+    assert "is running" in _message(await tools.codex_job_status(job_id))
+    assert await tools.server_busy() == "1"
+    result = await tools.codex_job_result(job_id, wait_s=5)
+    assert result.startswith("done ")
+    assert await tools.server_busy() == "0"
+    assert "Unknown job" in _message(await tools.codex_job_status("missing"))
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import time
+
+import pytest
+
+from app import result_cache, tools
+from app.result_cache import ResultCache, cache_key, repo_fingerprint
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+    git("init", "-q")
+    git("config", "user.email", "dev@example.com")
+    git("config", "user.name", "dev")
+    (repo / "app.py").write_text("print('hi')\n")
+    git("add", "app.py")
+    git("commit", "-q", "-m", "init")
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_tracks_head_and_dirty_tree(git_repo):
+    clean = await repo_fingerprint(str(git_repo))
+    assert clean == await repo_fingerprint(str(git_repo))
+
+    (git_repo / "app.py").write_text("print('changed')\n")
+    modified = await repo_fingerprint(str(git_repo))
+    assert modified != clean
+
+    (git_repo / "new.py").write_text("x = 1\n")
+    assert await repo_fingerprint(str(git_repo)) not in (clean, modified)
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_is_none_outside_git(tmp_path):
+    assert await repo_fingerprint(str(tmp_path)) is None
+
+
+def test_cache_key_ignores_whitespace_differences():
+    assert cache_key("codex_analyze", "a  b\n c", "f") == cache_key(
+        "codex_analyze", "a b c", "f"
+    )
+    assert cache_key("codex_analyze", "a", "f") != cache_key("codex_plan", "a", "f")
+
+
+def test_cache_expires_entries_after_ttl(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), ttl_s=60, max_bytes=0)
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "time", lambda: now[0])
+
+    cache.put("k", "codex_analyze", "result")
+    assert cache.get("k") == "result"
+
+    now[0] += 61
+    assert cache.get("k") is None
+    assert not os.listdir(tmp_path)
+
+
+def test_cache_evicts_least_recently_used_over_max_bytes(tmp_path):
+    cache = ResultCache(str(tmp_path), ttl_s=0, max_bytes=400)
+
+    cache.put("a", "t", "x" * 100)
+    cache.put("b", "t", "y" * 100)
+    old = time.time() - 100
+    os.utime(tmp_path / "b.json", (old, old))
+    cache.get("a")
+    cache.put("c", "t", "z" * 100)
+
+    assert cache.get("a") == "x" * 100
+    assert cache.get("b") is None
+    assert cache.get("c") == "z" * 100
+
+
+@pytest.mark.asyncio
+async def test_read_only_tools_reuse_results_until_repo_changes(
+    git_repo, tmp_path, monkeypatch
+):
+    calls = []
+
+    async def fake_run_codex(prompt, cwd=None, extra_args=None):
+        calls.append(prompt)
+        return f"answer {len(calls)}"
+
+    monkeypatch.setattr(tools, "run_codex", fake_run_codex)
+    monkeypatch.setattr(
+        tools, "_result_cache", ResultCache(str(tmp_path / "cache"), 3600, 10**6)
+    )
+
+    first = await tools.codex_analyze(str(git_repo), "Where is main?")
+    second = await tools.codex_analyze(str(git_repo), "Where is main?")
+    (git_repo / "app.py").write_text("print('changed')\n")
+    third = await tools.codex_analyze(str(git_repo), "Where is main?")
+
+    assert first == second == "answer 1"
+    assert third == "answer 2"
+    assert len(calls) == 2
@@ -1,4 +1,6 @@
-from app import tools
+import pytest
+
+from app import jobs, tools
 
 
 def test_format_repo_prompt_includes_expected_sections():
@@ -18,10 +20,11 @@ def test_format_repo_prompt_includes_expected_sections():
     assert "Do the thing" in prompt
 
 
-def test_codex_generate_calls_runner(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_generate_calls_runner(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
@@ -29,7 +32,7 @@ def test_codex_generate_calls_runner(monkeypatch):
 
     monkeypatch.setattr(tools, "run_codex", fake_run_codex)
 
-    result = tools.codex_generate("hello")
+    result = await tools.codex_generate("hello")
 
     assert result == "ok"
     assert captured["prompt"] == "hello"
@@ -37,10 +40,11 @@ def test_codex_generate_calls_runner(monkeypatch):
     assert captured["extra_args"] is None
 
 
-def test_codex_plan_builds_prompt_and_cwd(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_plan_builds_prompt_and_cwd(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
@@ -48,7 +52,7 @@ def test_codex_plan_builds_prompt_and_cwd(monkeypatch):
 
     monkeypatch.setattr(tools, "run_codex", fake_run_codex)
 
-    tools.codex_plan("/repo", "Add rate limiting")
+    await tools.codex_plan("/repo", "Add rate limiting")
 
     assert "Mode: planning" in captured["prompt"]
     assert "Add rate limiting" in captured["prompt"]
@@ -58,10 +62,11 @@ def test_codex_plan_builds_prompt_and_cwd(monkeypatch):
     assert captured["extra_args"] is None
 
 
-def test_codex_analyze_builds_prompt_and_cwd(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_analyze_builds_prompt_and_cwd(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
@@ -69,7 +74,7 @@ def test_codex_analyze_builds_prompt_and_cwd(monkeypatch):
 
     monkeypatch.setattr(tools, "run_codex", fake_run_codex)
 
-    tools.codex_analyze("/repo", "Where is auth?")
+    await tools.codex_analyze("/repo", "Where is auth?")
 
     assert "Mode: analysis" in captured["prompt"]
     assert "Where is auth?" in captured["prompt"]
@@ -78,10 +83,11 @@ def test_codex_analyze_builds_prompt_and_cwd(monkeypatch):
     assert captured["extra_args"] is None
 
 
-def test_codex_summarize_without_focus(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_summarize_without_focus(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
@@ -89,7 +95,7 @@ def test_codex_summarize_without_focus(monkeypatch):
 
     monkeypatch.setattr(tools, "run_codex", fake_run_codex)
 
-    tools.codex_summarize("/repo")
+    await tools.codex_summarize("/repo")
 
     assert "Mode: summarize" in captured["prompt"]
     assert "Provide a concise summary of the repository" in captured["prompt"]
@@ -98,10 +104,11 @@ def test_codex_summarize_without_focus(monkeypatch):
     assert captured["extra_args"] is None
 
 
-def test_codex_summarize_with_focus(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_summarize_with_focus(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
@@ -109,16 +116,17 @@ def test_codex_summarize_with_focus(monkeypatch):
 
     monkeypatch.setattr(tools, "run_codex", fake_run_codex)
 
-    tools.codex_summarize("/repo", focus="architecture")
+    await tools.codex_summarize("/repo", focus="architecture")
 
     assert "Focus: architecture" in captured["prompt"]
     assert captured["cwd"] == "/repo"
 
 
-def test_codex_doc_outline(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_doc_outline(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
@@ -126,7 +134,7 @@ def test_codex_doc_outline(monkeypatch):
 
     monkeypatch.setattr(tools, "run_codex", fake_run_codex)
 
-    tools.codex_doc_outline("/repo", topic="Auth", audience="backend engineers")
+    await tools.codex_doc_outline("/repo", topic="Auth", audience="backend engineers")
 
     assert "Mode: docs" in captured["prompt"]
     assert "Create a documentation outline for: Auth" in captured["prompt"]
@@ -134,10 +142,11 @@ def test_codex_doc_outline(monkeypatch):
     assert captured["cwd"] == "/repo"
 
 
-def test_codex_test_plan(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_test_plan(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
@@ -145,25 +154,27 @@ def test_codex_test_plan(monkeypatch):
 
     monkeypatch.setattr(tools, "run_codex", fake_run_codex)
 
-    tools.codex_test_plan("/repo", goal="password reset")
+    await tools.codex_test_plan("/repo", goal="password reset")
 
     assert "Mode: test-plan" in captured["prompt"]
     assert "Create a test plan for: password reset" in captured["prompt"]
     assert captured["cwd"] == "/repo"
 
 
-def test_codex_edit_passes_apply(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_edit_passes_apply(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None, on_item=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
         return "ok"
 
-    monkeypatch.setattr(tools, "run_codex", fake_run_codex)
+    monkeypatch.setattr(jobs, "run_codex", fake_run_codex)
+    monkeypatch.setattr(tools, "_jobs", jobs.JobManager())
 
-    tools.codex_edit("/repo", "Refactor logging")
+    assert await tools.codex_edit("/repo", "Refactor logging") == "ok"
 
     assert "Mode: apply" in captured["prompt"]
     assert "Refactor logging" in captured["prompt"]
@@ -171,18 +182,25 @@ def test_codex_edit_passes_apply(monkeypatch):
     assert captured["extra_args"] == ["--apply"]
 
 
-def test_codex_refactor_passes_apply_and_constraints(monkeypatch):
+@pytest.mark.asyncio
+async def test_codex_refactor_passes_apply_and_constraints(monkeypatch):
     captured = {}
 
-    def fake_run_codex(prompt, cwd=None, extra_args=None):
+    async def fake_run_codex(prompt, cwd=None, extra_args=None, on_item=None):
         captured["prompt"] = prompt
         captured["cwd"] = cwd
         captured["extra_args"] = extra_args
         return "ok"
 
-    monkeypatch.setattr(tools, "run_codex", fake_run_codex)
+    monkeypatch.setattr(jobs, "run_codex", fake_run_codex)
+    monkeypatch.setattr(tools, "_jobs", jobs.JobManager())
 
-    tools.codex_refactor("/repo", "Split service", constraints="Keep APIs stable")
+    assert (
+        await tools.codex_refactor(
+            "/repo", "Split service", constraints="Keep APIs stable"
+        )
+        == "ok"
+    )
 
     assert "Mode: refactor" in captured["prompt"]
     assert "Split service" in captured["prompt"]
@@ -190,3 +208,28 @@ def test_codex_refactor_passes_apply_and_constraints(monkeypatch):
     assert "Provide a brief summary of changes" in captured["prompt"]
     assert captured["cwd"] == "/repo"
     assert captured["extra_args"] == ["--apply"]
+
+
+@pytest.mark.asyncio
+async def test_codex_tools_forward_items_as_progress(monkeypatch):
+    from app.codex_events import CodexItem
+
+    async def fake_run_codex(prompt, cwd=None, extra_args=None, on_item=None):
+        await on_item(CodexItem(type="reasoning", text="Reading code"))
+        await on_item(CodexItem(type="agent_message", text="Done"))
+        return "ok"
+
+    class FakeContext:
+        def __init__(self):
+            self.progress = []
+
+        async def report_progress(self, progress, total=None, message=None):
+            self.progress.append((progress, message))
+
+    monkeypatch.setattr(tools, "run_codex", fake_run_codex)
+    ctx = FakeContext()
+
+    result = await tools.codex_analyze("/repo", "Where is auth?", ctx=ctx)
+
+    assert result == "ok"
+    assert ctx.progress == [(1, "Reasoning: Reading code"), (2, "Message: Done")]
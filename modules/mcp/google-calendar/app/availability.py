@@ -0,0 +1,159 @@
+"""
+Free slot search over busy intervals
+Pure interval logic behind GoogleCalendarClient.find_free_slots
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, tzinfo
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+@dataclass
+class FreeSlot:
+    """A candidate meeting slot"""
+
+    start: datetime
+    end: datetime
+    # True when the slot had to sit right against another meeting
+    back_to_back: bool = False
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """
+    Merge overlapping or touching intervals
+
+    Args:
+        intervals: (start, end) pairs in any order; empty ones are dropped
+
+    Returns:
+        Disjoint intervals sorted by start
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(i for i in intervals if i[1] > i[0]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _round_up(value: datetime, step: timedelta) -> datetime:
+    seconds = step.total_seconds()
+    if seconds <= 0:
+        return value
+    rounded = math.ceil(value.timestamp() / seconds) * seconds
+    return datetime.fromtimestamp(rounded, tz=value.tzinfo)
+
+
+def _gaps(
+    busy: List[Interval], open_at: datetime, close_at: datetime
+) -> Iterator[Tuple[datetime, datetime, bool, bool]]:
+    """Yield (start, end, after_busy, before_busy) for free time in a window"""
+    cursor = open_at
+    after_busy = False
+    for start, end in busy:
+        if end <= cursor:
+            if end == cursor:
+                after_busy = True
+            continue
+        if start >= close_at:
+            break
+        if start > cursor:
+            yield cursor, start, after_busy, True
+        cursor = max(cursor, end)
+        after_busy = True
+        if cursor >= close_at:
+            return
+    if cursor < close_at:
+        yield cursor, close_at, after_busy, False
+
+
+def _place(
+    gap: Tuple[datetime, datetime, bool, bool],
+    duration: timedelta,
+    buffer: timedelta,
+    granularity: timedelta,
+) -> Optional[FreeSlot]:
+    """Put a slot in a gap, keeping a buffer from neighbouring meetings if it fits"""
+    gap_start, gap_end, after_busy, before_busy = gap
+    lead = buffer if after_busy else timedelta(0)
+    tail = buffer if before_busy else timedelta(0)
+
+    start = _round_up(gap_start + lead, granularity)
+    if start + duration + tail <= gap_end:
+        return FreeSlot(start, start + duration)
+
+    start = _round_up(gap_start, granularity)
+    if start + duration <= gap_end:
+        return FreeSlot(start, start + duration, back_to_back=after_busy or before_busy)
+    return None
+
+
+def find_free_slots(
+    busy: Iterable[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    tz: tzinfo,
+    day_start: time = time(9, 0),
+    day_end: time = time(18, 0),
+    include_weekends: bool = False,
+    buffer: timedelta = timedelta(minutes=10),
+    granularity: timedelta = timedelta(minutes=15),
+    max_slots: int = 5,
+) -> List[FreeSlot]:
+    """
+    Find ranked free slots between busy intervals
+
+    Each free gap inside working hours contributes at most one slot, so
+    candidates are spread across the range rather than stacked in the first
+    gap. Slots are ranked by day, then by whether they keep a buffer from
+    adjacent meetings, then by start time.
+
+    Args:
+        busy: Busy (start, end) intervals, timezone-aware, possibly overlapping
+        window_start: Earliest time a slot may start
+        window_end: Latest time a slot may end
+        duration: Slot length
+        tz: Timezone working hours are expressed in
+        day_start: Start of working hours
+        day_end: End of working hours
+        include_weekends: Also search Saturdays and Sundays
+        buffer: Preferred gap to meetings before and after the slot
+        granularity: Slot starts are rounded up to a multiple of this
+        max_slots: Maximum number of slots to return
+
+    Returns:
+        Ranked candidate slots
+    """
+    # Work in the local timezone so slots come back in it
+    merged = [
+        (start.astimezone(tz), end.astimezone(tz))
+        for start, end in merge_intervals(busy)
+    ]
+    slots: List[FreeSlot] = []
+
+    day = window_start.astimezone(tz).date()
+    last_day = window_end.astimezone(tz).date()
+    while day <= last_day:
+        if include_weekends or day.weekday() < 5:
+            open_at = max(datetime.combine(day, day_start, tzinfo=tz), window_start)
+            close_at = min(datetime.combine(day, day_end, tzinfo=tz), window_end)
+            if open_at < close_at:
+                for gap in _gaps(merged, open_at, close_at):
+                    slot = _place(gap, duration, buffer, granularity)
+                    if slot is not None:
+                        slots.append(slot)
+        day += timedelta(days=1)
+
+    slots.sort(
+        key=lambda slot: (
+            slot.start.astimezone(tz).date(),
+            slot.back_to_back,
+            slot.start,
+        )
+    )
+    return slots[:max_slots]
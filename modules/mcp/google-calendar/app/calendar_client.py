@@ -4,10 +4,13 @@ Handles authentication and calendar operations
 """
 
 import os
+import hashlib
 import pickle
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+import threading
+import time
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
+from datetime import datetime, timezone
 from pathlib import Path
 
 from google.auth.transport.requests import Request
@@ -16,6 +19,15 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from availability import FreeSlot, find_free_slots
+from event_store import (
+    EventStore,
+    build_event_store,
+    CALENDAR_SYNC_DAYS_AHEAD,
+    CALENDAR_SYNC_DAYS_BACK,
+    CALENDAR_SYNC_INTERVAL,
+)
+
 # If modifying these scopes, delete the file token.pickle.
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
@@ -26,6 +38,114 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Refresh the OAuth access token this many seconds before it expires
+CALENDAR_TOKEN_REFRESH_MARGIN = float(os.getenv("CALENDAR_TOKEN_REFRESH_MARGIN", "300"))
+# Delay before retrying a background refresh that failed
+_REFRESH_RETRY_S = 60.0
+# Most requests the Calendar API accepts in one batch
+BATCH_LIMIT = 50
+# Events requested per page when listing (the API allows up to 2500)
+LIST_PAGE_SIZE = 250
+# Event fields _format_event (and the event store) use; the API omits the rest
+EVENT_FIELDS = (
+    "id,status,summary,description,start,end,"
+    "attendees(email,responseStatus),htmlLink"
+)
+LIST_FIELDS = f"items({EVENT_FIELDS}),nextPageToken"
+SYNC_FIELDS = f"items({EVENT_FIELDS}),nextPageToken,nextSyncToken"
+
+
+def _rfc3339(timestamp: Optional[float]) -> Optional[str]:
+    """Format epoch seconds as an RFC3339 UTC timestamp"""
+    if timestamp is None:
+        return None
+    return (
+        datetime.fromtimestamp(timestamp, timezone.utc)
+        .isoformat()
+        .replace("+00:00", "Z")
+    )
+
+
+class CredentialCache:
+    """
+    Holds OAuth credentials and refreshes them before they expire
+
+    A daemon timer refreshes the access token ``margin`` seconds ahead of its
+    expiry and hands the new credentials to ``on_refresh`` (which persists
+    them), so API calls do not stall on a token refresh. If a background
+    refresh fails it is retried later; meanwhile the API client still
+    refreshes on demand as before.
+    """
+
+    def __init__(
+        self,
+        credentials,
+        on_refresh: Optional[Callable[[Any], None]] = None,
+        margin: float = CALENDAR_TOKEN_REFRESH_MARGIN,
+    ):
+        self.credentials = credentials
+        self.margin = margin
+        self._on_refresh = on_refresh
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+    def seconds_until_refresh(self) -> Optional[float]:
+        """Seconds until the next refresh is due, or None if it cannot refresh"""
+        expiry = getattr(self.credentials, "expiry", None)
+        if not isinstance(expiry, datetime):
+            return None
+        if not getattr(self.credentials, "refresh_token", None):
+            return None
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return max((expiry - now).total_seconds() - self.margin, 0.0)
+
+    def start(self, delay: Optional[float] = None) -> None:
+        """Schedule the next background refresh"""
+        with self._lock:
+            if self._closed:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if delay is None:
+                delay = self.seconds_until_refresh()
+            if delay is None:
+                return
+            self._timer = threading.Timer(delay, self._refresh_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def refresh(self) -> None:
+        """Refresh the access token now and persist it"""
+        with self._lock:
+            self.credentials.refresh(Request())
+        if self._on_refresh is not None:
+            self._on_refresh(self.credentials)
+
+    def close(self) -> None:
+        """Stop background refreshing"""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Background token refresh failed: {e}")
+            self.start(_REFRESH_RETRY_S)
+            return
+        log_msg = (
+            f"OAuth token refreshed in background, expires {self.credentials.expiry}"
+        )
+        logger.info(log_msg)
+        print(f"[CALENDAR_CLIENT] {log_msg}")
+        self.start()
+
 
 class GoogleCalendarClient:
     """Client for interacting with Google Calendar API"""
@@ -50,8 +170,20 @@ class GoogleCalendarClient:
         self.token_path = token_path or os.path.join(secrets_dir, "token.json")
         self.timezone = os.getenv("CALENDAR_TIMEZONE", "UTC")
         self.service = None
+        self.credential_cache: Optional[CredentialCache] = None
         self._authenticate()
 
+        self.sync_interval = CALENDAR_SYNC_INTERVAL
+        self.sync_days_back = CALENDAR_SYNC_DAYS_BACK
+        self.sync_days_ahead = CALENDAR_SYNC_DAYS_AHEAD
+        try:
+            self.event_store: Optional[EventStore] = build_event_store(
+                self.timezone, self._account_key()
+            )
+        except Exception as e:
+            logger.warning(f"Event cache disabled, could not open it: {e}")
+            self.event_store = None
+
     def _authenticate(self) -> None:
         """Authenticate with Google Calendar API"""
         creds = None
@@ -76,22 +208,51 @@ class GoogleCalendarClient:
                 creds = flow.run_local_server(port=0)
 
             # Save credentials for next run
-            os.makedirs(os.path.dirname(self.token_path), exist_ok=True)
-            if self.token_path.endswith(".json"):
-                with open(self.token_path, "w") as token:
-                    token.write(creds.to_json())
-            else:
-                with open(self.token_path, "wb") as token:
-                    pickle.dump(creds, token)
+            self._save_credentials(creds)
+
+        self.credential_cache = CredentialCache(
+            creds, on_refresh=self._save_credentials
+        )
+        self.credential_cache.start()
+
+        # Use the discovery document bundled with googleapiclient instead of
+        # fetching it, and skip the legacy discovery file cache
+        self.service = build(
+            "calendar",
+            "v3",
+            credentials=creds,
+            static_discovery=True,
+            cache_discovery=False,
+        )
 
-        self.service = build("calendar", "v3", credentials=creds)
+    def _account_key(self) -> str:
+        """Stable id of the signed-in account, used to scope the event cache"""
+        creds = self.credential_cache.credentials if self.credential_cache else None
+        account = getattr(creds, "account", None)
+        if isinstance(account, str) and account:
+            return account
+        # A refresh token belongs to one account's grant; only its hash is kept
+        refresh_token = getattr(creds, "refresh_token", None)
+        if isinstance(refresh_token, str) and refresh_token:
+            return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()[:16]
+        return os.path.realpath(self.token_path)
+
+    def _save_credentials(self, creds) -> None:
+        """Persist credentials to the token cache file"""
+        os.makedirs(os.path.dirname(self.token_path), exist_ok=True)
+        if self.token_path.endswith(".json"):
+            with open(self.token_path, "w") as token:
+                token.write(creds.to_json())
+        else:
+            with open(self.token_path, "wb") as token:
+                pickle.dump(creds, token)
 
     def list_events(
         self,
         calendar_id: str = "primary",
         start_date: str = None,
         end_date: str = None,
-        max_results: int = 10,
+        max_results: Optional[int] = 10,
     ) -> List[Dict[str, Any]]:
         """
         List events from calendar within date range
@@ -100,93 +261,163 @@ class GoogleCalendarClient:
             calendar_id: Calendar ID (default: primary)
             start_date: Start date in ISO format (YYYY-MM-DD) in user's timezone
             end_date: End date in ISO format (YYYY-MM-DD) in user's timezone
-            max_results: Maximum number of events to return
+            max_results: Maximum number of events to return (None for all)
 
         Returns:
             List of events
         """
         try:
-            from datetime import timedelta
-            from zoneinfo import ZoneInfo
+            return list(
+                self.iter_events(calendar_id, start_date, end_date, max_results)
+            )
+        except HttpError as error:
+            return {"error": f"API error: {error}"}
 
-            # Get timezone offset from environment or use UTC
-            tz_name = self.timezone if self.timezone != "UTC" else "UTC"
+    def iter_events(
+        self,
+        calendar_id: str = "primary",
+        start_date: str = None,
+        end_date: str = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield formatted events within date range, ordered by start time
 
-            # Convert dates to RFC3339 format if provided
-            # Dates are provided in user's local timezone
-            time_min = None
-            time_max = None
-            if start_date:
-                # Handle both YYYY-MM-DD and full datetime strings
-                # Strip 'Z' suffix if present and extract just the date part
-                date_str = start_date.replace("Z", "").split("T")[0]
-                # Parse as naive datetime in user's timezone
-                date_obj = datetime.fromisoformat(date_str)
-                # Subtract 1 day to expand search window
-                date_obj = date_obj - timedelta(days=1)
-
-                # Create timezone-aware datetime at midnight in user's timezone
-                try:
-                    tz = ZoneInfo(tz_name)
-                    aware_dt = date_obj.replace(hour=0, minute=0, second=0, tzinfo=tz)
-                except Exception:
-                    # Fallback to UTC if timezone parsing fails
-                    aware_dt = date_obj.replace(
-                        hour=0, minute=0, second=0, tzinfo=ZoneInfo("UTC")
-                    )
+        Events come from the local event store when it is enabled, otherwise
+        from the API one page at a time, so callers can start consuming
+        before the whole range is fetched.
 
-                # Convert to UTC
-                utc_dt = aware_dt.astimezone(ZoneInfo("UTC"))
-                time_min = utc_dt.isoformat().replace("+00:00", "Z")
+        Args:
+            calendar_id: Calendar ID (default: primary)
+            start_date: Start date in ISO format (YYYY-MM-DD) in user's timezone
+            end_date: End date in ISO format (YYYY-MM-DD) in user's timezone
+            limit: Stop after this many events (None for all)
 
-            if end_date:
-                # Handle both YYYY-MM-DD and full datetime strings
-                # Strip 'Z' suffix if present and extract just the date part
-                date_str = end_date.replace("Z", "").split("T")[0]
-                # Parse as naive datetime in user's timezone
-                date_obj = datetime.fromisoformat(date_str)
-                # Add 1 day to expand search window
-                date_obj = date_obj + timedelta(days=1)
-
-                # Create timezone-aware datetime at end of day in user's timezone
-                try:
-                    tz = ZoneInfo(tz_name)
-                    aware_dt = date_obj.replace(
-                        hour=23, minute=59, second=59, tzinfo=tz
-                    )
-                except Exception:
-                    # Fallback to UTC if timezone parsing fails
-                    aware_dt = date_obj.replace(
-                        hour=23, minute=59, second=59, tzinfo=ZoneInfo("UTC")
-                    )
+        Raises:
+            HttpError: If the Calendar API request fails
+        """
+        time_min, time_max = self._time_bounds(start_date, end_date)
+
+        if self.event_store is not None:
+            events = self._list_cached_events(calendar_id, time_min, time_max, limit)
+            if events is not None:
+                for event in events:
+                    yield self._format_event(event)
+                return
 
-                # Convert to UTC
-                utc_dt = aware_dt.astimezone(ZoneInfo("UTC"))
-                time_max = utc_dt.isoformat().replace("+00:00", "Z")
+        for event in self._iter_api_events(calendar_id, time_min, time_max, limit):
+            yield self._format_event(event)
 
+    def _iter_api_events(
+        self,
+        calendar_id: str,
+        time_min: Optional[str],
+        time_max: Optional[str],
+        limit: Optional[int],
+    ) -> Iterator[Dict[str, Any]]:
+        """Page through events.list following nextPageToken"""
+        page_token = None
+        count = 0
+        while True:
+            page_size = LIST_PAGE_SIZE
+            if limit:
+                page_size = min(page_size, limit - count)
             events_result = (
                 self.service.events()
                 .list(
                     calendarId=calendar_id,
                     timeMin=time_min,
                     timeMax=time_max,
-                    maxResults=max_results,
+                    maxResults=page_size,
                     singleEvents=True,
                     orderBy="startTime",
                     timeZone=self.timezone,
+                    fields=LIST_FIELDS,
+                    pageToken=page_token,
                 )
                 .execute()
             )
 
-            log_msg = f"Google Calendar API list query - calendarId={calendar_id}, timeMin={time_min}, timeMax={time_max}, results={len(events_result.get('items', []))} events"
+            items = events_result.get("items", [])
+            log_msg = f"Google Calendar API list query - calendarId={calendar_id}, timeMin={time_min}, timeMax={time_max}, results={len(items)} events"
             logger.info(log_msg)
             print(f"[CALENDAR_CLIENT] {log_msg}")
 
-            events = events_result.get("items", [])
-            return self._format_events(events)
+            for event in items:
+                yield event
+                count += 1
+                if limit and count >= limit:
+                    return
 
-        except HttpError as error:
-            return {"error": f"API error: {error}"}
+            page_token = events_result.get("nextPageToken")
+            if not page_token:
+                return
+
+    def _time_bounds(
+        self, start_date: Optional[str], end_date: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Convert a user date range to the RFC3339 timeMin/timeMax to query
+
+        The window is widened by a day on each side.
+        """
+        from datetime import timedelta
+        from zoneinfo import ZoneInfo
+
+        # Get timezone offset from environment or use UTC
+        tz_name = self.timezone if self.timezone != "UTC" else "UTC"
+
+        # Convert dates to RFC3339 format if provided
+        # Dates are provided in user's local timezone
+        time_min = None
+        time_max = None
+        if start_date:
+            # Handle both YYYY-MM-DD and full datetime strings
+            # Strip 'Z' suffix if present and extract just the date part
+            date_str = start_date.replace("Z", "").split("T")[0]
+            # Parse as naive datetime in user's timezone
+            date_obj = datetime.fromisoformat(date_str)
+            # Subtract 1 day to expand search window
+            date_obj = date_obj - timedelta(days=1)
+
+            # Create timezone-aware datetime at midnight in user's timezone
+            try:
+                tz = ZoneInfo(tz_name)
+                aware_dt = date_obj.replace(hour=0, minute=0, second=0, tzinfo=tz)
+            except Exception:
+                # Fallback to UTC if timezone parsing fails
+                aware_dt = date_obj.replace(
+                    hour=0, minute=0, second=0, tzinfo=ZoneInfo("UTC")
+                )
+
+            # Convert to UTC
+            utc_dt = aware_dt.astimezone(ZoneInfo("UTC"))
+            time_min = utc_dt.isoformat().replace("+00:00", "Z")
+
+        if end_date:
+            # Handle both YYYY-MM-DD and full datetime strings
+            # Strip 'Z' suffix if present and extract just the date part
+            date_str = end_date.replace("Z", "").split("T")[0]
+            # Parse as naive datetime in user's timezone
+            date_obj = datetime.fromisoformat(date_str)
+            # Add 1 day to expand search window
+            date_obj = date_obj + timedelta(days=1)
+
+            # Create timezone-aware datetime at end of day in user's timezone
+            try:
+                tz = ZoneInfo(tz_name)
+                aware_dt = date_obj.replace(hour=23, minute=59, second=59, tzinfo=tz)
+            except Exception:
+                # Fallback to UTC if timezone parsing fails
+                aware_dt = date_obj.replace(
+                    hour=23, minute=59, second=59, tzinfo=ZoneInfo("UTC")
+                )
+
+            # Convert to UTC
+            utc_dt = aware_dt.astimezone(ZoneInfo("UTC"))
+            time_max = utc_dt.isoformat().replace("+00:00", "Z")
+
+        return time_min, time_max
 
     def create_event(
         self,
@@ -212,17 +443,9 @@ class GoogleCalendarClient:
             Created event details
         """
         try:
-            event = {
-                "summary": title,
-                "start": {"dateTime": start_time, "timeZone": self.timezone},
-                "end": {"dateTime": end_time, "timeZone": self.timezone},
-            }
-
-            if description:
-                event["description"] = description
-
-            if attendees:
-                event["attendees"] = [{"email": email} for email in attendees]
+            event = self._event_body(
+                title, start_time, end_time, description, attendees
+            )
 
             created_event = (
                 self.service.events()
@@ -234,6 +457,9 @@ class GoogleCalendarClient:
             logger.info(log_msg)
             print(f"[CALENDAR_CLIENT] {log_msg}")
 
+            if self.event_store is not None:
+                self.event_store.upsert_event(calendar_id, created_event)
+
             return self._format_event(created_event)
 
         except HttpError as error:
@@ -263,37 +489,21 @@ class GoogleCalendarClient:
             Updated event details
         """
         try:
-            # Get existing event
-            event = (
-                self.service.events()
-                .get(calendarId=calendar_id, eventId=event_id)
-                .execute()
-            )
-
-            log_msg = f"Google Calendar API get event - calendarId={calendar_id}, eventId={event_id}"
-            logger.info(log_msg)
-            print(f"[CALENDAR_CLIENT] {log_msg}")
-
-            # Update fields if provided
-            if title:
-                event["summary"] = title
-            if description is not None:
-                event["description"] = description
-            if start_time:
-                event["start"] = {"dateTime": start_time, "timeZone": self.timezone}
-            if end_time:
-                event["end"] = {"dateTime": end_time, "timeZone": self.timezone}
-
+            # Patch only the provided fields, no need to fetch the event first
+            patch = self._event_patch(title, description, start_time, end_time)
             updated_event = (
                 self.service.events()
-                .update(calendarId=calendar_id, eventId=event_id, body=event)
+                .patch(calendarId=calendar_id, eventId=event_id, body=patch)
                 .execute()
             )
 
-            log_msg = f"Google Calendar API update event - calendarId={calendar_id}, eventId={event_id}, summary={event.get('summary')}"
+            log_msg = f"Google Calendar API patch event - calendarId={calendar_id}, eventId={event_id}, summary={updated_event.get('summary')}"
             logger.info(log_msg)
             print(f"[CALENDAR_CLIENT] {log_msg}")
 
+            if self.event_store is not None:
+                self.event_store.upsert_event(calendar_id, updated_event)
+
             return self._format_event(updated_event)
 
         except HttpError as error:
@@ -321,11 +531,462 @@ class GoogleCalendarClient:
             logger.info(log_msg)
             print(f"[CALENDAR_CLIENT] {log_msg}")
 
+            if self.event_store is not None:
+                self.event_store.delete_event(calendar_id, event_id)
+
             return {"message": f"Event {event_id} deleted successfully"}
 
         except HttpError as error:
             return {"error": f"API error: {error}"}
 
+    def batch_create_events(
+        self, events: List[Dict[str, Any]], calendar_id: str = "primary"
+    ) -> Dict[str, Any]:
+        """
+        Create many events using batched API requests
+
+        Args:
+            events: Dicts with title, start_time, end_time and optionally
+                description and attendees (same meaning as in create_event)
+            calendar_id: Calendar ID (default: primary)
+
+        Returns:
+            {"created": [event details], "errors": [{"index", "error"}]}
+        """
+        created = []
+        errors = []
+        requests = []
+        for index, spec in enumerate(events):
+            try:
+                body = self._event_body(
+                    spec["title"],
+                    spec["start_time"],
+                    spec["end_time"],
+                    spec.get("description"),
+                    spec.get("attendees"),
+                )
+            except (KeyError, TypeError) as e:
+                errors.append({"index": index, "error": f"Missing field: {e}"})
+                continue
+            requests.append(
+                (
+                    str(index),
+                    self.service.events().insert(calendarId=calendar_id, body=body),
+                )
+            )
+
+        for request_id, response, error in self._execute_batch(requests):
+            if error is not None:
+                errors.append({"index": int(request_id), "error": error})
+                continue
+            if self.event_store is not None:
+                self.event_store.upsert_event(calendar_id, response)
+            created.append(self._format_event(response))
+
+        log_msg = f"Google Calendar API batch create - calendarId={calendar_id}, created={len(created)}, errors={len(errors)}"
+        logger.info(log_msg)
+        print(f"[CALENDAR_CLIENT] {log_msg}")
+        return {"created": created, "errors": errors}
+
+    def batch_update_events(
+        self, updates: List[Dict[str, Any]], calendar_id: str = "primary"
+    ) -> Dict[str, Any]:
+        """
+        Patch many events (e.g. a bulk reschedule) using batched API requests
+
+        Args:
+            updates: Dicts with event_id and any of title, description,
+                start_time and end_time (same meaning as in update_event)
+            calendar_id: Calendar ID (default: primary)
+
+        Updates of the same event are merged into one patch.
+
+        Returns:
+            {"updated": [event details], "errors": [{"event_id", "error"}]}
+        """
+        updated = []
+        errors = []
+        # Batch request ids must be unique, so several updates of one event
+        # are merged into a single patch; later fields win
+        changes: Dict[str, Dict[str, Any]] = {}
+        for spec in updates:
+            event_id = spec.get("event_id")
+            if not event_id:
+                errors.append({"event_id": None, "error": "Missing field: 'event_id'"})
+                continue
+            fields = changes.setdefault(event_id, {})
+            for field in ("title", "description", "start_time", "end_time"):
+                if spec.get(field) is not None:
+                    fields[field] = spec[field]
+
+        requests = [
+            (
+                event_id,
+                self.service.events().patch(
+                    calendarId=calendar_id,
+                    eventId=event_id,
+                    body=self._event_patch(**fields),
+                ),
+            )
+            for event_id, fields in changes.items()
+        ]
+
+        for event_id, response, error in self._execute_batch(requests):
+            if error is not None:
+                errors.append({"event_id": event_id, "error": error})
+                continue
+            if self.event_store is not None:
+                self.event_store.upsert_event(calendar_id, response)
+            updated.append(self._format_event(response))
+
+        log_msg = f"Google Calendar API batch patch - calendarId={calendar_id}, updated={len(updated)}, errors={len(errors)}"
+        logger.info(log_msg)
+        print(f"[CALENDAR_CLIENT] {log_msg}")
+        return {"updated": updated, "errors": errors}
+
+    def batch_delete_events(
+        self, event_ids: List[str], calendar_id: str = "primary"
+    ) -> Dict[str, Any]:
+        """
+        Delete many events using batched API requests
+
+        Args:
+            event_ids: IDs of the events to delete
+            calendar_id: Calendar ID (default: primary)
+
+        Returns:
+            {"deleted": [event ids], "errors": [{"event_id", "error"}]}
+        """
+        requests = [
+            (
+                event_id,
+                self.service.events().delete(calendarId=calendar_id, eventId=event_id),
+            )
+            for event_id in dict.fromkeys(event_ids)
+        ]
+        deleted = []
+        errors = []
+        for event_id, _, error in self._execute_batch(requests):
+            if error is not None:
+                errors.append({"event_id": event_id, "error": error})
+                continue
+            if self.event_store is not None:
+                self.event_store.delete_event(calendar_id, event_id)
+            deleted.append(event_id)
+
+        log_msg = f"Google Calendar API batch delete - calendarId={calendar_id}, deleted={len(deleted)}, errors={len(errors)}"
+        logger.info(log_msg)
+        print(f"[CALENDAR_CLIENT] {log_msg}")
+        return {"deleted": deleted, "errors": errors}
+
+    def _execute_batch(
+        self, requests: List[Tuple[str, Any]]
+    ) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Send requests through the batch endpoint, BATCH_LIMIT per round trip
+
+        Args:
+            requests: (request_id, HttpRequest) pairs; ids must be unique
+
+        Returns:
+            (request_id, response, error message) in request order
+        """
+        outcomes: Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]] = {}
+
+        def callback(request_id, response, exception):
+            if exception is not None:
+                outcomes[request_id] = (None, f"API error: {exception}")
+            else:
+                outcomes[request_id] = (response, None)
+
+        for offset in range(0, len(requests), BATCH_LIMIT):
+            chunk = requests[offset : offset + BATCH_LIMIT]
+            batch = self.service.new_batch_http_request(callback=callback)
+            for request_id, request in chunk:
+                batch.add(request, request_id=request_id)
+            try:
+                batch.execute()
+            except HttpError as error:
+                for request_id, _ in chunk:
+                    outcomes.setdefault(request_id, (None, f"API error: {error}"))
+
+        return [
+            (request_id, *outcomes.get(request_id, (None, "No response")))
+            for request_id, _ in requests
+        ]
+
+    def _event_body(
+        self,
+        title: str,
+        start_time: str,
+        end_time: str,
+        description: str = None,
+        attendees: List[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the resource for a new event"""
+        event = {
+            "summary": title,
+            "start": {"dateTime": start_time, "timeZone": self.timezone},
+            "end": {"dateTime": end_time, "timeZone": self.timezone},
+        }
+
+        if description:
+            event["description"] = description
+
+        if attendees:
+            event["attendees"] = [{"email": email} for email in attendees]
+
+        return event
+
+    def _event_patch(
+        self,
+        title: str = None,
+        description: str = None,
+        start_time: str = None,
+        end_time: str = None,
+    ) -> Dict[str, Any]:
+        """Build a patch body holding only the fields being changed"""
+        patch = {}
+        if title:
+            patch["summary"] = title
+        if description is not None:
+            patch["description"] = description
+        if start_time:
+            patch["start"] = {"dateTime": start_time, "timeZone": self.timezone}
+        if end_time:
+            patch["end"] = {"dateTime": end_time, "timeZone": self.timezone}
+        return patch
+
+    def find_free_slots(
+        self,
+        duration_minutes: int,
+        start_date: str = None,
+        end_date: str = None,
+        calendar_ids: List[str] = None,
+        day_start: str = "09:00",
+        day_end: str = "18:00",
+        include_weekends: bool = False,
+        max_slots: int = 5,
+    ) -> Dict[str, Any]:
+        """
+        Find free slots shared by one or more calendars
+
+        Busy times come from a single freebusy query covering every calendar;
+        they are merged locally and the free gaps inside working hours are
+        ranked (see availability.find_free_slots).
+
+        Args:
+            duration_minutes: Length of the slot to find
+            start_date: First day to search (YYYY-MM-DD) in user's timezone (default: now)
+            end_date: Last day to search (YYYY-MM-DD), inclusive (default: 7 days after start)
+            calendar_ids: Calendars that must all be free (default: primary)
+            day_start: Start of working hours (HH:MM)
+            day_end: End of working hours (HH:MM)
+            include_weekends: Also search Saturdays and Sundays
+            max_slots: Maximum number of slots to return
+
+        Returns:
+            {"slots": [FreeSlot], "timezone": name, "errors": [{"calendar_id", "error"}]}
+        """
+        from datetime import time as day_time, timedelta
+        from zoneinfo import ZoneInfo
+
+        try:
+            tz = ZoneInfo(self.timezone)
+        except Exception:
+            tz = ZoneInfo("UTC")
+        calendar_ids = calendar_ids or ["primary"]
+
+        try:
+            working_start = day_time.fromisoformat(day_start)
+            working_end = day_time.fromisoformat(day_end)
+            now = datetime.now(tz)
+            if start_date:
+                first_day = datetime.fromisoformat(start_date.split("T")[0]).date()
+                window_start = max(
+                    datetime.combine(first_day, day_time(0), tzinfo=tz), now
+                )
+            else:
+                first_day = now.date()
+                window_start = now
+            if end_date:
+                last_day = datetime.fromisoformat(end_date.split("T")[0]).date()
+            else:
+                last_day = first_day + timedelta(days=7)
+            window_end = datetime.combine(
+                last_day + timedelta(days=1), day_time(0), tzinfo=tz
+            )
+        except ValueError as error:
+            return {"error": f"Invalid date or time: {error}"}
+
+        if window_end <= window_start:
+            return {"slots": [], "timezone": str(tz), "errors": []}
+
+        try:
+            response = (
+                self.service.freebusy()
+                .query(
+                    body={
+                        "timeMin": window_start.isoformat(),
+                        "timeMax": window_end.isoformat(),
+                        "timeZone": str(tz),
+                        "items": [{"id": calendar_id} for calendar_id in calendar_ids],
+                    }
+                )
+                .execute()
+            )
+        except HttpError as error:
+            return {"error": f"API error: {error}"}
+
+        busy = []
+        errors = []
+        for calendar_id, info in (response.get("calendars") or {}).items():
+            for error in info.get("errors", []):
+                errors.append(
+                    {
+                        "calendar_id": calendar_id,
+                        "error": error.get("reason", "unknown"),
+                    }
+                )
+            for period in info.get("busy", []):
+                busy.append(
+                    (
+                        datetime.fromisoformat(period["start"].replace("Z", "+00:00")),
+                        datetime.fromisoformat(period["end"].replace("Z", "+00:00")),
+                    )
+                )
+
+        log_msg = f"Google Calendar API freebusy query - calendars={calendar_ids}, timeMin={window_start.isoformat()}, timeMax={window_end.isoformat()}, busy={len(busy)} periods"
+        logger.info(log_msg)
+        print(f"[CALENDAR_CLIENT] {log_msg}")
+
+        slots: List[FreeSlot] = find_free_slots(
+            busy,
+            window_start,
+            window_end,
+            timedelta(minutes=duration_minutes),
+            tz,
+            day_start=working_start,
+            day_end=working_end,
+            include_weekends=include_weekends,
+            max_slots=max_slots,
+        )
+        return {"slots": slots, "timezone": str(tz), "errors": errors}
+
+    def sync_calendar(self, calendar_id: str = "primary", force: bool = False) -> None:
+        """
+        Bring the local event store up to date with the calendar
+
+        Uses the stored syncToken to fetch only changes since the last sync,
+        falling back to a full sync when there is none or Google expired it
+        (HTTP 410). A full sync only covers ``sync_days_back`` days before
+        and ``sync_days_ahead`` days after today, so recurring events are
+        not expanded across the calendar's whole history. Each page is
+        written to the store as it arrives. Skipped while the last sync is
+        younger than ``sync_interval`` unless ``force`` is set.
+
+        Args:
+            calendar_id: Calendar ID (default: primary)
+            force: Sync even if the store is fresh
+
+        Raises:
+            HttpError: If the Calendar API request fails
+        """
+        if self.event_store is None:
+            return
+        if not force and self.event_store.is_fresh(calendar_id, self.sync_interval):
+            return
+
+        state = self.event_store.sync_state(calendar_id)
+        sync_token = state[0] if state else None
+        window = None if sync_token else self._sync_window()
+        changes = 0
+        max_span = 0.0
+        page_token = None
+        started = time.perf_counter()
+
+        while True:
+            request = {
+                "calendarId": calendar_id,
+                "singleEvents": True,
+                "maxResults": 2500,
+                "pageToken": page_token,
+                "timeZone": self.timezone,
+                "fields": SYNC_FIELDS,
+            }
+            if sync_token:
+                request["syncToken"] = sync_token
+            else:
+                request["timeMin"], request["timeMax"] = (
+                    _rfc3339(bound) for bound in window
+                )
+            try:
+                result = self.service.events().list(**request).execute()
+            except HttpError as error:
+                if sync_token and getattr(error.resp, "status", None) == 410:
+                    logger.info(f"Sync token expired for {calendar_id}, resyncing")
+                    sync_token = None
+                    window = self._sync_window()
+                    page_token = None
+                    continue
+                raise
+
+            if sync_token is None and page_token is None:
+                self.event_store.begin_full_sync(calendar_id)
+            items = result.get("items", [])
+            changes += len(items)
+            max_span = max(max_span, self.event_store.apply_changes(calendar_id, items))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                break
+
+        self.event_store.finish_sync(
+            calendar_id, result.get("nextSyncToken"), max_span, window
+        )
+
+        kind = "incremental" if sync_token else "full"
+        log_msg = f"Google Calendar API {kind} sync - calendarId={calendar_id}, changes={changes}, took={time.perf_counter() - started:.2f}s"
+        logger.info(log_msg)
+        print(f"[CALENDAR_CLIENT] {log_msg}")
+
+    def _sync_window(self) -> Tuple[Optional[float], Optional[float]]:
+        """Epoch seconds a full sync starting now covers (None = no limit)"""
+        now = time.time()
+        start = now - self.sync_days_back * 86400 if self.sync_days_back > 0 else None
+        end = now + self.sync_days_ahead * 86400 if self.sync_days_ahead > 0 else None
+        return start, end
+
+    def _list_cached_events(
+        self,
+        calendar_id: str,
+        time_min: Optional[str],
+        time_max: Optional[str],
+        max_results: int,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a list query from the local event store
+
+        Returns:
+            Raw events, or None if the store cannot answer (never synced and
+            the sync failed), in which case the caller queries the API
+        """
+        try:
+            self.sync_calendar(calendar_id)
+        except HttpError as error:
+            if self.event_store.sync_state(calendar_id) is None:
+                logger.warning(f"Event sync failed, querying the API: {error}")
+                return None
+            logger.warning(f"Event sync failed, serving cached events: {error}")
+        if not self.event_store.covers(calendar_id, time_min, time_max):
+            # Outside the mirrored window (or no full sync has completed)
+            return None
+
+        events = self.event_store.query(calendar_id, time_min, time_max, max_results)
+        log_msg = f"Event cache list query - calendarId={calendar_id}, timeMin={time_min}, timeMax={time_max}, results={len(events)} events"
+        logger.info(log_msg)
+        print(f"[CALENDAR_CLIENT] {log_msg}")
+        return events
+
     @staticmethod
     def _format_event(event: Dict[str, Any]) -> Dict[str, Any]:
         """Format a single event for response"""
@@ -0,0 +1,364 @@
+"""
+Local SQLite store of calendar events
+Mirrors each calendar via incremental sync and answers range queries locally
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from zoneinfo import ZoneInfo
+
+CALENDAR_CACHE_ENABLED = os.getenv("CALENDAR_CACHE_ENABLED", "1") == "1"
+CALENDAR_CACHE_PATH = os.getenv(
+    "CALENDAR_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "alena", "calendar-events.sqlite3"),
+)
+# Seconds a synced calendar is served without asking the API for changes
+CALENDAR_SYNC_INTERVAL = float(os.getenv("CALENDAR_SYNC_INTERVAL", "60"))
+# Days before and after today mirrored by a full sync (0 = no limit); queries
+# reaching outside that window are sent to the API
+CALENDAR_SYNC_DAYS_BACK = float(os.getenv("CALENDAR_SYNC_DAYS_BACK", "30"))
+CALENDAR_SYNC_DAYS_AHEAD = float(os.getenv("CALENDAR_SYNC_DAYS_AHEAD", "365"))
+
+# Bumped when the schema changes; older caches are dropped and resynced
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS events_by_start ON events (calendar_id, start_ts);
+CREATE TABLE IF NOT EXISTS calendars (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    synced_at REAL NOT NULL,
+    max_span REAL NOT NULL DEFAULT 0,
+    window_start REAL,
+    window_end REAL
+);
+"""
+
+SyncWindow = Tuple[Optional[float], Optional[float]]
+
+
+def _to_timestamp(value: Optional[str]) -> Optional[float]:
+    """Convert an RFC3339 timestamp to epoch seconds"""
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def event_bounds(event: Dict[str, Any], tz: ZoneInfo) -> Optional[Tuple[float, float]]:
+    """
+    Get the time span an event occupies
+
+    Args:
+        event: Event resource from the Calendar API
+        tz: Timezone all-day events are anchored in
+
+    Returns:
+        (start, end) in epoch seconds, or None if the event has no usable times
+    """
+
+    def bound(field: Dict[str, Any]) -> Optional[float]:
+        if field.get("dateTime"):
+            return _to_timestamp(field["dateTime"])
+        if field.get("date"):
+            day = datetime.fromisoformat(field["date"])
+            return day.replace(tzinfo=tz).timestamp()
+        return None
+
+    try:
+        start = bound(event.get("start") or {})
+        end = bound(event.get("end") or {})
+    except ValueError:
+        return None
+    if start is None:
+        return None
+    return start, max(end if end is not None else start, start)
+
+
+class EventStore:
+    """
+    Per-calendar event mirror kept in SQLite
+
+    Events are indexed by (calendar, start). Alongside each calendar's sync
+    token the store keeps the longest event span it has seen, so a range
+    query only scans events starting within ``max_span`` before the range
+    instead of the calendar's whole history, and the time window the last
+    full sync covered. Calendars are kept per account, so two accounts'
+    "primary" calendars never share events or a sync token.
+    """
+
+    def __init__(self, path: str, timezone_name: str = "UTC", account: str = ""):
+        """
+        Open (or create) the store
+
+        Args:
+            path: SQLite database file, or ":memory:"
+            timezone_name: IANA timezone all-day events are anchored in
+            account: Identifies the signed-in account the calendars belong to
+        """
+        self.account = account
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        try:
+            self.tz = ZoneInfo(timezone_name)
+        except Exception:
+            self.tz = ZoneInfo("UTC")
+        # The client may be created on a warm-up thread and used on another
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                # Only a cache: drop it rather than migrate
+                self._conn.executescript(
+                    "DROP TABLE IF EXISTS events; DROP TABLE IF EXISTS calendars;"
+                )
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.executescript(_SCHEMA)
+
+    def sync_state(self, calendar_id: str) -> Optional[Tuple[Optional[str], float]]:
+        """
+        Get the sync token and last sync time of a calendar
+
+        Returns:
+            (sync_token, synced_at), or None if the calendar was never synced
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sync_token, synced_at FROM calendars WHERE calendar_id = ?",
+                (self._key(calendar_id),),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def is_fresh(self, calendar_id: str, max_age: float) -> bool:
+        """Whether the calendar was synced less than ``max_age`` seconds ago"""
+        state = self.sync_state(calendar_id)
+        return state is not None and time.time() - state[1] < max_age
+
+    def covers(
+        self, calendar_id: str, time_min: Optional[str], time_max: Optional[str]
+    ) -> bool:
+        """Whether the mirrored window of a synced calendar contains the range"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT window_start, window_end FROM calendars WHERE calendar_id = ?",
+                (self._key(calendar_id),),
+            ).fetchone()
+        if row is None:
+            return False
+        lower = _to_timestamp(time_min)
+        upper = _to_timestamp(time_max)
+        window_start, window_end = row
+        if window_start is not None and (lower is None or lower < window_start):
+            return False
+        if window_end is not None and (upper is None or upper > window_end):
+            return False
+        return True
+
+    def apply_sync(
+        self,
+        calendar_id: str,
+        events: Iterable[Dict[str, Any]],
+        sync_token: Optional[str],
+        full: bool,
+        window: SyncWindow = (None, None),
+    ) -> None:
+        """
+        Store the result of a sync in one step
+
+        Args:
+            calendar_id: Calendar the events belong to
+            events: Changed events; cancelled ones are removed
+            sync_token: nextSyncToken to resume from
+            full: Whether this was a full sync replacing everything stored
+            window: (start, end) epoch seconds a full sync covered (None = open)
+        """
+        if full:
+            self.begin_full_sync(calendar_id)
+        max_span = self.apply_changes(calendar_id, events)
+        self.finish_sync(calendar_id, sync_token, max_span, window if full else None)
+
+    def begin_full_sync(self, calendar_id: str) -> None:
+        """
+        Forget a calendar before a full sync refills it page by page
+
+        Until ``finish_sync`` records the new token the calendar counts as
+        never synced, so an interrupted sync is never served from.
+        """
+        key = self._key(calendar_id)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events WHERE calendar_id = ?", (key,))
+            self._conn.execute("DELETE FROM calendars WHERE calendar_id = ?", (key,))
+
+    def apply_changes(
+        self, calendar_id: str, events: Iterable[Dict[str, Any]]
+    ) -> float:
+        """
+        Write one page of synced events
+
+        Returns:
+            The longest span among the stored events (0 if none)
+        """
+        key = self._key(calendar_id)
+        max_span = 0.0
+        with self._lock, self._conn:
+            for event in events:
+                span = self._write(key, event)
+                if span is not None:
+                    max_span = max(max_span, span)
+        return max_span
+
+    def finish_sync(
+        self,
+        calendar_id: str,
+        sync_token: Optional[str],
+        max_span: float,
+        window: Optional[SyncWindow] = None,
+    ) -> None:
+        """
+        Record a completed sync
+
+        Args:
+            calendar_id: Calendar that was synced
+            sync_token: nextSyncToken to resume from
+            max_span: Longest event span written by the sync
+            window: Window of a full sync; None keeps the stored one
+        """
+        window_start, window_end = window or (None, None)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO calendars "
+                "(calendar_id, sync_token, synced_at, max_span, window_start, window_end) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (calendar_id) DO UPDATE SET "
+                "sync_token = excluded.sync_token, synced_at = excluded.synced_at, "
+                "max_span = MAX(max_span, excluded.max_span)",
+                (
+                    self._key(calendar_id),
+                    sync_token,
+                    time.time(),
+                    max_span,
+                    window_start,
+                    window_end,
+                ),
+            )
+
+    def upsert_event(self, calendar_id: str, event: Dict[str, Any]) -> None:
+        """Write through an event the client just created or changed"""
+        key = self._key(calendar_id)
+        with self._lock, self._conn:
+            span = self._write(key, event)
+            if span is not None:
+                self._conn.execute(
+                    "UPDATE calendars SET max_span = MAX(max_span, ?) "
+                    "WHERE calendar_id = ?",
+                    (span, key),
+                )
+
+    def delete_event(self, calendar_id: str, event_id: str) -> None:
+        """Drop an event the client just deleted"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM events WHERE calendar_id = ? AND event_id = ?",
+                (self._key(calendar_id), event_id),
+            )
+
+    def query(
+        self,
+        calendar_id: str,
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        max_results: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List stored events overlapping a time range, ordered by start
+
+        Args:
+            calendar_id: Calendar ID
+            time_min: RFC3339 lower bound (exclusive bound on event end)
+            time_max: RFC3339 upper bound (exclusive bound on event start)
+            max_results: Maximum number of events to return
+
+        Returns:
+            Event resources as returned by the Calendar API
+        """
+        lower = _to_timestamp(time_min)
+        upper = _to_timestamp(time_max)
+        key = self._key(calendar_id)
+        sql = "SELECT data FROM events WHERE calendar_id = ?"
+        params: List[Any] = [key]
+
+        with self._lock:
+            if lower is not None:
+                row = self._conn.execute(
+                    "SELECT max_span FROM calendars WHERE calendar_id = ?",
+                    (key,),
+                ).fetchone()
+                max_span = row[0] if row else 0.0
+                # Nothing starting earlier than this can still be running
+                sql += " AND start_ts >= ? AND end_ts > ?"
+                params += [lower - max_span, lower]
+            if upper is not None:
+                sql += " AND start_ts < ?"
+                params.append(upper)
+            sql += " ORDER BY start_ts, event_id"
+            if max_results:
+                sql += " LIMIT ?"
+                params.append(max_results)
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _key(self, calendar_id: str) -> str:
+        """Row key of a calendar, scoped to the account"""
+        return f"{self.account}/{calendar_id}" if self.account else calendar_id
+
+    def _write(self, key: str, event: Dict[str, Any]) -> Optional[float]:
+        """Upsert or remove one event; return its span if it was stored"""
+        event_id = event.get("id")
+        if not event_id:
+            return None
+        bounds = event_bounds(event, self.tz)
+        if event.get("status") == "cancelled" or bounds is None:
+            self._conn.execute(
+                "DELETE FROM events WHERE calendar_id = ? AND event_id = ?",
+                (key, event_id),
+            )
+            return None
+        start_ts, end_ts = bounds
+        self._conn.execute(
+            "INSERT OR REPLACE INTO events "
+            "(calendar_id, event_id, start_ts, end_ts, data) VALUES (?, ?, ?, ?, ?)",
+            (key, event_id, start_ts, end_ts, json.dumps(event)),
+        )
+        return end_ts - start_ts
+
+
+def build_event_store(
+    timezone_name: str = "UTC", account: str = ""
+) -> Optional[EventStore]:
+    """Create the configured event store, or None if caching is disabled"""
+    if not CALENDAR_CACHE_ENABLED:
+        return None
+    return EventStore(CALENDAR_CACHE_PATH, timezone_name, account)
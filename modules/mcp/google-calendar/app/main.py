@@ -3,7 +3,9 @@ Google Calendar MCP Server
 Main entry point for the MCP server
 """
 
-from app.tools import mcp
+from app.tools import mcp, warm_up_calendar_client
 
 if __name__ == "__main__":
+    # Build the calendar client while the MCP handshake is in progress
+    warm_up_calendar_client()
     mcp.run()
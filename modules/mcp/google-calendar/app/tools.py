@@ -55,9 +55,12 @@ def load_env_file():
 # Load .env file at module initialization
 load_env_file()
 
+import threading
 from mcp.server.fastmcp import FastMCP
-from calendar_client import GoogleCalendarClient
-from typing import Optional, List
+from typing import TYPE_CHECKING, Any, Dict, Optional, List
+
+if TYPE_CHECKING:
+    from calendar_client import GoogleCalendarClient
 
 # Configure logging
 logging.basicConfig(
@@ -68,12 +71,42 @@ logger = logging.getLogger(__name__)
 # Initialize MCP server
 mcp = FastMCP("google-calendar-mcp")
 
-# Initialize calendar client
-try:
-    calendar_client = GoogleCalendarClient()
-except Exception as e:
-    print(f"Warning: Could not initialize calendar client: {e}")
-    calendar_client = None
+# Upper bound on events listed when the caller gives no max_results
+CALENDAR_LIST_LIMIT = int(os.getenv("CALENDAR_LIST_LIMIT", "250"))
+
+# Calendar client, built on first use so the server can answer MCP
+# initialize without loading the Google libraries, tokens or discovery document
+calendar_client: Optional["GoogleCalendarClient"] = None
+_calendar_client_lock = threading.Lock()
+
+
+def get_calendar_client() -> Optional["GoogleCalendarClient"]:
+    """
+    Return the shared calendar client, creating it on first use
+
+    Returns:
+        The client, or None if it could not be initialized (retried on the next call)
+    """
+    global calendar_client
+    if calendar_client is not None:
+        return calendar_client
+    with _calendar_client_lock:
+        if calendar_client is None:
+            try:
+                from calendar_client import GoogleCalendarClient
+
+                calendar_client = GoogleCalendarClient()
+            except Exception as e:
+                logger.error(f"Could not initialize calendar client: {e}")
+                print(f"Warning: Could not initialize calendar client: {e}")
+    return calendar_client
+
+
+def warm_up_calendar_client() -> None:
+    """Start creating the calendar client in the background"""
+    threading.Thread(
+        target=get_calendar_client, name="calendar-client-warmup", daemon=True
+    ).start()
 
 
 @mcp.tool()
@@ -81,7 +114,7 @@ def google_list_events(
     calendar_id: str = "primary",
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    max_results: int = 10,
+    max_results: Optional[int] = None,
 ) -> str:
     """
     List events from a Google Calendar within a date range.
@@ -90,7 +123,8 @@ def google_list_events(
         calendar_id: The calendar ID to list events from (default: "primary")
         start_date: Start date in ISO format (YYYY-MM-DD). If not provided, uses today.
         end_date: End date in ISO format (YYYY-MM-DD). If not provided, uses today + 7 days.
-        max_results: Maximum number of events to return (default: 10)
+        max_results: Maximum number of events to return (default: all events in the
+            range, up to CALENDAR_LIST_LIMIT)
 
     Returns:
         A list of events with their details (id, summary, start, end, description, attendees)
@@ -103,28 +137,23 @@ def google_list_events(
     logger.info(log_msg)
     print(f"[MCP_TOOL] {log_msg}")
 
-    if not calendar_client:
+    client = get_calendar_client()
+    if not client:
         logger.error("Calendar client not initialized")
         return "Error: Calendar client not initialized"
 
+    if not max_results or max_results <= 0:
+        max_results = CALENDAR_LIST_LIMIT
+
     try:
-        events = calendar_client.list_events(
+        # Events are streamed page by page and grouped as they arrive
+        events = client.iter_events(
             calendar_id=calendar_id,
             start_date=start_date,
             end_date=end_date,
-            max_results=max_results,
+            limit=max_results,
         )
 
-        if isinstance(events, dict) and "error" in events:
-            logger.error(f"Error listing events: {events['error']}")
-            return f"Error: {events['error']}"
-
-        if not events:
-            logger.info("No events found in the specified date range")
-            return "No events found in the specified date range."
-
-        logger.info(f"Found {len(events)} events")
-
         # Group events by date in user's timezone
         from datetime import datetime
         from collections import defaultdict
@@ -144,7 +173,9 @@ def google_list_events(
             tz_name = "UTC"
 
         events_by_date = defaultdict(list)
+        event_count = 0
         for event in events:
+            event_count += 1
             start = event.get("start")
             if start:
                 # Parse UTC timestamp and convert to user's timezone
@@ -173,6 +204,12 @@ def google_list_events(
 
                 events_by_date[date_str].append(event)
 
+        if not event_count:
+            logger.info("No events found in the specified date range")
+            return "No events found in the specified date range."
+
+        logger.info(f"Found {event_count} events")
+
         # Format results by date
         result = ""
 
@@ -305,12 +342,13 @@ def google_create_event(
     logger.info(log_msg)
     print(f"[MCP_TOOL] {log_msg}")
 
-    if not calendar_client:
+    client = get_calendar_client()
+    if not client:
         logger.error("Calendar client not initialized")
         return "Error: Calendar client not initialized"
 
     try:
-        event = calendar_client.create_event(
+        event = client.create_event(
             title=title,
             start_time=start_time,
             end_time=end_time,
@@ -372,12 +410,13 @@ def google_update_event(
     logger.info(log_msg)
     print(f"[MCP_TOOL] {log_msg}")
 
-    if not calendar_client:
+    client = get_calendar_client()
+    if not client:
         logger.error("Calendar client not initialized")
         return "Error: Calendar client not initialized"
 
     try:
-        event = calendar_client.update_event(
+        event = client.update_event(
             event_id=event_id,
             calendar_id=calendar_id,
             title=title,
@@ -430,14 +469,13 @@ def google_delete_event(event_id: str, calendar_id: str = "primary") -> str:
     logger.info(log_msg)
     print(f"[MCP_TOOL] {log_msg}")
 
-    if not calendar_client:
+    client = get_calendar_client()
+    if not client:
         logger.error("Calendar client not initialized")
         return "Error: Calendar client not initialized"
 
     try:
-        result = calendar_client.delete_event(
-            event_id=event_id, calendar_id=calendar_id
-        )
+        result = client.delete_event(event_id=event_id, calendar_id=calendar_id)
 
         if isinstance(result, dict) and "error" in result:
             logger.error(f"Error deleting event: {result['error']}")
@@ -448,3 +486,231 @@ def google_delete_event(event_id: str, calendar_id: str = "primary") -> str:
     except Exception as e:
         logger.exception(f"Exception in google_delete_event: {str(e)}")
         return f"Error deleting event: {str(e)}"
+
+
+def _format_batch_errors(errors: List[dict]) -> str:
+    """Format per-item failures of a batch operation"""
+    if not errors:
+        return ""
+    result = f"\n⚠️ {len(errors)} failed:\n"
+    for error in errors:
+        item = error.get("event_id") or f"item {error.get('index')}"
+        result += f"- {item}: {error.get('error')}\n"
+    return result
+
+
+@mcp.tool()
+def google_batch_create_events(
+    events: List[Dict[str, Any]], calendar_id: str = "primary"
+) -> str:
+    """
+    Create many events in a Google Calendar in one batched request.
+
+    Args:
+        events: Events to create; each has title, start_time and end_time in ISO format
+            (YYYY-MM-DDTHH:MM:SS) and optionally description and attendees (list of emails)
+        calendar_id: The calendar ID to create the events in (default: "primary")
+
+    Returns:
+        The created events with their IDs, and any events that failed
+    """
+    # Handle empty calendar_id
+    if not calendar_id or calendar_id.strip() == "":
+        calendar_id = "primary"
+
+    log_msg = f"google_batch_create_events called - count={len(events)}, calendar_id={calendar_id}"
+    logger.info(log_msg)
+    print(f"[MCP_TOOL] {log_msg}")
+
+    client = get_calendar_client()
+    if not client:
+        logger.error("Calendar client not initialized")
+        return "Error: Calendar client not initialized"
+
+    try:
+        outcome = client.batch_create_events(events=events, calendar_id=calendar_id)
+
+        result = f"✅ Created {len(outcome['created'])} of {len(events)} events\n\n"
+        for event in outcome["created"]:
+            result += f"- **{event.get('summary')}**\n"
+            result += f"  ID: {event.get('id')}\n"
+            result += f"  Start: {event.get('start')}\n"
+            result += f"  End: {event.get('end')}\n"
+        result += _format_batch_errors(outcome["errors"])
+
+        logger.info(f"TOOL_RESPONSE: {result}")
+        print(f"[MCP_TOOL_RESPONSE] {result}")
+        return result
+    except Exception as e:
+        logger.exception(f"Exception in google_batch_create_events: {str(e)}")
+        return f"Error creating events: {str(e)}"
+
+
+@mcp.tool()
+def google_batch_update_events(
+    updates: List[Dict[str, Any]], calendar_id: str = "primary"
+) -> str:
+    """
+    Update or reschedule many events in a Google Calendar in one batched request.
+
+    Args:
+        updates: Changes to apply; each has event_id and any of title, description,
+            start_time and end_time (ISO format YYYY-MM-DDTHH:MM:SS). Only the given
+            fields are changed.
+        calendar_id: The calendar ID containing the events (default: "primary")
+
+    Returns:
+        The updated events, and any events that failed
+    """
+    # Handle empty calendar_id
+    if not calendar_id or calendar_id.strip() == "":
+        calendar_id = "primary"
+
+    log_msg = f"google_batch_update_events called - count={len(updates)}, calendar_id={calendar_id}"
+    logger.info(log_msg)
+    print(f"[MCP_TOOL] {log_msg}")
+
+    client = get_calendar_client()
+    if not client:
+        logger.error("Calendar client not initialized")
+        return "Error: Calendar client not initialized"
+
+    try:
+        outcome = client.batch_update_events(updates=updates, calendar_id=calendar_id)
+
+        result = f"✅ Updated {len(outcome['updated'])} of {len(updates)} events\n\n"
+        for event in outcome["updated"]:
+            result += f"- **{event.get('summary')}**\n"
+            result += f"  ID: {event.get('id')}\n"
+            result += f"  Start: {event.get('start')}\n"
+            result += f"  End: {event.get('end')}\n"
+        result += _format_batch_errors(outcome["errors"])
+
+        logger.info(f"TOOL_RESPONSE: {result}")
+        print(f"[MCP_TOOL_RESPONSE] {result}")
+        return result
+    except Exception as e:
+        logger.exception(f"Exception in google_batch_update_events: {str(e)}")
+        return f"Error updating events: {str(e)}"
+
+
+@mcp.tool()
+def google_batch_delete_events(
+    event_ids: List[str], calendar_id: str = "primary"
+) -> str:
+    """
+    Delete many events from a Google Calendar in one batched request.
+
+    Args:
+        event_ids: IDs of the events to delete
+        calendar_id: The calendar ID containing the events (default: "primary")
+
+    Returns:
+        Confirmation of the deleted events, and any events that failed
+    """
+    # Handle empty calendar_id
+    if not calendar_id or calendar_id.strip() == "":
+        calendar_id = "primary"
+
+    log_msg = f"google_batch_delete_events called - count={len(event_ids)}, calendar_id={calendar_id}"
+    logger.info(log_msg)
+    print(f"[MCP_TOOL] {log_msg}")
+
+    client = get_calendar_client()
+    if not client:
+        logger.error("Calendar client not initialized")
+        return "Error: Calendar client not initialized"
+
+    try:
+        outcome = client.batch_delete_events(
+            event_ids=event_ids, calendar_id=calendar_id
+        )
+
+        result = f"✅ Deleted {len(outcome['deleted'])} events\n"
+        result += _format_batch_errors(outcome["errors"])
+
+        logger.info(f"TOOL_RESPONSE: {result}")
+        print(f"[MCP_TOOL_RESPONSE] {result}")
+        return result
+    except Exception as e:
+        logger.exception(f"Exception in google_batch_delete_events: {str(e)}")
+        return f"Error deleting events: {str(e)}"
+
+
+@mcp.tool()
+def google_find_free_slots(
+    duration_minutes: int,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    calendar_ids: Optional[List[str]] = None,
+    working_hours_start: str = "09:00",
+    working_hours_end: str = "18:00",
+    include_weekends: bool = False,
+    max_slots: int = 5,
+) -> str:
+    """
+    Find free time slots across one or more Google Calendars.
+
+    Args:
+        duration_minutes: Length of the meeting in minutes
+        start_date: First day to search in ISO format (YYYY-MM-DD). If not provided, starts now.
+        end_date: Last day to search in ISO format (YYYY-MM-DD). If not provided, searches 7 days.
+        calendar_ids: Calendars that must all be free (default: ["primary"])
+        working_hours_start: Earliest slot start each day (HH:MM, default: "09:00")
+        working_hours_end: Latest slot end each day (HH:MM, default: "18:00")
+        include_weekends: Also search Saturdays and Sundays (default: False)
+        max_slots: Maximum number of slots to return (default: 5)
+
+    Returns:
+        Ranked list of free slots, best first
+    """
+    log_msg = f"google_find_free_slots called - duration_minutes={duration_minutes}, start_date={start_date}, end_date={end_date}, calendar_ids={calendar_ids}"
+    logger.info(log_msg)
+    print(f"[MCP_TOOL] {log_msg}")
+
+    if duration_minutes <= 0:
+        return "Error: duration_minutes must be positive"
+
+    client = get_calendar_client()
+    if not client:
+        logger.error("Calendar client not initialized")
+        return "Error: Calendar client not initialized"
+
+    try:
+        outcome = client.find_free_slots(
+            duration_minutes=duration_minutes,
+            start_date=start_date,
+            end_date=end_date,
+            calendar_ids=[c for c in (calendar_ids or []) if c and c.strip()],
+            day_start=working_hours_start,
+            day_end=working_hours_end,
+            include_weekends=include_weekends,
+            max_slots=max_slots,
+        )
+
+        if "error" in outcome:
+            logger.error(f"Error finding free slots: {outcome['error']}")
+            return f"Error: {outcome['error']}"
+
+        tz_name = outcome["timezone"]
+        slots = outcome["slots"]
+        if not slots:
+            result = (
+                f"No free {duration_minutes}-minute slots found in the specified range."
+            )
+        else:
+            result = f"Free {duration_minutes}-minute slots ({tz_name}), best first:\n"
+            for i, slot in enumerate(slots, 1):
+                result += f"{i}. {slot.start.strftime('%a %d %b %Y %H:%M')} – {slot.end.strftime('%H:%M')}"
+                if slot.back_to_back:
+                    result += " (back-to-back)"
+                result += "\n"
+        for error in outcome["errors"]:
+            result += f"\n⚠️ Could not read {error['calendar_id']}: {error['error']}"
+
+        logger.info(f"TOOL_RESPONSE: {result}")
+        print(f"[MCP_TOOL_RESPONSE] {result}")
+        return result.rstrip()
+    except Exception as e:
+        logger.exception(f"Exception in google_find_free_slots: {str(e)}")
+        return f"Error finding free slots: {str(e)}"
@@ -12,6 +12,14 @@ app_dir = os.path.join(os.path.dirname(__file__), "..", "app")
 sys.path.insert(0, app_dir)
 
 
+@pytest.fixture(autouse=True)
+def disable_event_store(monkeypatch):
+    """Keep clients built by tests from opening the user's event cache"""
+    import event_store
+
+    monkeypatch.setattr(event_store, "CALENDAR_CACHE_ENABLED", False)
+
+
 @pytest.fixture
 def mock_service():
     """Mock Google Calendar API service"""
@@ -0,0 +1,159 @@
+"""
+Unit tests for free slot search
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+import os
+import sys
+
+# Add app directory to path
+app_dir = os.path.join(os.path.dirname(__file__), "..", "app")
+sys.path.insert(0, app_dir)
+
+from availability import find_free_slots, merge_intervals
+
+TZ = ZoneInfo("Asia/Singapore")
+
+
+def _at(day, hour, minute=0):
+    # 2025-01-20 is a Monday
+    return datetime(2025, 1, day, hour, minute, tzinfo=TZ)
+
+
+class TestMergeIntervals:
+    """Tests for merge_intervals"""
+
+    def test_merges_overlapping_and_touching(self):
+        merged = merge_intervals(
+            [
+                (_at(20, 13), _at(20, 14)),
+                (_at(20, 9), _at(20, 10)),
+                (_at(20, 9, 30), _at(20, 11)),
+                (_at(20, 11), _at(20, 12)),
+                (_at(20, 15), _at(20, 15)),
+            ]
+        )
+
+        assert merged == [(_at(20, 9), _at(20, 12)), (_at(20, 13), _at(20, 14))]
+
+
+class TestFindFreeSlots:
+    """Tests for find_free_slots"""
+
+    def test_one_slot_per_gap_with_buffers(self):
+        busy = [
+            (_at(20, 9), _at(20, 10)),
+            # Same meeting seen on a second calendar, in UTC
+            (_at(20, 9).astimezone(timezone.utc), _at(20, 10).astimezone(timezone.utc)),
+            (_at(20, 11), _at(20, 17)),
+        ]
+
+        slots = find_free_slots(busy, _at(20, 0), _at(21, 0), timedelta(minutes=30), TZ)
+
+        assert [(s.start, s.end, s.back_to_back) for s in slots] == [
+            (_at(20, 10, 15), _at(20, 10, 45), False),
+            (_at(20, 17, 15), _at(20, 17, 45), False),
+        ]
+        assert slots[0].start.tzinfo == TZ
+
+    def test_tight_gap_is_ranked_after_buffered_one(self):
+        busy = [(_at(20, 9), _at(20, 10)), (_at(20, 10, 30), _at(20, 17))]
+
+        slots = find_free_slots(busy, _at(20, 0), _at(21, 0), timedelta(minutes=30), TZ)
+
+        # 10:00-10:30 only fits back-to-back, so the later buffered slot wins
+        assert [s.start for s in slots] == [_at(20, 17, 15), _at(20, 10)]
+        assert [s.back_to_back for s in slots] == [False, True]
+
+    def test_skips_weekends_and_respects_window_and_limit(self):
+        slots = find_free_slots(
+            [],
+            _at(24, 16, 50),  # Friday afternoon
+            _at(28, 0),
+            timedelta(hours=1),
+            TZ,
+            day_start=time(9),
+            day_end=time(18),
+            max_slots=2,
+        )
+
+        # Friday 17:00-18:00, then Monday morning
+        assert [s.start for s in slots] == [_at(24, 17), _at(27, 9)]
+
+    def test_no_room_returns_nothing(self):
+        busy = [(_at(20, 8), _at(20, 19))]
+
+        assert (
+            find_free_slots(busy, _at(20, 0), _at(21, 0), timedelta(minutes=15), TZ)
+            == []
+        )
+
+
+class TestClientFindFreeSlots:
+    """Tests for GoogleCalendarClient.find_free_slots"""
+
+    def test_queries_freebusy_for_all_calendars(self, mock_calendar_client):
+        mock_calendar_client.timezone = "Asia/Singapore"
+        query = mock_calendar_client.service.freebusy.return_value.query
+        query.return_value.execute.return_value = {
+            "calendars": {
+                "primary": {
+                    "busy": [
+                        {"start": "2030-01-07T01:00:00Z", "end": "2030-01-07T09:00:00Z"}
+                    ]
+                },
+                "team@example.com": {"errors": [{"reason": "notFound"}], "busy": []},
+            }
+        }
+
+        outcome = mock_calendar_client.find_free_slots(
+            60,
+            start_date="2030-01-07",
+            end_date="2030-01-07",
+            calendar_ids=["primary", "team@example.com"],
+        )
+
+        body = query.call_args.kwargs["body"]
+        assert body["items"] == [{"id": "primary"}, {"id": "team@example.com"}]
+        assert body["timeMin"].startswith("2030-01-07T00:00:00")
+        assert body["timeMax"].startswith("2030-01-08T00:00:00")
+        # Busy 09:00-17:00 local, so the only slot is after it
+        assert [s.start.strftime("%H:%M") for s in outcome["slots"]] == ["17:00"]
+        assert outcome["errors"] == [
+            {"calendar_id": "team@example.com", "error": "notFound"}
+        ]
+
+    def test_invalid_date(self, mock_calendar_client):
+        outcome = mock_calendar_client.find_free_slots(30, start_date="next week")
+
+        assert "Invalid date" in outcome["error"]
+
+
+class TestFindFreeSlotsTool:
+    """Tests for the google_find_free_slots MCP tool"""
+
+    def test_formats_ranked_slots(self):
+        import tools
+        from availability import FreeSlot
+
+        mock_client = MagicMock()
+        mock_client.find_free_slots.return_value = {
+            "slots": [
+                FreeSlot(_at(20, 10, 15), _at(20, 10, 45)),
+                FreeSlot(_at(20, 17), _at(20, 17, 30), back_to_back=True),
+            ],
+            "timezone": "Asia/Singapore",
+            "errors": [],
+        }
+
+        with patch.object(tools, "calendar_client", mock_client):
+            result = tools.google_find_free_slots(duration_minutes=30)
+
+        assert result.splitlines() == [
+            "Free 30-minute slots (Asia/Singapore), best first:",
+            "1. Mon 20 Jan 2025 10:15 – 10:45",
+            "2. Mon 20 Jan 2025 17:00 – 17:30 (back-to-back)",
+        ]
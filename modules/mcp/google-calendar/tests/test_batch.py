@@ -0,0 +1,176 @@
+"""
+Unit tests for batched calendar mutations
+"""
+
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+import os
+import sys
+
+# Add app directory to path
+app_dir = os.path.join(os.path.dirname(__file__), "..", "app")
+sys.path.insert(0, app_dir)
+
+from googleapiclient.errors import HttpError
+
+import calendar_client
+
+
+class FakeBatch:
+    """Stand-in for BatchHttpRequest that answers each request via a handler"""
+
+    def __init__(self, callback, handler, log):
+        self.callback = callback
+        self.handler = handler
+        self.log = log
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.log.append(len(self.requests))
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, self.handler(request), None)
+            except HttpError as error:
+                self.callback(request_id, None, error)
+
+
+def _install_batch(client, handler):
+    """Route batches through FakeBatch; return the list of batch sizes sent"""
+    log = []
+    client.service.new_batch_http_request = Mock(
+        side_effect=lambda callback: FakeBatch(callback, handler, log)
+    )
+    events_api = MagicMock()
+    events_api.insert.side_effect = lambda **kw: ("insert", kw)
+    events_api.patch.side_effect = lambda **kw: ("patch", kw)
+    events_api.delete.side_effect = lambda **kw: ("delete", kw)
+    client.service.events = Mock(return_value=events_api)
+    return log, events_api
+
+
+class TestBatchMutations:
+    """Tests for batch_create_events, batch_update_events and batch_delete_events"""
+
+    def test_batch_create_splits_into_api_sized_batches(self, mock_calendar_client):
+        def handler(request):
+            _, kwargs = request
+            body = kwargs["body"]
+            return {"id": body["summary"], "summary": body["summary"], **body}
+
+        log, _ = _install_batch(mock_calendar_client, handler)
+        specs = [
+            {
+                "title": f"event-{i}",
+                "start_time": "2025-01-20T10:00:00",
+                "end_time": "2025-01-20T11:00:00",
+            }
+            for i in range(calendar_client.BATCH_LIMIT + 5)
+        ]
+
+        result = mock_calendar_client.batch_create_events(specs)
+
+        assert log == [calendar_client.BATCH_LIMIT, 5]
+        assert [e["id"] for e in result["created"]] == [s["title"] for s in specs]
+        assert result["errors"] == []
+
+    def test_batch_create_reports_invalid_and_failed_events(self, mock_calendar_client):
+        def handler(request):
+            raise HttpError(Mock(status=400), b"Bad Request")
+
+        _install_batch(mock_calendar_client, handler)
+
+        result = mock_calendar_client.batch_create_events(
+            [
+                {"title": "no times"},
+                {
+                    "title": "rejected",
+                    "start_time": "2025-01-20T10:00:00",
+                    "end_time": "2025-01-20T09:00:00",
+                },
+            ]
+        )
+
+        assert result["created"] == []
+        assert [e["index"] for e in result["errors"]] == [0, 1]
+        assert "API error" in result["errors"][1]["error"]
+
+    def test_batch_update_uses_patch(self, mock_calendar_client, sample_event):
+        log, events_api = _install_batch(
+            mock_calendar_client, lambda request: sample_event
+        )
+
+        result = mock_calendar_client.batch_update_events(
+            [
+                {"event_id": "a", "start_time": "2025-01-21T10:00:00"},
+                {"event_id": "b", "end_time": "2025-01-21T12:00:00"},
+            ]
+        )
+
+        assert log == [2]
+        assert len(result["updated"]) == 2
+        events_api.get.assert_not_called()
+        first = events_api.patch.call_args_list[0].kwargs
+        assert first["eventId"] == "a"
+        assert set(first["body"]) == {"start"}
+
+    def test_batch_update_merges_updates_of_the_same_event(
+        self, mock_calendar_client, sample_event
+    ):
+        log, events_api = _install_batch(
+            mock_calendar_client, lambda request: sample_event
+        )
+
+        result = mock_calendar_client.batch_update_events(
+            [
+                {"event_id": "a", "start_time": "2025-01-21T10:00:00"},
+                {"event_id": "b", "title": "Other"},
+                {"event_id": "a", "title": "Moved", "start_time": "2025-01-21T11:00:00"},
+            ]
+        )
+
+        assert log == [2]
+        assert len(result["updated"]) == 2
+        assert result["errors"] == []
+        first = events_api.patch.call_args_list[0].kwargs
+        assert first["eventId"] == "a"
+        assert first["body"]["summary"] == "Moved"
+        assert first["body"]["start"]["dateTime"] == "2025-01-21T11:00:00"
+
+    def test_batch_delete_reports_each_event(self, mock_calendar_client):
+        def handler(request):
+            if request[1]["eventId"] == "missing":
+                raise HttpError(Mock(status=404), b"Not Found")
+            return ""
+
+        log, _ = _install_batch(mock_calendar_client, handler)
+
+        result = mock_calendar_client.batch_delete_events(["a", "missing", "b", "a"])
+
+        assert log == [3]
+        assert result["deleted"] == ["a", "b"]
+        assert [e["event_id"] for e in result["errors"]] == ["missing"]
+
+
+class TestBatchTools:
+    """Tests for the batch MCP tools"""
+
+    def test_batch_delete_tool_lists_failures(self):
+        import tools
+
+        mock_client = MagicMock()
+        mock_client.batch_delete_events.return_value = {
+            "deleted": ["a"],
+            "errors": [{"event_id": "b", "error": "API error: Not Found"}],
+        }
+
+        with patch.object(tools, "calendar_client", mock_client):
+            result = tools.google_batch_delete_events(event_ids=["a", "b"])
+
+        assert "Deleted 1 events" in result
+        assert "- b: API error: Not Found" in result
+        mock_client.batch_delete_events.assert_called_once_with(
+            event_ids=["a", "b"], calendar_id="primary"
+        )
@@ -147,6 +147,70 @@ class TestListEvents:
         assert "error" in result
 
 
+class TestIterEvents:
+    """Tests for paginated event listing"""
+
+    def _paged(self, mock_calendar_client, pages):
+        list_mock = mock_calendar_client.service.events.return_value.list
+        list_mock.return_value.execute.side_effect = pages
+        return list_mock
+
+    def test_follows_page_tokens_until_exhausted(
+        self, mock_calendar_client, multiple_events
+    ):
+        list_mock = self._paged(
+            mock_calendar_client,
+            [
+                {"items": multiple_events[:2], "nextPageToken": "page-2"},
+                {"items": multiple_events[2:]},
+            ],
+        )
+
+        events = list(mock_calendar_client.iter_events())
+
+        assert [e["id"] for e in events] == ["event123", "event456", "event789"]
+        assert list_mock.call_count == 2
+        assert list_mock.call_args_list[0].kwargs["pageToken"] is None
+        assert list_mock.call_args_list[1].kwargs["pageToken"] == "page-2"
+
+    def test_requests_only_needed_fields(self, mock_calendar_client):
+        list_mock = self._paged(mock_calendar_client, [{"items": []}])
+
+        list(mock_calendar_client.iter_events())
+
+        fields = list_mock.call_args.kwargs["fields"]
+        assert fields.startswith("items(") and "nextPageToken" in fields
+        assert "htmlLink" in fields and "attendees(email,responseStatus)" in fields
+
+    def test_limit_stops_paging(self, mock_calendar_client, multiple_events):
+        list_mock = self._paged(
+            mock_calendar_client,
+            [
+                {"items": multiple_events[:2], "nextPageToken": "page-2"},
+                {"items": multiple_events[2:], "nextPageToken": "page-3"},
+            ],
+        )
+
+        events = mock_calendar_client.list_events(max_results=3)
+
+        assert len(events) == 3
+        assert list_mock.call_args_list[0].kwargs["maxResults"] == 3
+        assert list_mock.call_args_list[1].kwargs["maxResults"] == 1
+
+    def test_events_are_yielded_before_next_page_is_fetched(
+        self, mock_calendar_client, multiple_events
+    ):
+        list_mock = self._paged(
+            mock_calendar_client,
+            [{"items": multiple_events[:1], "nextPageToken": "page-2"}],
+        )
+
+        first = next(mock_calendar_client.iter_events())
+
+        assert first["id"] == "event123"
+        assert list_mock.call_count == 1
+
+
 class TestCreateEvent:
     """Tests for create_event functionality"""
 
@@ -244,13 +308,9 @@ class TestUpdateEvent:
 
     def test_update_event_title(self, mock_calendar_client, sample_event):
         """Test updating event title"""
-        mock_calendar_client.service.events.return_value.get.return_value.execute.return_value = (
-            sample_event
-        )
-
         updated_event = sample_event.copy()
         updated_event["summary"] = "Updated Event"
-        mock_calendar_client.service.events.return_value.update.return_value.execute.return_value = (
+        mock_calendar_client.service.events.return_value.patch.return_value.execute.return_value = (
             updated_event
         )
 
@@ -262,14 +322,10 @@ class TestUpdateEvent:
 
     def test_update_event_time(self, mock_calendar_client, sample_event):
         """Test updating event time"""
-        mock_calendar_client.service.events.return_value.get.return_value.execute.return_value = (
-            sample_event
-        )
-
         updated_event = sample_event.copy()
         updated_event["start"] = {"dateTime": "2025-01-21T14:00:00Z"}
         updated_event["end"] = {"dateTime": "2025-01-21T15:00:00Z"}
-        mock_calendar_client.service.events.return_value.update.return_value.execute.return_value = (
+        mock_calendar_client.service.events.return_value.patch.return_value.execute.return_value = (
             updated_event
         )
 
@@ -283,13 +339,9 @@ class TestUpdateEvent:
 
     def test_update_event_description(self, mock_calendar_client, sample_event):
         """Test updating event description"""
-        mock_calendar_client.service.events.return_value.get.return_value.execute.return_value = (
-            sample_event
-        )
-
         updated_event = sample_event.copy()
         updated_event["description"] = "Updated description"
-        mock_calendar_client.service.events.return_value.update.return_value.execute.return_value = (
+        mock_calendar_client.service.events.return_value.patch.return_value.execute.return_value = (
             updated_event
         )
 
@@ -301,15 +353,11 @@ class TestUpdateEvent:
 
     def test_update_event_multiple_fields(self, mock_calendar_client, sample_event):
         """Test updating multiple event fields"""
-        mock_calendar_client.service.events.return_value.get.return_value.execute.return_value = (
-            sample_event
-        )
-
         updated_event = sample_event.copy()
         updated_event["summary"] = "Updated Event"
         updated_event["description"] = "New description"
         updated_event["start"] = {"dateTime": "2025-01-21T10:00:00Z"}
-        mock_calendar_client.service.events.return_value.update.return_value.execute.return_value = (
+        mock_calendar_client.service.events.return_value.patch.return_value.execute.return_value = (
             updated_event
         )
 
@@ -324,11 +372,26 @@ class TestUpdateEvent:
         assert event["description"] == "New description"
         assert event["start"] == "2025-01-21T10:00:00Z"
 
+    def test_update_event_sends_only_changed_fields(
+        self, mock_calendar_client, sample_event
+    ):
+        """Test that updates are a single patch request"""
+        events_api = mock_calendar_client.service.events.return_value
+        events_api.patch.return_value.execute.return_value = sample_event
+
+        mock_calendar_client.update_event(event_id="event123", title="Renamed")
+
+        events_api.get.assert_not_called()
+        events_api.update.assert_not_called()
+        events_api.patch.assert_called_once_with(
+            calendarId="primary", eventId="event123", body={"summary": "Renamed"}
+        )
+
     def test_update_event_not_found(self, mock_calendar_client):
         """Test updating non-existent event"""
         from googleapiclient.errors import HttpError
 
-        mock_calendar_client.service.events.return_value.get.return_value.execute.side_effect = HttpError(
+        mock_calendar_client.service.events.return_value.patch.return_value.execute.side_effect = HttpError(
             Mock(status=404), b"Not Found"
         )
 
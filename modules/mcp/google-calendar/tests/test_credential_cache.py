@@ -0,0 +1,127 @@
+"""
+Unit tests for lazy client construction and background credential refresh
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+import os
+import sys
+
+# Add app directory to path
+app_dir = os.path.join(os.path.dirname(__file__), "..", "app")
+sys.path.insert(0, app_dir)
+
+import calendar_client
+from calendar_client import CredentialCache, GoogleCalendarClient
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _credentials(expires_in: float, refresh_token="refresh_token"):
+    creds = MagicMock()
+    creds.valid = True
+    creds.expiry = _utcnow() + timedelta(seconds=expires_in)
+    creds.refresh_token = refresh_token
+    return creds
+
+
+class TestCredentialCache:
+    """Tests for CredentialCache"""
+
+    def test_refresh_due_margin_before_expiry(self):
+        cache = CredentialCache(_credentials(3600), margin=300)
+        assert 3290 < cache.seconds_until_refresh() <= 3300
+
+    def test_no_refresh_without_refresh_token_or_expiry(self):
+        assert CredentialCache(_credentials(3600, None)).seconds_until_refresh() is None
+        assert CredentialCache(MagicMock(expiry=None)).seconds_until_refresh() is None
+
+    def test_background_refresh_persists_credentials(self):
+        creds = _credentials(1)
+        saved = threading.Event()
+
+        def refresh(request):
+            creds.expiry = _utcnow() + timedelta(hours=1)
+
+        creds.refresh.side_effect = refresh
+        cache = CredentialCache(creds, on_refresh=lambda c: saved.set(), margin=300)
+        cache.start()
+        try:
+            assert saved.wait(2)
+            creds.refresh.assert_called_once()
+            # The next refresh is scheduled against the new expiry
+            assert cache.seconds_until_refresh() > 3000
+        finally:
+            cache.close()
+
+    def test_failed_refresh_is_retried(self):
+        creds = _credentials(0)
+        creds.refresh.side_effect = RuntimeError("offline")
+        cache = CredentialCache(creds)
+        with patch.object(cache, "start") as mock_start:
+            cache._refresh_in_background()
+        mock_start.assert_called_once_with(calendar_client._REFRESH_RETRY_S)
+
+    def test_close_cancels_timer(self):
+        cache = CredentialCache(_credentials(3600))
+        cache.start()
+        cache.close()
+        assert cache._timer is None
+        cache.start()
+        assert cache._timer is None
+
+
+class TestClientConstruction:
+    """Tests for how the client builds its API service"""
+
+    def test_uses_static_discovery(self, mock_credentials):
+        with patch("calendar_client.os.path.exists", return_value=True):
+            with patch("builtins.open", create=True):
+                with patch(
+                    "calendar_client.pickle.load", return_value=mock_credentials
+                ):
+                    with patch("calendar_client.build") as mock_build:
+                        GoogleCalendarClient(token_path="token.pickle")
+
+        kwargs = mock_build.call_args.kwargs
+        assert kwargs["static_discovery"] is True
+        assert kwargs["cache_discovery"] is False
+
+
+class TestLazyClient:
+    """Tests for lazy client creation in the MCP tools module"""
+
+    def test_import_does_not_create_client(self):
+        import tools
+
+        with patch("calendar_client.GoogleCalendarClient") as mock_cls:
+            import importlib
+
+            importlib.reload(tools)
+            mock_cls.assert_not_called()
+            assert tools.calendar_client is None
+
+    def test_client_created_once_on_first_use(self):
+        import tools
+
+        with patch.object(tools, "calendar_client", None):
+            with patch("calendar_client.GoogleCalendarClient") as mock_cls:
+                first = tools.get_calendar_client()
+                second = tools.get_calendar_client()
+
+        mock_cls.assert_called_once_with()
+        assert first is second is mock_cls.return_value
+
+    def test_failed_construction_is_retried(self):
+        import tools
+
+        with patch.object(tools, "calendar_client", None):
+            with patch(
+                "calendar_client.GoogleCalendarClient",
+                side_effect=[RuntimeError("no token"), MagicMock()],
+            ):
+                assert tools.get_calendar_client() is None
+                assert tools.get_calendar_client() is not None
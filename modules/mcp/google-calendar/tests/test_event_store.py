@@ -0,0 +1,313 @@
+"""
+Unit tests for the local event store and incremental sync
+"""
+
+import pytest
+from unittest.mock import Mock, MagicMock
+import os
+import sys
+
+# Add app directory to path
+app_dir = os.path.join(os.path.dirname(__file__), "..", "app")
+sys.path.insert(0, app_dir)
+
+from googleapiclient.errors import HttpError
+
+from event_store import EventStore, event_bounds
+
+
+def _event(event_id, start, end, **extra):
+    def when(value):
+        return {"date": value} if "T" not in value else {"dateTime": value}
+
+    return {
+        "id": event_id,
+        "summary": event_id,
+        "start": when(start),
+        "end": when(end),
+        **extra,
+    }
+
+
+class FakeEvents:
+    """Stand-in for service.events() that serves scripted list pages"""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    def list(self, **kwargs):
+        self.requests.append(kwargs)
+        request = MagicMock()
+        page = self.pages.pop(0)
+        if isinstance(page, Exception):
+            request.execute.side_effect = page
+        else:
+            request.execute.return_value = page
+        return request
+
+
+def _client_with(mock_calendar_client, pages):
+    fake_events = FakeEvents(pages)
+    mock_calendar_client.service.events = Mock(return_value=fake_events)
+    mock_calendar_client.event_store = EventStore(":memory:")
+    # The fixtures are dated 2025; mirror the whole calendar
+    mock_calendar_client.sync_days_back = 0
+    mock_calendar_client.sync_days_ahead = 0
+    return fake_events
+
+
+class TestEventStore:
+    """Tests for EventStore range queries"""
+
+    def test_event_bounds_all_day_uses_timezone(self):
+        from zoneinfo import ZoneInfo
+
+        start, end = event_bounds(
+            _event("a", "2025-01-20", "2025-01-21"), ZoneInfo("Asia/Singapore")
+        )
+        assert end - start == 86400
+        assert (
+            start
+            == event_bounds(
+                _event("b", "2025-01-20T00:00:00+08:00", "2025-01-20T01:00:00+08:00"),
+                ZoneInfo("UTC"),
+            )[0]
+        )
+
+    def test_query_returns_overlapping_events_in_order(self):
+        store = EventStore(":memory:")
+        store.apply_sync(
+            "primary",
+            [
+                _event("late", "2025-01-22T10:00:00Z", "2025-01-22T11:00:00Z"),
+                _event("early", "2025-01-20T10:00:00Z", "2025-01-20T11:00:00Z"),
+                _event("before", "2025-01-10T10:00:00Z", "2025-01-10T11:00:00Z"),
+                _event("trip", "2025-01-15", "2025-01-21"),
+            ],
+            "token-1",
+            full=True,
+        )
+
+        events = store.query("primary", "2025-01-20T00:00:00Z", "2025-01-23T00:00:00Z")
+
+        assert [e["id"] for e in events] == ["trip", "early", "late"]
+        assert store.query("primary", max_results=1)[0]["id"] == "before"
+        assert store.query("other") == []
+
+    def test_incremental_sync_applies_changes_and_deletions(self):
+        store = EventStore(":memory:")
+        store.apply_sync(
+            "primary",
+            [
+                _event("a", "2025-01-20T10:00:00Z", "2025-01-20T11:00:00Z"),
+                _event("b", "2025-01-20T12:00:00Z", "2025-01-20T13:00:00Z"),
+            ],
+            "token-1",
+            full=True,
+        )
+        store.apply_sync(
+            "primary",
+            [
+                {"id": "a", "status": "cancelled"},
+                _event("b", "2025-01-21T12:00:00Z", "2025-01-21T13:00:00Z"),
+            ],
+            "token-2",
+            full=False,
+        )
+
+        events = store.query("primary")
+        assert [e["id"] for e in events] == ["b"]
+        assert events[0]["start"]["dateTime"] == "2025-01-21T12:00:00Z"
+        assert store.sync_state("primary")[0] == "token-2"
+
+    def test_calendars_are_scoped_per_account(self, tmp_path):
+        path = str(tmp_path / "events.sqlite3")
+        work = EventStore(path, account="work@example.com")
+        home = EventStore(path, account="home@example.com")
+
+        work.apply_sync(
+            "primary",
+            [_event("a", "2025-01-20T10:00:00Z", "2025-01-20T11:00:00Z")],
+            "work-token",
+            full=True,
+        )
+
+        assert [e["id"] for e in work.query("primary")] == ["a"]
+        assert home.query("primary") == []
+        assert home.sync_state("primary") is None
+
+    def test_cache_from_an_older_schema_is_dropped(self, tmp_path):
+        import sqlite3
+
+        path = str(tmp_path / "events.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE calendars (calendar_id TEXT PRIMARY KEY, "
+            "sync_token TEXT, synced_at REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO calendars VALUES ('primary', 'old', 0)")
+        conn.commit()
+        conn.close()
+
+        store = EventStore(path)
+
+        assert store.sync_state("primary") is None
+        store.apply_sync("primary", [], "token-1", full=True)
+        assert store.sync_state("primary")[0] == "token-1"
+
+
+class TestClientSync:
+    """Tests for GoogleCalendarClient with the event store enabled"""
+
+    def test_full_sync_follows_pages_then_serves_locally(self, mock_calendar_client):
+        fake_events = _client_with(
+            mock_calendar_client,
+            [
+                {
+                    "items": [
+                        _event("a", "2025-01-20T10:00:00Z", "2025-01-20T11:00:00Z")
+                    ],
+                    "nextPageToken": "page-2",
+                },
+                {
+                    "items": [
+                        _event("b", "2025-01-21T10:00:00Z", "2025-01-21T11:00:00Z")
+                    ],
+                    "nextSyncToken": "token-1",
+                },
+            ],
+        )
+
+        first = mock_calendar_client.list_events(
+            start_date="2025-01-20", end_date="2025-01-21"
+        )
+        second = mock_calendar_client.list_events(
+            start_date="2025-01-21", end_date="2025-01-21"
+        )
+
+        assert [e["id"] for e in first] == ["a", "b"]
+        assert [e["id"] for e in second] == ["a", "b"]
+        assert len(fake_events.requests) == 2
+        assert fake_events.requests[1]["pageToken"] == "page-2"
+        assert "syncToken" not in fake_events.requests[0]
+
+    def test_stale_store_syncs_incrementally(self, mock_calendar_client):
+        fake_events = _client_with(
+            mock_calendar_client,
+            [
+                {
+                    "items": [
+                        _event("a", "2025-01-20T10:00:00Z", "2025-01-20T11:00:00Z")
+                    ],
+                    "nextSyncToken": "token-1",
+                },
+                {
+                    "items": [{"id": "a", "status": "cancelled"}],
+                    "nextSyncToken": "token-2",
+                },
+            ],
+        )
+        mock_calendar_client.sync_interval = 0
+
+        assert len(mock_calendar_client.list_events()) == 1
+        assert mock_calendar_client.list_events() == []
+        assert fake_events.requests[1]["syncToken"] == "token-1"
+
+    def test_expired_sync_token_triggers_full_resync(self, mock_calendar_client):
+        fake_events = _client_with(
+            mock_calendar_client,
+            [
+                HttpError(Mock(status=410), b"Gone"),
+                {
+                    "items": [
+                        _event("c", "2025-01-20T10:00:00Z", "2025-01-20T11:00:00Z")
+                    ],
+                    "nextSyncToken": "token-9",
+                },
+            ],
+        )
+        mock_calendar_client.event_store.apply_sync(
+            "primary",
+            [_event("old", "2025-01-20T10:00:00Z", "2025-01-20T11:00:00Z")],
+            "token-1",
+            full=True,
+        )
+        mock_calendar_client.sync_interval = 0
+
+        events = mock_calendar_client.list_events()
+
+        assert [e["id"] for e in events] == ["c"]
+        assert fake_events.requests[0]["syncToken"] == "token-1"
+        assert "syncToken" not in fake_events.requests[1]
+
+    def test_mutations_update_the_store(self, mock_calendar_client, sample_event):
+        _client_with(mock_calendar_client, [{"items": [], "nextSyncToken": "t"}])
+        mock_calendar_client.list_events()
+        events_api = MagicMock()
+        mock_calendar_client.service.events = Mock(return_value=events_api)
+        events_api.insert.return_value.execute.return_value = sample_event
+
+        mock_calendar_client.create_event(
+            title="Test Event",
+            start_time="2025-01-20T14:00:00",
+            end_time="2025-01-20T15:00:00",
+        )
+        assert [e["id"] for e in mock_calendar_client.list_events()] == ["event123"]
+
+        mock_calendar_client.delete_event("event123")
+        assert mock_calendar_client.list_events() == []
+        events_api.list.assert_not_called()
+
+    def test_full_sync_is_limited_to_a_window_around_today(self, mock_calendar_client):
+        from datetime import date, datetime, timezone
+
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        start = now.isoformat().replace("+00:00", "Z")
+        fake_events = _client_with(
+            mock_calendar_client,
+            [
+                {"items": [_event("today", start, start)], "nextSyncToken": "t"},
+                {"items": []},
+            ],
+        )
+        mock_calendar_client.sync_days_back = 30
+        mock_calendar_client.sync_days_ahead = 365
+
+        today = mock_calendar_client.list_events(
+            start_date=date.today().isoformat(), end_date=date.today().isoformat()
+        )
+        mock_calendar_client.list_events(start_date="2020-01-01", end_date="2020-01-02")
+
+        assert [e["id"] for e in today] == ["today"]
+        sync, api = fake_events.requests
+        time_min = datetime.fromisoformat(sync["timeMin"].replace("Z", "+00:00"))
+        time_max = datetime.fromisoformat(sync["timeMax"].replace("Z", "+00:00"))
+        assert 29 <= (now - time_min).days <= 30
+        assert 364 <= (time_max - now).days <= 365
+        # The 2020 range is outside the mirror, so the API answers it
+        assert "syncToken" not in api and api["orderBy"] == "startTime"
+
+    def test_full_sync_stores_pages_as_they_arrive(self, mock_calendar_client):
+        fake_events = _client_with(
+            mock_calendar_client,
+            [
+                {
+                    "items": [
+                        _event("a", "2025-01-20T10:00:00Z", "2025-01-20T11:00:00Z")
+                    ],
+                    "nextPageToken": "page-2",
+                },
+                HttpError(Mock(status=500), b"Backend Error"),
+            ],
+        )
+        store = mock_calendar_client.event_store
+
+        with pytest.raises(HttpError):
+            mock_calendar_client.sync_calendar(force=True)
+
+        assert [e["id"] for e in store.query("primary")] == ["a"]
+        # An interrupted full sync is never served from
+        assert store.sync_state("primary") is None
+        assert not store.covers("primary", None, None)
+        assert len(fake_events.requests) == 2
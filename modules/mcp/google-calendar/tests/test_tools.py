@@ -393,3 +393,52 @@ class TestDeleteEventTool:
             result = tools.delete_event(event_id="event123")
 
             assert "Error deleting event:" in result
+
+
+class TestGoogleListEventsStreaming:
+    """Tests for google_list_events consuming the event pager"""
+
+    def test_groups_streamed_events_and_applies_default_limit(self, monkeypatch):
+        import tools
+
+        monkeypatch.setenv("CALENDAR_TIMEZONE", "UTC")
+        mock_client = MagicMock()
+        mock_client.iter_events.return_value = iter(
+            [
+                {
+                    "id": "a",
+                    "summary": "Standup",
+                    "start": "2025-01-20T09:00:00Z",
+                    "end": "2025-01-20T09:15:00Z",
+                },
+                {
+                    "id": "b",
+                    "summary": "Review",
+                    "start": "2025-01-21T14:00:00Z",
+                    "end": "2025-01-21T15:00:00Z",
+                },
+            ]
+        )
+
+        with patch.object(tools, "calendar_client", mock_client):
+            result = tools.google_list_events(start_date="2025-01-20")
+
+        assert "Events on 20 Jan 2025" in result
+        assert "Events on 21 Jan 2025" in result
+        assert "2. " not in result.split("Events on 21 Jan 2025")[0]
+        assert (
+            mock_client.iter_events.call_args.kwargs["limit"]
+            == tools.CALENDAR_LIST_LIMIT
+        )
+
+    def test_reports_no_events(self):
+        import tools
+
+        mock_client = MagicMock()
+        mock_client.iter_events.return_value = iter([])
+
+        with patch.object(tools, "calendar_client", mock_client):
+            result = tools.google_list_events(max_results=5)
+
+        assert result == "No events found in the specified date range."
+        assert mock_client.iter_events.call_args.kwargs["limit"] == 5
@@ -4,10 +4,18 @@ from .client import (
     OllamaConfig,
     OllamaChatClient,
     OllamaAsyncClient,
+    get_shared_client,
+    get_shared_async_client,
+    open_shared_clients,
+    close_shared_clients,
 )
 
 __all__ = [
     "OllamaConfig",
     "OllamaChatClient",
     "OllamaAsyncClient",
+    "get_shared_client",
+    "get_shared_async_client",
+    "open_shared_clients",
+    "close_shared_clients",
 ]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 import httpx
 
@@ -14,10 +17,116 @@ class OllamaConfig:
     model: str
     timeout_s: float = 120.0
     debug: bool = False
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry_s: float = 60.0
+    # How long Ollama keeps the model loaded after a request ("30m", "-1", ...)
+    keep_alive: Optional[str] = None
 
     def normalized_base_url(self) -> str:
         return self.base_url.rstrip("/")
 
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_s,
+        )
+
+
+# Process-wide connection pools, one per (base_url, limits). Ollama speaks
+# HTTP/1.1 without pipelining, so concurrency is bounded by the number of
+# pooled keep-alive connections rather than by requests per connection.
+# Async connections are bound to the loop that opened them, so async pools
+# are kept per event loop as well.
+_PoolKey = Tuple[str, int, int, float]
+_pool_lock = threading.Lock()
+_sync_clients: Dict[_PoolKey, httpx.Client] = {}
+_LoopClients = Dict[_PoolKey, httpx.AsyncClient]
+_async_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = (
+    WeakKeyDictionary()
+)
+
+
+def _pool_key(config: OllamaConfig) -> _PoolKey:
+    return (
+        config.normalized_base_url(),
+        config.max_connections,
+        config.max_keepalive_connections,
+        config.keepalive_expiry_s,
+    )
+
+
+def get_shared_client(config: OllamaConfig) -> httpx.Client:
+    key = _pool_key(config)
+    with _pool_lock:
+        client = _sync_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                timeout=httpx.Timeout(config.timeout_s), limits=config.limits()
+            )
+            _sync_clients[key] = client
+        return client
+
+
+def get_shared_async_client(config: OllamaConfig) -> httpx.AsyncClient:
+    key = _pool_key(config)
+    loop = asyncio.get_running_loop()
+    with _pool_lock:
+        # A finished asyncio.run() has already torn down its clients' transports
+        for owner_loop in [owner for owner in _async_clients if owner.is_closed()]:
+            del _async_clients[owner_loop]
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(config.timeout_s), limits=config.limits()
+            )
+            clients[key] = client
+        return client
+
+
+def _discard_async_client(
+    owner_loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient
+) -> None:
+    """Close a pooled client that belongs to a loop other than the caller's.
+
+    It can only be closed on its own loop: if that loop is still running the
+    close is scheduled there, otherwise the loop has already torn down the
+    client's transports and the client is simply dropped.
+    """
+    if owner_loop.is_running() and not owner_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), owner_loop)
+
+
+async def open_shared_clients(config: OllamaConfig) -> None:
+    """Create the pools for ``config`` up front (FastAPI startup hook)."""
+    get_shared_client(config)
+    get_shared_async_client(config)
+
+
+async def close_shared_clients() -> None:
+    """Close every pooled connection (FastAPI shutdown hook)."""
+    with _pool_lock:
+        sync_clients = list(_sync_clients.values())
+        async_entries = [
+            (owner_loop, client)
+            for owner_loop, clients in _async_clients.items()
+            for client in clients.values()
+        ]
+        _sync_clients.clear()
+        _async_clients.clear()
+
+    for client in sync_clients:
+        client.close()
+
+    loop = asyncio.get_running_loop()
+    for owner_loop, client in async_entries:
+        if owner_loop is loop:
+            await client.aclose()
+        elif not client.is_closed:
+            _discard_async_client(owner_loop, client)
+
 
 class OllamaChatClient:
     def __init__(self, config: OllamaConfig):
@@ -29,26 +138,17 @@ class OllamaChatClient:
         *,
         system_prompt: Optional[str] = None,
     ) -> str:
-        payload: Dict[str, Any] = {
-            "model": self._config.model,
-            "messages": messages,
-            "stream": False,
-        }
-        if system_prompt:
-            payload["messages"] = [
-                {"role": "system", "content": system_prompt},
-                *messages,
-            ]
+        payload = _build_chat_payload(self._config, messages, system_prompt)
 
         for attempt in range(2):
-            timeout = httpx.Timeout(self._config.timeout_s)
-            with httpx.Client(timeout=timeout) as client:
-                response = client.post(
-                    f"{self._config.normalized_base_url()}/api/chat",
-                    json=payload,
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = get_shared_client(self._config)
+            response = client.post(
+                f"{self._config.normalized_base_url()}/api/chat",
+                json=payload,
+                timeout=httpx.Timeout(self._config.timeout_s),
+            )
+            response.raise_for_status()
+            data = response.json()
 
             if self._config.debug:
                 # Avoid logging large payloads; caller can log if needed.
@@ -68,28 +168,93 @@ class OllamaAsyncClient:
     def __init__(self, config: OllamaConfig):
         self._config = config
 
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        payload = _build_chat_payload(self._config, messages, system_prompt)
+
+        for attempt in range(2):
+            data = await self.post_json("/api/chat", payload)
+
+            content = _extract_chat_content_or_tool_call(data)
+            if content:
+                return content
+
+            if attempt == 0:
+                await asyncio.sleep(0.5)
+
+        return ""
+
+    async def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        system_prompt: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
+        payload = _build_chat_payload(self._config, messages, system_prompt)
+        payload["stream"] = True
+
+        async for line in self.stream_lines("/api/chat", payload):
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(data, dict):
+                continue
+
+            message = data.get("message") or {}
+            content = message.get("content")
+            if isinstance(content, str) and content:
+                yield content
+            elif message.get("tool_calls"):
+                # Native tool calls arrive whole; surface them in the same
+                # JSON shape the non-streaming chat() returns.
+                tool_call = _extract_chat_content_or_tool_call(data)
+                if tool_call:
+                    yield tool_call
+
+            if data.get("done") is True:
+                break
+
+    async def warm_up(self, system_prompt: Optional[str] = None) -> None:
+        """Load the model and, given a system prompt, prime its prefix cache.
+
+        Ollama loads the model for an empty message list; sending the system
+        prompt with a one-token budget also leaves that prefix in the KV cache
+        so the first real request only evaluates the conversation tail.
+        """
+        payload = _build_chat_payload(self._config, [], system_prompt)
+        if system_prompt:
+            payload["options"] = {"num_predict": 1}
+        await self.post_json("/api/chat", payload)
+
     async def post_json(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        timeout = httpx.Timeout(self._config.timeout_s)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(
-                f"{self._config.normalized_base_url()}{endpoint}",
-                json=payload,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = get_shared_async_client(self._config)
+        resp = await client.post(
+            f"{self._config.normalized_base_url()}{endpoint}",
+            json=payload,
+            timeout=httpx.Timeout(self._config.timeout_s),
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def stream_lines(
         self, endpoint: str, payload: Dict[str, Any]
     ) -> AsyncGenerator[str, None]:
-        timeout = httpx.Timeout(self._config.timeout_s)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            async with client.stream(
-                "POST", f"{self._config.normalized_base_url()}{endpoint}", json=payload
-            ) as resp:
-                resp.raise_for_status()
-                async for line in resp.aiter_lines():
-                    if line:
-                        yield line
+        client = get_shared_async_client(self._config)
+        async with client.stream(
+            "POST",
+            f"{self._config.normalized_base_url()}{endpoint}",
+            json=payload,
+            timeout=httpx.Timeout(self._config.timeout_s),
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if line:
+                    yield line
 
     async def stream_generate(
         self, prompt: str, system: Optional[str] = None
@@ -101,6 +266,8 @@ class OllamaAsyncClient:
         }
         if system:
             payload["system"] = system
+        if self._config.keep_alive:
+            payload["keep_alive"] = _keep_alive_value(self._config.keep_alive)
 
         async for line in self.stream_lines("/api/generate", payload):
             try:
@@ -116,6 +283,35 @@ class OllamaAsyncClient:
                 break
 
 
+def _build_chat_payload(
+    config: OllamaConfig,
+    messages: List[Dict[str, str]],
+    system_prompt: Optional[str],
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "model": config.model,
+        "messages": messages,
+        "stream": False,
+    }
+    if system_prompt:
+        payload["messages"] = [
+            {"role": "system", "content": system_prompt},
+            *messages,
+        ]
+    if config.keep_alive:
+        payload["keep_alive"] = _keep_alive_value(config.keep_alive)
+    return payload
+
+
+def _keep_alive_value(keep_alive: str) -> Any:
+    # Ollama reads bare numbers as seconds (-1 = forever) but requires a unit
+    # on duration strings, so send numeric settings as numbers.
+    try:
+        return int(keep_alive)
+    except ValueError:
+        return keep_alive
+
+
 def _extract_chat_content_or_tool_call(data: Any) -> str:
     if not isinstance(data, dict):
         return ""
@@ -128,16 +324,22 @@ def _extract_chat_content_or_tool_call(data: Any) -> str:
 
         tool_calls = message.get("tool_calls")
         if isinstance(tool_calls, list) and tool_calls:
-            first = tool_calls[0] or {}
-            function = first.get("function") or {}
-            name = function.get("name")
-            arguments = function.get("arguments", {})
-            if name:
-                tool_payload = {
-                    "tool": name,
-                    "arguments": arguments,
-                }
-                return json.dumps(tool_payload)
+            tool_payloads = []
+            for call in tool_calls:
+                function = (call or {}).get("function") or {}
+                name = function.get("name")
+                if name:
+                    tool_payloads.append(
+                        {
+                            "tool": name,
+                            "arguments": function.get("arguments", {}),
+                        }
+                    )
+            # Several calls in one reply are returned as a JSON array.
+            if len(tool_payloads) == 1:
+                return json.dumps(tool_payloads[0])
+            if tool_payloads:
+                return json.dumps(tool_payloads)
 
     fallback = data.get("response")
     if isinstance(fallback, str) and fallback.strip():
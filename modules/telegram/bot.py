@@ -1,10 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-import io
 import logging
-import subprocess
-import tempfile
 from pathlib import Path
 from typing import Optional
 
@@ -29,100 +26,15 @@ if VOICE_ASSISTANT_BACKEND.exists():
 
 try:
     from app.config import Settings
+    from app.services.stt.models import preload_model
     from app.services.stt.whisper import WhisperSTT
 except Exception as exc:  # pragma: no cover - optional dependency path
     Settings = None  # type: ignore
     WhisperSTT = None  # type: ignore
+    preload_model = None  # type: ignore
     LOGGER.warning("Whisper backend unavailable: %s", exc)
 
 
-def _is_wav_bytes(data: bytes) -> bool:
-    return len(data) >= 12 and data[0:4] == b"RIFF" and data[8:12] == b"WAVE"
-
-
-def _ogg_to_wav_via_librosa(ogg_bytes: bytes) -> Optional[bytes]:
-    tmp_path: Optional[str] = None
-    try:
-        import numpy as np
-        from scipy.io import wavfile  # type: ignore
-        import librosa  # type: ignore
-
-        with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp:
-            tmp.write(ogg_bytes)
-            tmp.flush()
-            tmp_path = tmp.name
-
-        audio_data, sample_rate = librosa.load(tmp_path, sr=None, mono=True)
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-        wav_buffer = io.BytesIO()
-        wavfile.write(wav_buffer, sample_rate, audio_int16)
-        wav_buffer.seek(0)
-        return wav_buffer.read()
-    except Exception as exc:
-        LOGGER.debug("librosa conversion failed: %s", exc)
-        return None
-    finally:
-        if tmp_path:
-            try:
-                Path(tmp_path).unlink()
-            except Exception:
-                pass
-
-
-def _ogg_to_wav_via_ffmpeg(ogg_bytes: bytes) -> bytes:
-    with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp_in:
-        tmp_in.write(ogg_bytes)
-        tmp_in.flush()
-        input_path = tmp_in.name
-
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_out:
-        output_path = tmp_out.name
-
-    try:
-        result = subprocess.run(
-            [
-                "ffmpeg",
-                "-y",
-                "-i",
-                input_path,
-                "-ac",
-                "1",
-                "-ar",
-                "16000",
-                "-f",
-                "wav",
-                output_path,
-            ],
-            check=False,
-            capture_output=True,
-        )
-        if result.returncode != 0:
-            stderr = result.stderr.decode("utf-8", errors="ignore")
-            raise RuntimeError(f"ffmpeg conversion failed: {stderr}")
-
-        return Path(output_path).read_bytes()
-    finally:
-        try:
-            Path(input_path).unlink()
-        except Exception:
-            pass
-        try:
-            Path(output_path).unlink()
-        except Exception:
-            pass
-
-
-def ogg_opus_to_wav_bytes(ogg_bytes: bytes) -> bytes:
-    if _is_wav_bytes(ogg_bytes):
-        return ogg_bytes
-
-    wav_bytes = _ogg_to_wav_via_librosa(ogg_bytes)
-    if wav_bytes is not None:
-        return wav_bytes
-
-    return _ogg_to_wav_via_ffmpeg(ogg_bytes)
-
-
 class TelegramWhisperBot:
     def __init__(self, config: TelegramBotConfig):
         self.config = config
@@ -226,7 +138,7 @@ class TelegramWhisperBot:
 
         return ""
 
-    async def _transcribe_via_ws(self, audio_wav_bytes: bytes) -> str:
+    async def _transcribe_via_ws(self, audio_bytes: bytes) -> str:
         if not self.config.stt_ws_url:
             return ""
 
@@ -254,7 +166,7 @@ class TelegramWhisperBot:
                     pass
 
                 await ws.send('{"action":"start"}')
-                await ws.send(audio_wav_bytes)
+                await ws.send(audio_bytes)
                 await ws.send('{"action":"end"}')
 
                 while True:
@@ -354,12 +266,12 @@ class TelegramWhisperBot:
         ogg_bytes = await voice_file.download_as_bytearray()
 
         try:
-            wav_bytes = ogg_opus_to_wav_bytes(bytes(ogg_bytes))
+            # The Ogg/Opus note is sent as is; the STT side decodes it in memory
             text = ""
             if self.config.stt_ws_url:
-                text = (await self._transcribe_via_ws(wav_bytes)).strip()
+                text = (await self._transcribe_via_ws(bytes(ogg_bytes))).strip()
             if not text and self._stt is not None:
-                result = await self._stt.transcribe_wav_bytes(wav_bytes)
+                result = await self._stt.transcribe_wav_bytes(bytes(ogg_bytes))
                 text = (result.get("text") or "").strip()
         except Exception as exc:
             LOGGER.exception("Voice transcription failed")
@@ -402,6 +314,15 @@ class TelegramWhisperBot:
         )
         application.add_handler(MessageHandler(filters.VOICE, self.handle_voice))
 
+        # Voice notes are transcribed locally unless a backend URL is set; load
+        # the shared model now rather than on the first voice note
+        if (
+            self._stt is not None
+            and not self.config.stt_ws_url
+            and self._stt.settings.whisper_preload
+        ):
+            await asyncio.to_thread(preload_model, self._stt.settings)
+
         await application.initialize()
         await application.start()
         LOGGER.info("Telegram bot started")
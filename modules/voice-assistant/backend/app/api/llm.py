@@ -11,16 +11,22 @@ from modules.ollama import OllamaAsyncClient, OllamaConfig
 router = APIRouter()
 
 
-def _build_client() -> OllamaAsyncClient:
+def build_ollama_config() -> OllamaConfig:
     settings = get_settings()
-    if not settings.ollama_enabled:
-        raise HTTPException(status_code=503, detail="Ollama is disabled")
-    config = OllamaConfig(
+    return OllamaConfig(
         base_url=settings.ollama_base_url,
         model=settings.ollama_model,
         timeout_s=settings.ollama_timeout,
+        max_connections=settings.ollama_max_connections,
+        max_keepalive_connections=settings.ollama_max_keepalive_connections,
     )
-    return OllamaAsyncClient(config)
+
+
+def _build_client() -> OllamaAsyncClient:
+    settings = get_settings()
+    if not settings.ollama_enabled:
+        raise HTTPException(status_code=503, detail="Ollama is disabled")
+    return OllamaAsyncClient(build_ollama_config())
 
 
 @router.post("/api/chat")
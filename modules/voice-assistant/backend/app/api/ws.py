@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any, Dict, Optional
 
@@ -7,6 +8,9 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.config import get_settings
 from app.core.pipeline import Pipeline
+from app.services.stt.audio import is_container_bytes
+from app.services.stt.executor import STTBusyError
+from app.services.stt.streaming import StreamingTranscriber
 from app.utils.logger import get_logger
 
 router = APIRouter()
@@ -31,9 +35,32 @@ async def websocket_endpoint(ws: WebSocket) -> None:
 
     await ws.accept()
     audio_buffer = bytearray()
+    # Set per utterance while the audio is raw PCM that can be streamed
+    stream: Optional[StreamingTranscriber] = None
+    send_lock = asyncio.Lock()
 
     async def send(payload: Dict[str, Any]) -> None:
-        await ws.send_text(json.dumps(payload))
+        # Partial transcripts are sent from the streaming task
+        async with send_lock:
+            await ws.send_text(json.dumps(payload))
+
+    async def send_partial(text: str) -> None:
+        await send({"type": "stt", "event": "partial", "text": text})
+
+    async def reset_stream() -> None:
+        nonlocal stream
+        if stream is not None:
+            await stream.close()
+        stream = None
+        if settings.stt_streaming:
+            stream = StreamingTranscriber(
+                pipeline.stt,
+                on_partial=send_partial,
+                window_s=settings.stt_stream_window_s,
+                partial_interval_s=settings.stt_partial_interval_s,
+            )
+
+    await reset_stream()
 
     try:
         await send({"type": "ready"})
@@ -45,9 +72,20 @@ async def websocket_endpoint(ws: WebSocket) -> None:
                 logger.info("WebSocket disconnected")
                 return
 
+            if message.get("type") == "websocket.disconnect":
+                logger.info("WebSocket disconnected")
+                return
+
             if "bytes" in message and message["bytes"] is not None:
                 chunk: bytes = message["bytes"]
+                if stream is not None and not audio_buffer:
+                    # Containers cannot be decoded piecewise; transcribe at the end
+                    if is_container_bytes(chunk):
+                        await stream.close()
+                        stream = None
                 audio_buffer.extend(chunk)
+                if stream is not None:
+                    stream.feed(chunk)
                 logger.debug(
                     "Received audio chunk: %d bytes (total: %d bytes)",
                     len(chunk),
@@ -82,6 +120,7 @@ async def websocket_endpoint(ws: WebSocket) -> None:
 
                 if action == "start":
                     audio_buffer.clear()
+                    await reset_stream()
                     logger.info("Started receiving audio bytes")
                     await send({"type": "ack", "event": "start"})
                     continue
@@ -104,6 +143,7 @@ async def websocket_endpoint(ws: WebSocket) -> None:
                             }
                         )
                         audio_buffer.clear()
+                        await reset_stream()
                         continue
 
                     await send(
@@ -111,15 +151,34 @@ async def websocket_endpoint(ws: WebSocket) -> None:
                     )
 
                     try:
-                        result = await pipeline.run(audio_wav_bytes=bytes(audio_buffer))
+                        if stream is not None:
+                            transcript = await stream.finish()
+                            result = pipeline.from_transcript(transcript)
+                        else:
+                            result = await pipeline.run(
+                                audio_wav_bytes=bytes(audio_buffer)
+                            )
                         await send(
                             {"type": "stt", "text": result.get("transcript", "")}
                         )
+                    except STTBusyError as busy_exc:
+                        logger.warning("Refusing utterance: %s", busy_exc)
+                        await send(
+                            {
+                                "type": "stt",
+                                "text": "",
+                                "error": str(busy_exc),
+                                "busy": True,
+                            }
+                        )
+                        continue
                     except Exception as stt_exc:
                         logger.error("STT processing failed: %s", stt_exc)
                         await send({"type": "stt", "text": "", "error": str(stt_exc)})
-                        audio_buffer.clear()
                         continue
+                    finally:
+                        audio_buffer.clear()
+                        await reset_stream()
 
                     if (
                         route == "ollama"
@@ -165,9 +224,33 @@ async def websocket_endpoint(ws: WebSocket) -> None:
                             }
                         )
                         try:
-                            text = await pipeline.alena.generate(prompt=prompt)
-                            if text:
-                                await send({"type": "llm", "delta": text})
+                            text = ""
+                            streamed = ""
+                            async for event in pipeline.alena.stream_generate(
+                                prompt=prompt
+                            ):
+                                kind = event.get("type")
+                                if kind == "token":
+                                    delta = str(event.get("text") or "")
+                                    streamed += delta
+                                    await send({"type": "llm", "delta": delta})
+                                elif kind == "tool":
+                                    tool_event = {
+                                        "type": "llm",
+                                        "event": f"tool_{event.get('event')}",
+                                        "tool": event.get("tool"),
+                                    }
+                                    if event.get("message"):
+                                        tool_event["message"] = event["message"]
+                                    await send(tool_event)
+                                elif kind == "final":
+                                    text = str(event.get("response") or "")
+                                    # Answers built from tool output arrive only
+                                    # in the final event, not as tokens.
+                                    if text and not streamed:
+                                        await send({"type": "llm", "delta": text})
+                                elif kind == "error":
+                                    raise RuntimeError(event.get("message"))
                             await send({"type": "llm", "event": "end", "text": text})
                         except Exception as llm_exc:
                             logger.error("ALENA generation failed: %s", llm_exc)
@@ -198,3 +281,6 @@ async def websocket_endpoint(ws: WebSocket) -> None:
                 await ws.close(code=1011)
             except Exception:
                 pass
+    finally:
+        if stream is not None:
+            await stream.close()
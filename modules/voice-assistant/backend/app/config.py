@@ -27,12 +27,33 @@ class Settings(BaseSettings):
     whisper_model: str = "small"
     whisper_device: str = "cpu"  # cpu|cuda
     whisper_compute_type: str = "int8"  # faster-whisper compute type
+    whisper_language: str = ""  # e.g. "en"; empty = detect per utterance
+    whisper_preload: bool = True  # load the model at startup, not on first use
+    whisper_warmup: bool = True  # transcribe a silent clip after preloading
+    # LRU-unload resident models beyond this estimate (0 = no limit)
+    whisper_memory_budget_mb: int = 4096
+
+    # STT worker pool: 0 workers = one per 4 cores (1 on cuda)
+    stt_workers: int = 0
+    stt_max_queue: int = 8  # jobs allowed to wait before requests are refused
+
+    # Micro-batching: utterances arriving within the wait window share one
+    # faster-whisper batched run (max size 1 disables batching)
+    stt_batch_max_size: int = 8
+    stt_batch_max_wait_ms: int = 30
+
+    # Streaming STT: transcribe raw PCM16 while it arrives (see StreamingTranscriber)
+    stt_streaming: bool = True
+    stt_stream_window_s: float = 10.0  # committed window length
+    stt_partial_interval_s: float = 2.0  # new audio between partial hypotheses
 
     # Ollama
     ollama_enabled: bool = True
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama3.1"
     ollama_timeout: float = 120.0
+    ollama_max_connections: int = 10
+    ollama_max_keepalive_connections: int = 5
 
     # LLM routing
     llm_route: str = "ollama"  # ollama|alena
@@ -22,7 +22,11 @@ class Pipeline:
 
         if route == "ollama" and settings.ollama_enabled:
             self.ollama = OllamaClient(
-                base_url=settings.ollama_base_url, model=settings.ollama_model
+                base_url=settings.ollama_base_url,
+                model=settings.ollama_model,
+                timeout_s=settings.ollama_timeout,
+                max_connections=settings.ollama_max_connections,
+                max_keepalive_connections=settings.ollama_max_keepalive_connections,
             )
         elif route == "alena":
             self.alena = AlenaClient(
@@ -36,7 +40,11 @@ class Pipeline:
             len(audio_wav_bytes),
         )
         transcript = await self.stt.transcribe_wav_bytes(audio_wav_bytes)
-        transcript_text = transcript.get("text", "").strip()
+        return self.from_transcript(transcript.get("text", ""))
+
+    def from_transcript(self, transcript: str) -> Dict[str, Any]:
+        """Build the pipeline result for an already transcribed utterance."""
+        transcript_text = transcript.strip()
         logger.info("Pipeline: Transcription complete: %s", transcript_text)
 
         prompt = transcript_text
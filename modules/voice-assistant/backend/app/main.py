@@ -1,17 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.ws import router as ws_router
-from app.api.llm import router as llm_router
+from app.api.llm import build_ollama_config, router as llm_router
 from app.config import get_settings
+from app.services.stt.executor import get_stt_executor
+from app.services.stt.models import get_model_registry, preload_model
+from modules.ollama import close_shared_clients, open_shared_clients
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    settings = get_settings()
+    if settings.ollama_enabled:
+        await open_shared_clients(build_ollama_config())
+    if settings.whisper_preload:
+        await asyncio.to_thread(preload_model, settings)
+    yield
+    await close_shared_clients()
+    get_stt_executor().shutdown()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
 
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=_lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -25,6 +43,13 @@ def create_app() -> FastAPI:
     async def health() -> dict:
         return {"ok": True}
 
+    @app.get("/stt/stats")
+    async def stt_stats() -> dict:
+        return {
+            **get_stt_executor().stats(),
+            "models": get_model_registry().resident(),
+        }
+
     app.include_router(ws_router)
     app.include_router(llm_router)
     return app
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional
+import json
+from typing import Any, AsyncGenerator, Dict, Optional
 
 import httpx
 
@@ -28,3 +29,27 @@ class AlenaClient:
             if not isinstance(data, dict):
                 return ""
             return str(data.get("response", ""))
+
+    async def stream_generate(
+        self, prompt: str, session_id: Optional[str] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield controller events (token, tool, final, error) as they arrive."""
+        url = f"{self.base_url}/generate/stream"
+        payload = {"prompt": prompt}
+        if session_id:
+            payload["session_id"] = session_id
+
+        timeout = httpx.Timeout(self.timeout_s)
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            async with client.stream("POST", url, json=payload) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping malformed controller event: %s", line)
+                        continue
+                    if isinstance(event, dict):
+                        yield event
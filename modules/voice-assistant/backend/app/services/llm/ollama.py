@@ -6,9 +6,22 @@ from modules.ollama import OllamaAsyncClient, OllamaConfig
 
 
 class OllamaClient:
-    def __init__(self, base_url: str, model: str, timeout_s: float = 120.0):
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        timeout_s: float = 120.0,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+    ):
         self.model = model
-        config = OllamaConfig(base_url=base_url, model=model, timeout_s=timeout_s)
+        config = OllamaConfig(
+            base_url=base_url,
+            model=model,
+            timeout_s=timeout_s,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
         self._client = OllamaAsyncClient(config)
 
     async def stream_generate(
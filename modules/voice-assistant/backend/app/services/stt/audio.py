@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import io
-import tempfile
-from pathlib import Path
+import math
+import subprocess
+from functools import lru_cache
 
 import numpy as np
 
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+
 
 def is_wav_bytes(data: bytes) -> bool:
     # Minimal RIFF/WAVE sniffing
@@ -17,84 +24,156 @@ def is_webm_bytes(data: bytes) -> bool:
     return len(data) >= 4 and data[0:4] == b"\x1aE\xdf\xa3"
 
 
-def raw_pcm_to_wav(
-    pcm_data: bytes, sample_rate: int = 16000, num_channels: int = 1
-) -> bytes:
-    """Convert raw PCM audio to WAV format using scipy."""
-    from scipy.io import wavfile  # type: ignore
+def is_ogg_bytes(data: bytes) -> bool:
+    # Ogg page signature (Telegram voice notes are Ogg/Opus)
+    return len(data) >= 4 and data[0:4] == b"OggS"
 
-    # Validate we have enough data
-    if len(pcm_data) < 2:
-        raise ValueError(f"Insufficient PCM data: {len(pcm_data)} bytes")
 
-    # Convert bytes to numpy array (assume 16-bit PCM)
-    audio_array = np.frombuffer(pcm_data, dtype=np.int16)
+def is_container_bytes(data: bytes) -> bool:
+    """Whether the data is a container format rather than raw PCM16."""
+    return is_wav_bytes(data) or is_webm_bytes(data) or is_ogg_bytes(data)
+
+
+def decode_audio(data: bytes, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode audio bytes to mono float32 samples at ``sample_rate``.
+
+    WAV is parsed in memory, Ogg/WebM go through soundfile on a BytesIO or
+    an ffmpeg pipe, and anything else is taken as raw 16-bit PCM at
+    ``sample_rate``. Nothing touches the disk and no intermediate WAV is
+    written.
+    """
+    if is_wav_bytes(data):
+        audio, rate = _decode_wav(data)
+    elif is_webm_bytes(data) or is_ogg_bytes(data):
+        return _decode_container(data, sample_rate)
+    else:
+        audio, rate = _decode_raw_pcm(data), sample_rate
+    return resample(audio, rate, sample_rate)
+
 
-    # Validate audio array
-    if len(audio_array) == 0:
-        raise ValueError("Empty audio array after conversion")
+def _decode_raw_pcm(data: bytes) -> np.ndarray:
+    # Validate we have enough data
+    if len(data) < 2:
+        raise ValueError(f"Insufficient PCM data: {len(data)} bytes")
 
-    # If stereo, reshape accordingly
-    if num_channels > 1:
-        audio_array = audio_array.reshape(-1, num_channels)
+    # Assume 16-bit little-endian PCM; drop a trailing odd byte
+    samples = np.frombuffer(data[: len(data) - len(data) % 2], dtype=np.int16)
 
     # Check for completely silent or invalid audio
-    if np.all(audio_array == 0):
+    if not np.any(samples):
         raise ValueError("Audio data is completely silent (all zeros)")
 
-    # Write to bytes buffer
-    wav_buffer = io.BytesIO()
-    wavfile.write(wav_buffer, sample_rate, audio_array)
-    wav_buffer.seek(0)
-    return wav_buffer.read()
+    return samples.astype(np.float32) / 32768.0
 
 
-def webm_to_wav(webm_data: bytes) -> bytes:
-    """Convert webm/opus audio to WAV format."""
+def _decode_wav(data: bytes) -> tuple[np.ndarray, int]:
     from scipy.io import wavfile  # type: ignore
-    import librosa  # type: ignore
 
-    # Write webm data to temp file (librosa needs a file path for webm)
-    tmp_webm = tempfile.NamedTemporaryFile(
-        prefix="ws-audio-", suffix=".webm", delete=False
-    )
-    tmp_webm.write(webm_data)
-    tmp_webm.flush()
-    tmp_webm.close()
+    rate, audio = wavfile.read(io.BytesIO(data))
+    return _to_mono_float32(audio), int(rate)
+
 
+def _decode_container(data: bytes, sample_rate: int) -> np.ndarray:
     try:
-        # Load webm audio using librosa
-        audio_data, sample_rate = librosa.load(tmp_webm.name, sr=None, mono=True)
-
-        # Convert to int16
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-
-        # Export as WAV
-        wav_buffer = io.BytesIO()
-        wavfile.write(wav_buffer, sample_rate, audio_int16)
-        wav_buffer.seek(0)
-        return wav_buffer.read()
-    finally:
-        # Clean up temp file
-        try:
-            Path(tmp_webm.name).unlink()
-        except Exception:
-            pass
-
-
-def write_wav_bytes_to_tempfile(data: bytes) -> Path:
-    # If data is already WAV, use as is
-    if is_wav_bytes(data):
-        wav_data = data
-    elif is_webm_bytes(data):
-        # Convert webm to WAV
-        wav_data = webm_to_wav(data)
-    else:
-        # Assume raw PCM audio and convert to WAV
-        wav_data = raw_pcm_to_wav(data)
-
-    tmp = tempfile.NamedTemporaryFile(prefix="ws-audio-", suffix=".wav", delete=False)
-    tmp.write(wav_data)
-    tmp.flush()
-    tmp.close()
-    return Path(tmp.name)
+        import soundfile as sf  # type: ignore
+
+        audio, rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=False)
+        return resample(_to_mono_float32(audio), int(rate), sample_rate)
+    except Exception as exc:
+        # libsndfile has no WebM support and older builds no Opus
+        logger.debug("soundfile could not decode audio (%s); using ffmpeg", exc)
+    return _decode_via_ffmpeg(data, sample_rate)
+
+
+def _decode_via_ffmpeg(data: bytes, sample_rate: int) -> np.ndarray:
+    """Decode through ffmpeg pipes; it also downmixes and resamples."""
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-nostdin",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-i",
+                "pipe:0",
+                "-f",
+                "f32le",
+                "-ac",
+                "1",
+                "-ar",
+                str(sample_rate),
+                "pipe:1",
+            ],
+            input=data,
+            check=False,
+            capture_output=True,
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError(
+            "ffmpeg is required to decode this audio format but is not on PATH"
+        ) from exc
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="ignore")
+        raise RuntimeError(f"ffmpeg decoding failed: {stderr}")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def _to_mono_float32(audio: np.ndarray) -> np.ndarray:
+    # Convert to float32 and normalize if needed
+    if audio.dtype == np.int16:
+        audio = audio.astype(np.float32) / 32768.0
+    elif audio.dtype == np.int32:
+        audio = audio.astype(np.float32) / 2147483648.0
+    elif audio.dtype == np.uint8:
+        audio = (audio.astype(np.float32) - 128.0) / 128.0
+    elif audio.dtype != np.float32:
+        audio = audio.astype(np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1, dtype=np.float32)
+    return audio
+
+
+def resample(audio: np.ndarray, rate: int, target: int = SAMPLE_RATE) -> np.ndarray:
+    """Resample mono float32 audio with a polyphase filter.
+
+    44.1/48 kHz to 16 kHz reduces to small up/down factors (160/441, 1/3),
+    so scipy's ``resample_poly`` only evaluates the output samples it keeps.
+    The anti-aliasing filter for each rate pair is designed once and cached.
+    """
+    if rate == target or not len(audio):
+        return audio
+    up, down = _rate_ratio(rate, target)
+    try:
+        from scipy.signal import resample_poly  # type: ignore
+    except ImportError:
+        # Never hand Whisper audio at the wrong rate; linear is still usable
+        logger.warning(
+            "scipy not available; resampling %d Hz to %d Hz linearly", rate, target
+        )
+        positions = np.arange(int(len(audio) * up / down)) * (down / up)
+        return np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+    logger.debug("Resampling from %d Hz to %d Hz (%d/%d)", rate, target, up, down)
+    resampled = resample_poly(audio, up, down, window=_poly_filter(up, down))
+    return resampled.astype(np.float32, copy=False)
+
+
+def _rate_ratio(rate: int, target: int) -> tuple[int, int]:
+    common = math.gcd(rate, target)
+    return target // common, rate // common
+
+
+@lru_cache(maxsize=16)
+def _poly_filter(up: int, down: int) -> np.ndarray:
+    """The FIR filter resample_poly would design itself for this ratio."""
+    from scipy.signal import firwin  # type: ignore
+
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    # float32 taps keep filtering float32 audio in single precision; the
+    # cached array is shared between calls, so it is made read-only
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    taps = taps.astype(np.float32)
+    taps.setflags(write=False)
+    return taps
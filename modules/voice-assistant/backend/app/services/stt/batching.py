@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.stt.executor import STTExecutor, get_stt_executor
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BatchRunner = Callable[[List[np.ndarray]], List[Dict[str, Any]]]
+_Pending = Tuple[np.ndarray, "asyncio.Future[Dict[str, Any]]"]
+
+
+class MicroBatcher:
+    """Groups transcriptions that arrive close together into one batched run.
+
+    The first utterance for a key (model and language) opens a window of
+    ``max_wait_s``; every utterance for the same key that arrives before it
+    closes (up to ``max_batch_size``) is handed to ``run_batch`` together,
+    as a single job on the STT executor. A burst of short voice commands
+    then costs one batched decode instead of a queue of sequential ones.
+    """
+
+    def __init__(self, executor: STTExecutor, max_batch_size: int, max_wait_s: float):
+        self.executor = executor
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait_s = max(max_wait_s, 0.0)
+        self._pending: Dict[Hashable, List[_Pending]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        # Strong references to running batches until they finish
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(
+        self, key: Hashable, run_batch: BatchRunner, audio: np.ndarray
+    ) -> Dict[str, Any]:
+        """Queue ``audio`` for the batch of ``key`` and await its own result."""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Dict[str, Any]]" = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((audio, future))
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(key, run_batch)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(
+                self.max_wait_s, self._flush, key, run_batch
+            )
+        return await future
+
+    def _flush(self, key: Hashable, run_batch: BatchRunner) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        # Callers that gave up while waiting are left out of the batch
+        batch = [item for item in self._pending.pop(key, []) if not item[1].done()]
+        if batch:
+            task = asyncio.ensure_future(self._run(run_batch, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, run_batch: BatchRunner, batch: List[_Pending]) -> None:
+        try:
+            results = await self.executor.run(
+                run_batch, [audio for audio, _ in batch], label=f"batch[{len(batch)}]"
+            )
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+@lru_cache
+def get_batcher() -> Optional[MicroBatcher]:
+    """Process-wide batcher, or None when batching is disabled."""
+    settings = get_settings()
+    if settings.stt_batch_max_size <= 1:
+        return None
+    return MicroBatcher(
+        get_stt_executor(),
+        max_batch_size=settings.stt_batch_max_size,
+        max_wait_s=settings.stt_batch_max_wait_ms / 1000.0,
+    )
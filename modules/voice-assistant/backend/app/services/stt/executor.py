@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Tuple, TypeVar
+
+from app.config import Settings, get_settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Latency samples kept for the percentiles reported by stats()
+_LATENCY_WINDOW = 256
+
+
+class STTBusyError(RuntimeError):
+    """Raised when every STT worker is busy and the queue is full."""
+
+
+def resolve_workers(settings: Settings) -> int:
+    """Worker count from settings; 0 means one per 4 cores (1 on a GPU)."""
+    if settings.stt_workers > 0:
+        return settings.stt_workers
+    if settings.whisper_device != "cpu":
+        return 1
+    return max(1, (os.cpu_count() or 1) // 4)
+
+
+class STTExecutor:
+    """Bounded thread pool that runs decoding and Whisper inference.
+
+    At most ``workers`` jobs run at once and ``max_queue`` more may wait;
+    beyond that ``run`` fails fast with ``STTBusyError`` instead of letting
+    the backlog (and every caller's latency) grow. The pool is not tied to
+    an event loop, so the voice backend and the Telegram bot can share it.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="stt"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        # (queue wait, run time) of recent jobs
+        self._latencies: Deque[Tuple[float, float]] = deque(maxlen=_LATENCY_WINDOW)
+
+    async def run(self, fn: Callable[..., T], *args: Any, label: str = "stt") -> T:
+        """Run ``fn(*args)`` on a worker thread and await its result."""
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise STTBusyError(
+                    f"STT is busy ({self._pending} jobs in flight); try again shortly"
+                )
+            self._pending += 1
+
+        submitted = time.perf_counter()
+        timing: Dict[str, float] = {}
+
+        def job() -> T:
+            timing["started"] = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                timing["finished"] = time.perf_counter()
+
+        future = self._pool.submit(job)
+        # Also fires when a queued job is cancelled before it starts
+        future.add_done_callback(lambda f: self._record(f, label, submitted, timing))
+        return await asyncio.wrap_future(future)
+
+    @property
+    def idle_workers(self) -> int:
+        """Workers that would start a job submitted now without queueing it."""
+        with self._lock:
+            return max(self.workers - self._pending, 0)
+
+    def _record(
+        self, future: Future, label: str, submitted: float, timing: Dict[str, float]
+    ) -> None:
+        with self._lock:
+            self._pending -= 1
+            if "started" not in timing:
+                return
+            wait = timing["started"] - submitted
+            run = timing["finished"] - timing["started"]
+            self._latencies.append((wait, run))
+            if future.exception() is None:
+                self._completed += 1
+            else:
+                self._failed += 1
+        logger.info("STT job %s: waited %.3fs, ran %.3fs", label, wait, run)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and recent latency percentiles, in seconds."""
+        with self._lock:
+            latencies = list(self._latencies)
+            stats: Dict[str, Any] = {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._pending,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+        for name, values in (
+            ("wait", [wait for wait, _ in latencies]),
+            ("run", [run for _, run in latencies]),
+        ):
+            values.sort()
+            stats[f"{name}_p50"] = _percentile(values, 0.5)
+            stats[f"{name}_p95"] = _percentile(values, 0.95)
+        return stats
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    return round(values[min(int(len(values) * fraction), len(values) - 1)], 4)
+
+
+@lru_cache
+def get_stt_executor() -> STTExecutor:
+    """Process-wide executor shared by every WhisperSTT instance."""
+    settings = get_settings()
+    return STTExecutor(resolve_workers(settings), settings.stt_max_queue)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.config import Settings, get_settings
+from app.services.stt.executor import resolve_workers
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Approximate parameter counts (millions), used to estimate resident memory;
+# checked in order, so more specific families come first
+_MODEL_PARAMS_M = {
+    "distil-large": 756,
+    "turbo": 809,
+    "large": 1550,
+    "medium": 769,
+    "small": 244,
+    "base": 74,
+    "tiny": 39,
+}
+_BYTES_PER_PARAM = {
+    "int8": 1,
+    "int8_float16": 1,
+    "int8_float32": 1,
+    "int8_bfloat16": 1,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+}
+
+ModelKey = Tuple[str, str, str]
+
+
+@dataclass
+class LoadedModel:
+    """A Whisper model resident in this process."""
+
+    name: str
+    backend: str
+    model: Any
+    size_mb: int
+    loaded_at: float = field(default_factory=time.time)
+    # openai-whisper models are not safe to call from several threads
+    infer_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    # faster-whisper BatchedInferencePipeline, created on first batched call
+    # (False when the installed faster-whisper has none)
+    batched: Any = field(default=None, repr=False)
+
+
+def estimate_size_mb(name: str, backend: str, compute_type: str) -> int:
+    """Rough resident size of a model, from its family and weight precision."""
+    base = name.lower().replace(".en", "")
+    params = next(
+        (count for family, count in _MODEL_PARAMS_M.items() if family in base),
+        _MODEL_PARAMS_M["small"],
+    )
+    # openai-whisper keeps float32 weights regardless of compute_type
+    width = 4 if backend == "openai-whisper" else _BYTES_PER_PARAM.get(compute_type, 2)
+    return params * width
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded Whisper models.
+
+    Models are keyed by (name, device, compute_type) and loaded once, however
+    many connections or bots ask for them. When the estimated total exceeds
+    ``memory_budget_mb`` the least recently used models are unloaded; the
+    model just requested always stays, even if it alone is over budget.
+    """
+
+    def __init__(self, memory_budget_mb: int = 0, workers: int = 1):
+        self.memory_budget_mb = memory_budget_mb
+        self.workers = max(workers, 1)
+        self._models: "OrderedDict[ModelKey, LoadedModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+
+    def get(self, name: str, device: str, compute_type: str) -> LoadedModel:
+        """Return the model, loading it (and evicting others) if needed."""
+        key = (name, device, compute_type)
+        with self._lock:
+            loaded = self._models.get(key)
+            if loaded is not None:
+                self._models.move_to_end(key)
+                return loaded
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Loads of different models may overlap; the same model loads once
+        with load_lock:
+            with self._lock:
+                loaded = self._models.get(key)
+            if loaded is None:
+                loaded = self._load(name, device, compute_type)
+                with self._lock:
+                    self._models[key] = loaded
+                    self._evict(keep=key)
+        return loaded
+
+    def unload(self, name: str, device: str, compute_type: str) -> bool:
+        with self._lock:
+            return self._models.pop((name, device, compute_type), None) is not None
+
+    def resident(self) -> Dict[str, int]:
+        """Loaded model names and their estimated sizes, least recent first."""
+        with self._lock:
+            return {loaded.name: loaded.size_mb for loaded in self._models.values()}
+
+    def _evict(self, keep: ModelKey) -> None:
+        if self.memory_budget_mb <= 0:
+            return
+        total = sum(loaded.size_mb for loaded in self._models.values())
+        for key in list(self._models):
+            if total <= self.memory_budget_mb:
+                break
+            if key == keep:
+                continue
+            evicted = self._models.pop(key)
+            total -= evicted.size_mb
+            logger.info(
+                "Unloaded %s model (~%d MB) to stay within %d MB",
+                evicted.name,
+                evicted.size_mb,
+                self.memory_budget_mb,
+            )
+
+    def _load(self, name: str, device: str, compute_type: str) -> LoadedModel:
+        started = time.perf_counter()
+
+        # Prefer faster-whisper if installed
+        try:
+            from faster_whisper import WhisperModel  # type: ignore
+
+            # One CTranslate2 worker per STT thread, sharing the cores between them
+            model = WhisperModel(
+                name,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=max(1, (os.cpu_count() or 1) // self.workers),
+                num_workers=self.workers,
+            )
+            backend = "faster-whisper"
+        except Exception as exc:
+            logger.warning(
+                "faster-whisper unavailable (%s); falling back to openai-whisper", exc
+            )
+
+            # Fallback to openai-whisper
+            import whisper  # type: ignore
+
+            model = whisper.load_model(name, device=device)
+            backend = "openai-whisper"
+
+        loaded = LoadedModel(
+            name=name,
+            backend=backend,
+            model=model,
+            size_mb=estimate_size_mb(name, backend, compute_type),
+        )
+        logger.info(
+            "Loaded %s model via %s in %.2fs (~%d MB)",
+            name,
+            backend,
+            time.perf_counter() - started,
+            loaded.size_mb,
+        )
+        return loaded
+
+
+@lru_cache
+def get_model_registry() -> ModelRegistry:
+    settings = get_settings()
+    return ModelRegistry(
+        memory_budget_mb=settings.whisper_memory_budget_mb,
+        workers=resolve_workers(settings),
+    )
+
+
+def preload_model(settings: Optional[Settings] = None) -> Optional[LoadedModel]:
+    """Load the configured model ahead of the first request.
+
+    Meant to run once at startup, off the event loop. With ``whisper_warmup``
+    a second of silence is transcribed so lazy backend initialisation (CUDA
+    kernels, CTranslate2 buffers) is also paid up front. Failures are logged
+    and the model is then loaded on first use instead.
+    """
+    settings = settings or get_settings()
+    try:
+        loaded = get_model_registry().get(
+            settings.whisper_model,
+            settings.whisper_device,
+            settings.whisper_compute_type,
+        )
+        if settings.whisper_warmup:
+            started = time.perf_counter()
+            silence = np.zeros(16000, dtype=np.float32)
+            if loaded.backend == "faster-whisper":
+                segments, _ = loaded.model.transcribe(silence)
+                list(segments)
+            else:
+                with loaded.infer_lock:
+                    loaded.model.transcribe(silence)
+            logger.info(
+                "Warmed up %s in %.2fs", loaded.name, time.perf_counter() - started
+            )
+        return loaded
+    except Exception as exc:
+        logger.warning(
+            "Could not preload Whisper model %s: %s", settings.whisper_model, exc
+        )
+        return None
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+import numpy as np
+
+from app.services.stt.audio import SAMPLE_RATE
+from app.services.stt.executor import STTBusyError
+from app.services.stt.whisper import WhisperSTT
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Window cuts are placed at the quietest 100 ms frame of the window's last second
+_CUT_FRAME_S = 0.1
+_CUT_SEARCH_S = 1.0
+# Hypotheses on less audio than this are mostly noise
+_MIN_PARTIAL_S = 1.0
+
+PartialCallback = Callable[[str], Awaitable[None]]
+
+
+class StreamingTranscriber:
+    """Transcribes a raw PCM16 16 kHz stream while it is still arriving.
+
+    Audio is committed in windows of about ``window_s`` seconds, each cut at
+    a quiet point so words are not split, and its transcript is final. Every
+    ``partial_interval_s`` of new audio the uncommitted remainder is
+    transcribed as a hypothesis and passed to ``on_partial`` together with
+    the committed text. ``finish()`` then only has to transcribe the tail,
+    so the wait after the user stops talking does not grow with the length
+    of the utterance.
+    """
+
+    def __init__(
+        self,
+        stt: WhisperSTT,
+        on_partial: Optional[PartialCallback] = None,
+        window_s: float = 10.0,
+        partial_interval_s: float = 2.0,
+    ):
+        self.stt = stt
+        self.on_partial = on_partial
+        self.window = int(window_s * SAMPLE_RATE)
+        self.partial_step = int(partial_interval_s * SAMPLE_RATE)
+        self._chunks: List[np.ndarray] = []
+        self._uncommitted = 0
+        self._since_partial = 0
+        self._odd_byte = b""
+        self._committed: List[str] = []
+        self._last_partial = ""
+        self._wakeup = asyncio.Event()
+        self._finishing = False
+        self._failed = False
+        self._task: Optional[asyncio.Task] = None
+
+    def feed(self, chunk: bytes) -> None:
+        """Add raw little-endian PCM16 bytes; never blocks on transcription."""
+        data = self._odd_byte + chunk
+        usable = len(data) - (len(data) % 2)
+        self._odd_byte = data[usable:]
+        if not usable:
+            return
+        samples = np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32)
+        samples /= 32768.0
+        self._chunks.append(samples)
+        self._uncommitted += len(samples)
+        self._since_partial += len(samples)
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._worker())
+        self._wakeup.set()
+
+    async def finish(self) -> str:
+        """Wait for in-flight work, transcribe the tail, return the full text."""
+        self._finishing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+        tail = self._take(self._uncommitted)
+        if len(tail):
+            result = await self.stt.transcribe_audio(tail)
+            self._commit_text(result.get("text", ""))
+        return " ".join(self._committed).strip()
+
+    async def close(self) -> None:
+        """Abandon the stream (e.g. the client disconnected or restarted)."""
+        self._finishing = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _worker(self) -> None:
+        while not self._finishing and not self._failed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                while self._uncommitted >= self.window and not self._finishing:
+                    await self._commit_window()
+                # Partials are optional, so they only take an idle worker and
+                # never fill the queue that finals and committed windows need
+                if (
+                    not self._finishing
+                    and self._since_partial >= self.partial_step
+                    and self._uncommitted >= _MIN_PARTIAL_S * SAMPLE_RATE
+                    and self.stt.executor.idle_workers > 0
+                ):
+                    await self._emit_partial()
+            except STTBusyError:
+                # Other sessions come first; retry when more audio arrives
+                logger.debug("STT busy, deferring streamed transcription")
+            except Exception as exc:
+                # Leave the audio uncommitted; finish() transcribes it in one go
+                logger.error("Streaming STT failed, finishing without it: %s", exc)
+                self._failed = True
+
+    async def _commit_window(self) -> None:
+        audio = self._take(self._uncommitted, keep=True)
+        cut = _quiet_cut(audio[: self.window])
+        result = await self.stt.transcribe_audio(audio[:cut])
+        self._commit_text(result.get("text", ""))
+        self._take(cut)
+        logger.debug("Committed %.2fs of streamed audio", cut / float(SAMPLE_RATE))
+
+    async def _emit_partial(self) -> None:
+        self._since_partial = 0
+        audio = self._take(self._uncommitted, keep=True)
+        result = await self.stt.transcribe_audio(audio)
+        text = " ".join(self._committed + [result.get("text", "").strip()]).strip()
+        if text and text != self._last_partial and self.on_partial is not None:
+            self._last_partial = text
+            await self.on_partial(text)
+
+    def _commit_text(self, text: str) -> None:
+        text = (text or "").strip()
+        if text:
+            self._committed.append(text)
+
+    def _take(self, count: int, keep: bool = False) -> np.ndarray:
+        """Return the first ``count`` uncommitted samples, dropping them unless ``keep``."""
+        if not self._chunks:
+            return np.zeros(0, dtype=np.float32)
+        audio = (
+            self._chunks[0] if len(self._chunks) == 1 else np.concatenate(self._chunks)
+        )
+        self._chunks = [audio]
+        if keep:
+            return audio[:count]
+        rest = audio[count:]
+        self._chunks = [rest] if len(rest) else []
+        self._uncommitted = len(rest)
+        return audio[:count]
+
+
+def _quiet_cut(window: np.ndarray) -> int:
+    """Index of the quietest frame near the end of ``window`` to cut at."""
+    frame = int(_CUT_FRAME_S * SAMPLE_RATE)
+    search_start = max(len(window) - int(_CUT_SEARCH_S * SAMPLE_RATE), 0)
+    best_index = len(window)
+    best_energy = None
+    for start in range(search_start, len(window) - frame + 1, frame):
+        energy = float(np.mean(window[start : start + frame] ** 2))
+        if best_energy is None or energy < best_energy:
+            best_energy = energy
+            best_index = start + frame // 2
+    return best_index
@@ -1,83 +1,32 @@
 from __future__ import annotations
 
-import io
-from typing import Any, Dict, Optional
+import bisect
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 
 from app.config import Settings
+from app.services.stt.audio import SAMPLE_RATE, decode_audio
+from app.services.stt.batching import MicroBatcher, get_batcher
+from app.services.stt.executor import STTExecutor, get_stt_executor
+from app.services.stt.models import LoadedModel, get_model_registry
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Whisper's input window; longer utterances are split into several clips
+_MAX_CLIP = 30 * SAMPLE_RATE
+
 
 def load_audio_from_wav_bytes(wav_bytes: bytes) -> np.ndarray:
-    """Load audio from any audio format and return as numpy array."""
+    """Decode audio bytes (WAV, WebM, Ogg or raw PCM16) to 16 kHz float32."""
     try:
-        from scipy.io import wavfile  # type: ignore
-        from app.services.stt.audio import (
-            is_wav_bytes,
-            is_webm_bytes,
-            webm_to_wav,
-            raw_pcm_to_wav,
-        )
-
         logger.debug("Loading audio: input size=%d bytes", len(wav_bytes))
-
-        # Convert to WAV if needed
-        if is_webm_bytes(wav_bytes):
-            logger.debug("Detected webm format, converting to WAV")
-            wav_bytes = webm_to_wav(wav_bytes)
-            logger.debug("After webm conversion: %d bytes", len(wav_bytes))
-        elif not is_wav_bytes(wav_bytes):
-            logger.debug("Detected raw PCM, converting to WAV")
-            wav_bytes = raw_pcm_to_wav(wav_bytes)
-            logger.debug("After PCM conversion: %d bytes", len(wav_bytes))
-
-        # Read WAV file from bytes
-        sample_rate, audio_data = wavfile.read(io.BytesIO(wav_bytes))
-        logger.debug(
-            "Loaded audio: sample_rate=%d, shape=%s, dtype=%s, min=%f, max=%f",
-            sample_rate,
-            audio_data.shape,
-            audio_data.dtype,
-            float(np.min(audio_data)),
-            float(np.max(audio_data)),
-        )
-
-        # Convert to float32 and normalize if needed
-        if audio_data.dtype == np.int16:
-            audio_data = audio_data.astype(np.float32) / 32768.0
-        elif audio_data.dtype == np.int32:
-            audio_data = audio_data.astype(np.float32) / 2147483648.0
-        elif audio_data.dtype != np.float32:
-            audio_data = audio_data.astype(np.float32)
-
-        logger.debug(
-            "After normalization: min=%f, max=%f, mean=%f",
-            float(np.min(audio_data)),
-            float(np.max(audio_data)),
-            float(np.mean(audio_data)),
-        )
-
-        # Resample to 16kHz if needed (Whisper standard)
-        if sample_rate != 16000:
-            try:
-                import librosa  # type: ignore
-
-                logger.info("Resampling from %d Hz to 16000 Hz", sample_rate)
-                audio_data = librosa.resample(
-                    audio_data, orig_sr=sample_rate, target_sr=16000
-                )
-            except ImportError:
-                logger.warning(
-                    "librosa not available; using audio at original sample rate %d Hz",
-                    sample_rate,
-                )
+        audio_data = decode_audio(wav_bytes, SAMPLE_RATE)
 
         # Validate audio quality
-        audio_duration = len(audio_data) / 16000.0  # duration in seconds at 16kHz
-        audio_rms = float(np.sqrt(np.mean(audio_data**2)))
+        audio_duration = len(audio_data) / float(SAMPLE_RATE)
+        audio_rms = float(np.sqrt(np.mean(audio_data**2))) if len(audio_data) else 0.0
 
         logger.info("Audio stats: duration=%.2fs, rms=%.4f", audio_duration, audio_rms)
 
@@ -97,82 +46,159 @@ def load_audio_from_wav_bytes(wav_bytes: bytes) -> np.ndarray:
 
 
 class WhisperSTT:
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        executor: Optional[STTExecutor] = None,
+        model_name: Optional[str] = None,
+        batcher: Optional[MicroBatcher] = None,
+    ):
         self.settings = settings
-        self._backend: Optional[str] = None
-        self._model: Any = None
-
-    def _ensure_model(self) -> None:
-        if self._model is not None:
-            return
-
-        # Prefer faster-whisper if installed
-        try:
-            from faster_whisper import WhisperModel  # type: ignore
-
-            self._backend = "faster-whisper"
-            self._model = WhisperModel(
-                self.settings.whisper_model,
-                device=self.settings.whisper_device,
-                compute_type=self.settings.whisper_compute_type,
-            )
-            logger.info(
-                "Loaded %s model via %s", self.settings.whisper_model, self._backend
+        self.executor = executor or get_stt_executor()
+        self.model_name = model_name or settings.whisper_model
+        # None lets Whisper detect the language of each utterance
+        self.language = settings.whisper_language or None
+        # A batched run detects one language for all of its utterances, so
+        # utterances are only batched when the language is fixed
+        self.batcher = (batcher or get_batcher()) if self.language else None
+
+    def _get_model(self) -> LoadedModel:
+        # Shared with every other WhisperSTT in the process
+        return get_model_registry().get(
+            self.model_name,
+            self.settings.whisper_device,
+            self.settings.whisper_compute_type,
+        )
+
+    async def transcribe_wav_bytes(self, audio_wav_bytes: bytes) -> Dict[str, Any]:
+        """Decode and transcribe audio bytes on the STT executor."""
+        if self.batcher is None:
+            return await self.executor.run(
+                self._transcribe_bytes, audio_wav_bytes, label="transcribe"
             )
-            return
-        except Exception as exc:
-            logger.warning(
-                "faster-whisper unavailable (%s); falling back to openai-whisper", exc
+        # Decode on its own so the utterance can join a batch
+        audio_data = await self.executor.run(
+            load_audio_from_wav_bytes, audio_wav_bytes, label="decode"
+        )
+        return await self.transcribe_audio(audio_data)
+
+    async def transcribe_audio(self, audio_data: np.ndarray) -> Dict[str, Any]:
+        """Transcribe float32 16 kHz mono samples on the STT executor."""
+        if self.batcher is None:
+            return await self.executor.run(
+                self._transcribe, audio_data, label="transcribe_audio"
             )
+        key = (
+            self.model_name,
+            self.settings.whisper_device,
+            self.settings.whisper_compute_type,
+            self.language,
+        )
+        return await self.batcher.submit(key, self._transcribe_batch, audio_data)
+
+    def _transcribe_bytes(self, audio_wav_bytes: bytes) -> Dict[str, Any]:
+        # Load audio directly from WAV bytes instead of using file path
+        return self._transcribe(load_audio_from_wav_bytes(audio_wav_bytes))
 
-        # Fallback to openai-whisper
-        import whisper  # type: ignore
+    def _transcribe_batch(self, batch: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """Transcribe several utterances with one batched faster-whisper run."""
+        loaded = self._get_model()
+        if loaded.backend == "faster-whisper" and loaded.batched is None:
+            try:
+                from faster_whisper import BatchedInferencePipeline  # type: ignore
 
-        self._backend = "openai-whisper"
-        self._model = whisper.load_model(self.settings.whisper_model)
+                loaded.batched = BatchedInferencePipeline(model=loaded.model)
+            except ImportError:
+                logger.warning(
+                    "faster-whisper < 1.1.0 has no batched pipeline; "
+                    "transcribing utterances one by one"
+                )
+                loaded.batched = False
+        if len(batch) == 1 or not loaded.batched:
+            return [self._transcribe(audio_data) for audio_data in batch]
+
+        # Lay the utterances end to end and give the pipeline each one's span
+        # as explicit clips, so they are decoded as a batch but never merged
+        starts: List[int] = []
+        clips: List[Dict[str, int]] = []
+        offset = 0
+        for audio_data in batch:
+            starts.append(offset)
+            for start in range(0, len(audio_data), _MAX_CLIP):
+                end = min(start + _MAX_CLIP, len(audio_data))
+                clips.append({"start": offset + start, "end": offset + end})
+            offset += len(audio_data)
+
+        segments, info = loaded.batched.transcribe(
+            np.concatenate(batch),
+            language=self.language,
+            clip_timestamps=clips,
+            vad_filter=False,
+            batch_size=self.settings.stt_batch_max_size,
+        )
+        text_parts: List[List[str]] = [[] for _ in batch]
+        for seg in segments:
+            if not getattr(seg, "text", None):
+                continue
+            middle = (seg.start + seg.end) / 2 * SAMPLE_RATE
+            text_parts[max(bisect.bisect_right(starts, middle) - 1, 0)].append(seg.text)
+
+        # Batching requires a configured language, so all utterances share it
+        language = getattr(info, "language", None)
         logger.info(
-            "Loaded %s model via %s", self.settings.whisper_model, self._backend
+            "Transcribed %d utterances in one batch via %s (lang: %s, duration: %.2fs)",
+            len(batch),
+            loaded.backend,
+            language,
+            offset / float(SAMPLE_RATE),
         )
+        return [
+            {
+                "backend": loaded.backend,
+                "language": language,
+                "text": "".join(parts).strip(),
+            }
+            for parts in text_parts
+        ]
 
-    async def transcribe_wav_bytes(self, audio_wav_bytes: bytes) -> Dict[str, Any]:
-        self._ensure_model()
-
-        # Load audio directly from WAV bytes instead of using file path
-        audio_data = load_audio_from_wav_bytes(audio_wav_bytes)
+    def _transcribe(self, audio_data: np.ndarray) -> Dict[str, Any]:
+        loaded = self._get_model()
+        duration = len(audio_data) / float(SAMPLE_RATE)
 
-        if self._backend == "faster-whisper":
-            segments, info = self._model.transcribe(audio_data)
+        if loaded.backend == "faster-whisper":
+            segments, info = loaded.model.transcribe(audio_data, language=self.language)
             text_parts = []
             for seg in segments:
                 if getattr(seg, "text", None):
                     text_parts.append(seg.text)
             text = "".join(text_parts).strip()
             result = {
-                "backend": self._backend,
+                "backend": loaded.backend,
                 "language": getattr(info, "language", None),
                 "text": text,
             }
             logger.info(
-                "Transcribed audio via %s (lang: %s, audio_size: %d bytes): %s",
-                self._backend,
+                "Transcribed audio via %s (lang: %s, duration: %.2fs): %s",
+                loaded.backend,
                 result["language"],
-                len(audio_wav_bytes),
+                duration,
                 text,
             )
             return result
 
         # openai-whisper
-        result = self._model.transcribe(audio_data)
+        with loaded.infer_lock:
+            result = loaded.model.transcribe(audio_data, language=self.language)
         text = (result.get("text") or "").strip()
         logger.info(
-            "Transcribed audio via %s (lang: %s, audio_size: %d bytes): %s",
-            self._backend,
+            "Transcribed audio via %s (lang: %s, duration: %.2fs): %s",
+            loaded.backend,
             result.get("language"),
-            len(audio_wav_bytes),
+            duration,
             text,
         )
         return {
-            "backend": self._backend,
+            "backend": loaded.backend,
             "language": result.get("language"),
             "text": text,
         }
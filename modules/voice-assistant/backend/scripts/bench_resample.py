@@ -0,0 +1,86 @@
+"""Compare the backend's 16 kHz resampler with librosa.
+
+Run from the backend directory:
+
+    python scripts/bench_resample.py [--seconds 5 30 120] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.stt.audio import SAMPLE_RATE, resample  # noqa: E402
+
+RATES = (44100, 48000)
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def _candidates() -> Dict[str, Callable[[np.ndarray, int], np.ndarray]]:
+    candidates: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+        "backend (cached filter)": lambda audio, rate: resample(audio, rate),
+    }
+    try:
+        from scipy.signal import resample_poly
+
+        def uncached(audio: np.ndarray, rate: int) -> np.ndarray:
+            return resample_poly(audio, SAMPLE_RATE, rate)
+
+        candidates["resample_poly (filter per call)"] = uncached
+    except ImportError:
+        print("scipy not installed: the backend falls back to linear interpolation")
+
+    started = time.perf_counter()
+    try:
+        import librosa
+    except ImportError:
+        print("librosa not installed: skipping the librosa comparison")
+    else:
+        print(f"librosa import: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        def with_librosa(audio: np.ndarray, rate: int) -> np.ndarray:
+            return librosa.resample(audio, orig_sr=rate, target_sr=SAMPLE_RATE)
+
+        candidates[f"librosa {librosa.__version__}"] = with_librosa
+    return candidates
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, nargs="+", default=[5, 30, 120])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    candidates = _candidates()
+    rng = np.random.default_rng(0)
+    for rate in RATES:
+        for seconds in args.seconds:
+            audio = rng.uniform(-0.5, 0.5, int(rate * seconds)).astype(np.float32)
+            print(f"\n{rate} Hz -> {SAMPLE_RATE} Hz, {seconds:g}s clip")
+            baseline = None
+            for name, fn in candidates.items():
+                # First call designs (and caches) the filter; time the steady state
+                fn(audio, rate)
+                elapsed = _median_ms(lambda: fn(audio, rate), args.repeat)
+                baseline = baseline or elapsed
+                print(f"  {name:<34} {elapsed:9.1f} ms  x{elapsed / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Pytest configuration for the voice assistant backend tests
+"""
+
+import os
+import sys
+
+# Make the ``app`` package importable however pytest is started
+backend_dir = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.abspath(backend_dir))
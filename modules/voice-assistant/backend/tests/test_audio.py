@@ -0,0 +1,170 @@
+import io
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from app.services.stt import audio
+from app.services.stt.audio import SAMPLE_RATE, decode_audio
+
+
+def _wav_bytes(samples, rate):
+    wavfile = pytest.importorskip("scipy.io.wavfile")
+    buffer = io.BytesIO()
+    wavfile.write(buffer, rate, samples)
+    return buffer.getvalue()
+
+
+def _no_ffmpeg(monkeypatch):
+    def run(*args, **kwargs):
+        raise AssertionError("ffmpeg should not be needed")
+
+    monkeypatch.setattr(audio.subprocess, "run", run)
+
+
+@pytest.mark.parametrize(
+    "samples, expected",
+    [
+        (np.array([[16384, 0]] * 800, dtype=np.int16), 0.25),
+        (np.array([[192, 192]] * 800, dtype=np.uint8), 0.5),
+        (np.array([[2**30, 2**30]] * 800, dtype=np.int32), 0.5),
+    ],
+)
+def test_wav_is_downmixed_to_mono_float32(samples, expected):
+    decoded = decode_audio(_wav_bytes(samples, SAMPLE_RATE))
+
+    assert decoded.dtype == np.float32
+    assert decoded.shape == (800,)
+    np.testing.assert_allclose(decoded, expected)
+
+
+def test_wav_is_resampled_to_16khz():
+    samples = np.zeros((48000, 2), dtype=np.int16)
+
+    decoded = decode_audio(_wav_bytes(samples, 48000))
+
+    assert decoded.dtype == np.float32
+    assert decoded.shape == (SAMPLE_RATE,)
+
+
+def test_raw_pcm_drops_a_trailing_odd_byte():
+    data = np.array([16384, -16384], dtype="<i2").tobytes() + b"\x01"
+
+    decoded = decode_audio(data)
+
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, [0.5, -0.5])
+
+
+def test_silent_raw_pcm_is_rejected():
+    with pytest.raises(ValueError, match="silent"):
+        decode_audio(bytes(3200))
+
+
+def test_ogg_is_decoded_in_memory_with_soundfile(monkeypatch):
+    sf = pytest.importorskip("soundfile")
+    tone = 0.5 * np.sin(2 * np.pi * 440 * np.arange(48000) / 48000)
+    buffer = io.BytesIO()
+    sf.write(buffer, np.stack([tone, tone], axis=1), 48000, format="OGG")
+    _no_ffmpeg(monkeypatch)
+
+    decoded = decode_audio(buffer.getvalue())
+
+    assert decoded.dtype == np.float32
+    assert decoded.ndim == 1
+    assert abs(len(decoded) - SAMPLE_RATE) < 100
+
+
+def test_container_falls_back_to_an_ffmpeg_pipe(monkeypatch):
+    calls = []
+    expected = np.array([0.1, -0.2, 0.3], dtype=np.float32)
+
+    def run(args, input, check, capture_output):
+        calls.append((args, input))
+        return subprocess.CompletedProcess(args, 0, expected.tobytes(), b"")
+
+    # An installed soundfile would decode the container itself
+    monkeypatch.setitem(sys.modules, "soundfile", None)
+    monkeypatch.setattr(audio.subprocess, "run", run)
+
+    decoded = decode_audio(b"OggS not really opus")
+
+    np.testing.assert_array_equal(decoded, expected)
+    args, data = calls[0]
+    assert data == b"OggS not really opus"
+    assert args[args.index("-ar") + 1] == str(SAMPLE_RATE)
+    assert args[args.index("-ac") + 1] == "1"
+    assert "pipe:0" in args and "pipe:1" in args
+
+
+def test_ffmpeg_errors_are_reported(monkeypatch):
+    def failing(args, **kwargs):
+        return subprocess.CompletedProcess(args, 1, b"", b"Invalid data found")
+
+    def missing(args, **kwargs):
+        raise FileNotFoundError("ffmpeg")
+
+    monkeypatch.setitem(sys.modules, "soundfile", None)
+
+    monkeypatch.setattr(audio.subprocess, "run", failing)
+    with pytest.raises(RuntimeError, match="Invalid data found"):
+        decode_audio(b"\x1aE\xdf\xa3 webm")
+
+    monkeypatch.setattr(audio.subprocess, "run", missing)
+    with pytest.raises(RuntimeError, match="not on PATH"):
+        decode_audio(b"\x1aE\xdf\xa3 webm")
+
+
+def _tone(frequency, rate, seconds=1.0):
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def _dominant_frequency(samples, rate):
+    spectrum = np.abs(np.fft.rfft(samples))
+    return np.fft.rfftfreq(len(samples), 1 / rate)[np.argmax(spectrum)]
+
+
+@pytest.mark.parametrize("rate", [44100, 48000])
+def test_resample_to_16khz_keeps_length_and_pitch(rate):
+    pytest.importorskip("scipy.signal")
+
+    resampled = audio.resample(_tone(440, rate, seconds=2.0), rate)
+
+    assert resampled.dtype == np.float32
+    assert len(resampled) == 2 * SAMPLE_RATE
+    assert abs(_dominant_frequency(resampled, SAMPLE_RATE) - 440) <= 1
+
+
+def test_resample_returns_16khz_input_unchanged():
+    samples = _tone(440, SAMPLE_RATE)
+
+    assert audio.resample(samples, SAMPLE_RATE) is samples
+
+
+def test_resample_falls_back_to_linear_interpolation(monkeypatch):
+    monkeypatch.setitem(sys.modules, "scipy.signal", None)
+
+    resampled = audio.resample(_tone(440, 48000), 48000)
+
+    assert resampled.dtype == np.float32
+    assert len(resampled) == SAMPLE_RATE
+    assert abs(_dominant_frequency(resampled, SAMPLE_RATE) - 440) <= 1
+
+
+def test_poly_filter_is_cached_per_ratio():
+    pytest.importorskip("scipy.signal")
+    audio._poly_filter.cache_clear()
+
+    taps = audio._poly_filter(1, 3)
+
+    assert audio._poly_filter(1, 3) is taps
+    assert audio._poly_filter(160, 441) is not taps
+    assert audio._poly_filter.cache_info().hits == 1
+    assert taps.dtype == np.float32
+    assert not taps.flags.writeable
+    # Resampling with the shared taps must not modify them
+    before = taps.copy()
+    audio.resample(_tone(440, 48000), 48000)
+    np.testing.assert_array_equal(taps, before)
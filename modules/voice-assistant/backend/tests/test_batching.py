@@ -0,0 +1,90 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.config import Settings
+from app.services.stt.batching import MicroBatcher
+from app.services.stt.executor import STTExecutor
+from app.services.stt.whisper import WhisperSTT
+
+
+@pytest.fixture
+def executor():
+    executor = STTExecutor(workers=1, max_queue=4)
+    yield executor
+    executor.shutdown()
+
+
+def _audio(length):
+    return np.zeros(length, dtype=np.float32)
+
+
+class Recorder:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, batch):
+        self.batches.append([len(audio) for audio in batch])
+        if self.fail:
+            raise RuntimeError("decoder crashed")
+        return [{"text": str(len(audio))} for audio in batch]
+
+
+@pytest.mark.asyncio
+async def test_batch_flushes_when_full(executor):
+    batcher = MicroBatcher(executor, max_batch_size=3, max_wait_s=60)
+    run_batch = Recorder()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit("m", run_batch, _audio(n)) for n in (1, 2, 3))),
+        timeout=5,
+    )
+
+    assert run_batch.batches == [[1, 2, 3]]
+    assert [result["text"] for result in results] == ["1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_batch_flushes_after_wait_and_keys_stay_apart(executor):
+    batcher = MicroBatcher(executor, max_batch_size=8, max_wait_s=0.01)
+    run_batch = Recorder()
+
+    results = await asyncio.gather(
+        batcher.submit(("small", "en"), run_batch, _audio(1)),
+        batcher.submit(("small", "de"), run_batch, _audio(2)),
+        batcher.submit(("small", "en"), run_batch, _audio(3)),
+    )
+
+    assert sorted(run_batch.batches) == [[1, 3], [2]]
+    assert [result["text"] for result in results] == ["1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_batch_error_reaches_every_caller(executor):
+    batcher = MicroBatcher(executor, max_batch_size=2, max_wait_s=60)
+    run_batch = Recorder(fail=True)
+
+    results = await asyncio.gather(
+        batcher.submit("m", run_batch, _audio(1)),
+        batcher.submit("m", run_batch, _audio(2)),
+        return_exceptions=True,
+    )
+
+    assert [str(result) for result in results] == ["decoder crashed"] * 2
+    assert executor.stats()["failed"] == 1
+
+
+def test_utterances_are_only_batched_with_a_fixed_language(executor):
+    batcher = MicroBatcher(executor, max_batch_size=8, max_wait_s=0.01)
+
+    detected = WhisperSTT(
+        Settings(whisper_language=""), executor=executor, batcher=batcher
+    )
+    fixed = WhisperSTT(
+        Settings(whisper_language="en"), executor=executor, batcher=batcher
+    )
+
+    assert detected.batcher is None
+    assert fixed.batcher is batcher
@@ -0,0 +1,54 @@
+import pytest
+
+from app.services.stt.models import LoadedModel, ModelRegistry, estimate_size_mb
+
+SIZES = {"tiny": 40, "base": 80, "small": 250, "large": 1600}
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ModelRegistry(memory_budget_mb=300)
+    loads = []
+
+    def fake_load(name, device, compute_type):
+        loads.append(name)
+        return LoadedModel(
+            name=name, backend="fake", model=object(), size_mb=SIZES[name]
+        )
+
+    monkeypatch.setattr(registry, "_load", fake_load)
+    registry.loads = loads
+    return registry
+
+
+def test_registry_loads_each_model_once(registry):
+    first = registry.get("small", "cpu", "int8")
+
+    assert registry.get("small", "cpu", "int8") is first
+    assert registry.loads == ["small"]
+
+
+def test_registry_evicts_least_recently_used_over_budget(registry):
+    registry.get("tiny", "cpu", "int8")
+    registry.get("base", "cpu", "int8")
+    # Using tiny again makes base the least recently used model
+    registry.get("tiny", "cpu", "int8")
+    registry.get("small", "cpu", "int8")
+
+    assert registry.resident() == {"tiny": 40, "small": 250}
+    registry.get("base", "cpu", "int8")
+    assert registry.loads == ["tiny", "base", "small", "base"]
+
+
+def test_registry_keeps_requested_model_even_if_over_budget(registry):
+    registry.get("tiny", "cpu", "int8")
+    loaded = registry.get("large", "cpu", "int8")
+
+    assert loaded.name == "large"
+    assert registry.resident() == {"large": 1600}
+
+
+def test_estimate_size_prefers_specific_families():
+    assert estimate_size_mb("large-v3-turbo", "faster-whisper", "int8") == 809
+    assert estimate_size_mb("distil-large-v3", "faster-whisper", "float16") == 1512
+    assert estimate_size_mb("small.en", "openai-whisper", "int8") == 976
@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.stt.audio import SAMPLE_RATE
+from app.services.stt.streaming import StreamingTranscriber, _quiet_cut
+
+
+class FakeSTT:
+    """Records the audio it is asked to transcribe; answers with its length."""
+
+    def __init__(self, fail_first=False):
+        self.calls = []
+        self.fail_first = fail_first
+        self.executor = SimpleNamespace(idle_workers=1)
+
+    async def transcribe_audio(self, audio):
+        self.calls.append(np.array(audio))
+        if self.fail_first and len(self.calls) == 1:
+            raise RuntimeError("model crashed")
+        return {"text": f"<{len(audio)}>"}
+
+
+def _speech(seconds, quiet_at=None):
+    """A loud tone as PCM16 bytes, silent for 100 ms from ``quiet_at`` seconds."""
+    count = int(seconds * SAMPLE_RATE)
+    samples = 0.5 * np.sin(np.arange(count) * 2 * np.pi * 440 / SAMPLE_RATE)
+    if quiet_at is not None:
+        start = int(quiet_at * SAMPLE_RATE)
+        samples[start : start + SAMPLE_RATE // 10] = 0
+    return (samples * 32767).astype(np.int16).tobytes()
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_quiet_cut_picks_the_silent_frame():
+    audio = np.frombuffer(_speech(1.0, quiet_at=0.5), dtype=np.int16)
+
+    assert _quiet_cut(audio.astype(np.float32)) == int(0.55 * SAMPLE_RATE)
+
+
+@pytest.mark.asyncio
+async def test_full_windows_are_committed_at_a_quiet_point():
+    stt = FakeSTT()
+    stream = StreamingTranscriber(stt, window_s=1.0, partial_interval_s=100)
+
+    stream.feed(_speech(1.5, quiet_at=0.5))
+    await _settle()
+
+    cut = int(0.55 * SAMPLE_RATE)
+    assert [len(call) for call in stt.calls] == [cut]
+    text = await stream.finish()
+    assert text == f"<{cut}> <{int(1.5 * SAMPLE_RATE) - cut}>"
+
+
+@pytest.mark.asyncio
+async def test_odd_byte_chunks_are_carried_over():
+    stt = FakeSTT()
+    stream = StreamingTranscriber(stt, window_s=10.0, partial_interval_s=100)
+    data = _speech(0.5)
+
+    stream.feed(data[:3])
+    stream.feed(data[3:1001])
+    stream.feed(data[1001:])
+    await stream.finish()
+
+    expected = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+    assert len(stt.calls) == 1
+    np.testing.assert_array_equal(stt.calls[0], expected)
+
+
+@pytest.mark.asyncio
+async def test_finish_transcribes_everything_after_a_streaming_failure():
+    stt = FakeSTT(fail_first=True)
+    stream = StreamingTranscriber(stt, window_s=1.0, partial_interval_s=100)
+
+    stream.feed(_speech(1.5, quiet_at=0.5))
+    await _settle()
+    stream.feed(_speech(1.5))
+    text = await stream.finish()
+
+    assert text == f"<{3 * SAMPLE_RATE}>"
+    assert len(stt.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_partials_wait_for_an_idle_worker():
+    partials = []
+
+    async def on_partial(text):
+        partials.append(text)
+
+    stt = FakeSTT()
+    stt.executor.idle_workers = 0
+    stream = StreamingTranscriber(
+        stt, on_partial=on_partial, window_s=10.0, partial_interval_s=0.5
+    )
+
+    stream.feed(_speech(1.5))
+    await _settle()
+    assert stt.calls == [] and partials == []
+
+    stt.executor.idle_workers = 1
+    stream.feed(_speech(0.5))
+    await _settle()
+    assert partials == [f"<{2 * SAMPLE_RATE}>"]
+    await stream.close()
@@ -0,0 +1,48 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.stt.executor import STTBusyError, STTExecutor
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_beyond_workers_plus_queue():
+    executor = STTExecutor(workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.run(release.wait, label="running"))
+    queued = asyncio.ensure_future(executor.run(release.wait, label="queued"))
+    await asyncio.sleep(0)
+
+    assert executor.idle_workers == 0
+    with pytest.raises(STTBusyError):
+        await executor.run(release.wait, label="rejected")
+
+    release.set()
+    assert await asyncio.gather(running, queued) == [True, True]
+    # Slots are released once jobs finish
+    assert await executor.run(lambda: "ok") == "ok"
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_stats_count_outcomes_and_latency():
+    executor = STTExecutor(workers=2, max_queue=0)
+
+    def fail():
+        raise ValueError("bad audio")
+
+    assert await executor.run(sum, [1, 2]) == 3
+    with pytest.raises(ValueError):
+        await executor.run(fail)
+
+    stats = executor.stats()
+    assert stats["workers"] == 2
+    assert stats["in_flight"] == 0
+    assert (stats["completed"], stats["failed"], stats["rejected"]) == (1, 1, 0)
+    for name in ("wait_p50", "wait_p95", "run_p50", "run_p95"):
+        assert stats[name] >= 0.0
+    assert executor.idle_workers == 2
+    executor.shutdown()